@@ -31,6 +31,14 @@ target_metadata = sqlmodel.SQLModel.metadata
 config.set_main_option("sqlalchemy.url", str(db_settings.alembic_database_url))
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Trigram search indexes (`ix_*_trgm`) need the pg_trgm extension, so they
+    are only created by their migration, not declared on the models.
+    """
+    return not (type_ == "index" and reflected and name.endswith("_trgm"))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -47,6 +55,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,7 +78,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
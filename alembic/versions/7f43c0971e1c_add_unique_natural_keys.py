@@ -0,0 +1,76 @@
+"""Add unique natural keys
+
+Revision ID: 7f43c0971e1c
+Revises: 88a69c329979
+Create Date: 2026-10-18 09:12:41.306214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7f43c0971e1c"
+down_revision: Union[str, Sequence[str], None] = "88a69c329979"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (natural key, [(link table, fk column, other column), ...])
+NATURAL_KEYS = {
+    "character": (
+        "name",
+        [
+            ("characterfilmlink", "character_id", "film_id"),
+            ("characterstarshiplink", "character_id", "starship_id"),
+        ],
+    ),
+    "film": (
+        "title",
+        [
+            ("characterfilmlink", "film_id", "character_id"),
+            ("starshipfilmlink", "film_id", "starship_id"),
+        ],
+    ),
+    "starship": (
+        "name",
+        [
+            ("characterstarshiplink", "starship_id", "character_id"),
+            ("starshipfilmlink", "starship_id", "film_id"),
+        ],
+    ),
+}
+
+
+def merge_duplicates(table: str, key: str, links: list[tuple[str, str, str]]):
+    """Keep the lowest id per natural key and move the duplicates' links onto it."""
+    op.execute(
+        f"CREATE TEMP TABLE _duplicates AS "
+        f"SELECT id, min(id) OVER (PARTITION BY {key}) AS keep_id FROM {table}"
+    )
+    op.execute("DELETE FROM _duplicates WHERE id = keep_id")
+    for link_table, fk, other in links:
+        op.execute(
+            f"INSERT INTO {link_table} ({fk}, {other}) "
+            f"SELECT d.keep_id, l.{other} FROM {link_table} l "
+            f"JOIN _duplicates d ON d.id = l.{fk} ON CONFLICT DO NOTHING"
+        )
+        op.execute(
+            f"DELETE FROM {link_table} l USING _duplicates d WHERE l.{fk} = d.id"
+        )
+    op.execute(f"DELETE FROM {table} t USING _duplicates d WHERE t.id = d.id")
+    op.execute("DROP TABLE _duplicates")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (key, links) in NATURAL_KEYS.items():
+        merge_duplicates(table, key, links)
+        op.create_unique_constraint(f"{table}_{key}_key", table, [key])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (key, _) in NATURAL_KEYS.items():
+        op.drop_constraint(f"{table}_{key}_key", table, type_="unique")
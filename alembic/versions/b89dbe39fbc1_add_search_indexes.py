@@ -0,0 +1,87 @@
+"""Add search indexes
+
+Revision ID: b89dbe39fbc1
+Revises: 60c22a1edeff
+Create Date: 2026-10-18 10:07:42.408132
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b89dbe39fbc1"
+down_revision: Union[str, Sequence[str], None] = "60c22a1edeff"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns searched with ILIKE '%term%', indexed with pg_trgm GIN indexes
+# (only created here, see `include_object` in env.py)
+SEARCH_COLUMNS = [("character", "name"), ("film", "title"), ("starship", "name")]
+# Second column of each link table, for lookups from that side
+LINK_COLUMNS = [
+    ("characterfilmlink", "film_id"),
+    ("starshipfilmlink", "film_id"),
+    ("characterstarshiplink", "starship_id"),
+]
+
+
+def drop_invalid_index(name: str) -> None:
+    """Drop an index left invalid by an interrupted CONCURRENTLY build."""
+    op.execute(
+        f"DO $$ BEGIN IF EXISTS (SELECT FROM pg_index "
+        f"WHERE indexrelid = to_regclass('{name}') AND NOT indisvalid) THEN "
+        f"EXECUTE 'DROP INDEX {name}'; END IF; END $$"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY doesn't block writes (imports) while building, but can't
+    # run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, column in SEARCH_COLUMNS:
+            name = f"ix_{table}_{column}_trgm"
+            drop_invalid_index(name)
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for table, column in LINK_COLUMNS:
+            name = f"ix_{table}_{column}"
+            drop_invalid_index(name)
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The pg_trgm extension stays, other objects may depend on it
+    with op.get_context().autocommit_block():
+        for table, column in LINK_COLUMNS:
+            op.drop_index(
+                f"ix_{table}_{column}",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        for table, column in SEARCH_COLUMNS:
+            op.drop_index(
+                f"ix_{table}_{column}_trgm",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -6,4 +6,104 @@
 SWAPI_BASE_URL = "https://swapi.dev/api"
 RETRYABLE_CODES = {429, 500, 502, 503, 504}
 MAX_RETRIES = 3
+# Jittered exponential backoff between retries, in seconds (a Retry-After
+# from the upstream wins when longer, up to BACKOFF_MAX)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# Upstream rate limit shared by all importers of a run (AIMD token bucket):
+# requests/second start at RATE_LIMIT_INITIAL, grow by ~RATE_LIMIT_INCREASE
+# per second while requests succeed and are multiplied by RATE_LIMIT_DECREASE
+# on THROTTLE_CODES responses
+RATE_LIMIT_INITIAL = 10.0
+RATE_LIMIT_MIN = 0.5
+RATE_LIMIT_MAX = 50.0
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_INCREASE = 1.0
+RATE_LIMIT_DECREASE = 0.5
+THROTTLE_CODES = {429, 503}
+# Fail fast after this many consecutive upstream failures, for this long
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+# How importers size their write batches: "adaptive" (start at CHUNK_SIZE,
+# then aim for BATCH_TARGET_SECONDS per commit), "fixed" (CHUNK_SIZE per
+# commit) or "single" (CHUNK_SIZE batches, one transaction for the whole run)
+BATCH_MODE = "adaptive"
 CHUNK_SIZE = 100
+BATCH_TARGET_SECONDS = 0.25
+BATCH_MIN_SIZE = 10
+BATCH_MAX_SIZE = 5000
+# How importers write batches: "copy" (PostgreSQL COPY), "insert"
+# (multi-row INSERT ... RETURNING) or "orm" (session.add_all fallback)
+WRITE_MODE = "copy"
+# What bulk writes do with rows whose natural key already exists:
+# "nothing" keeps the stored row, "update" overwrites it with upstream data
+UPSERT_ON_CONFLICT = "nothing"
+# Compare incoming rows with the stored content hashes and only write new and
+# changed rows (and link deltas); off: skip or overwrite by UPSERT_ON_CONFLICT
+DIFF_IMPORT = True
+FETCH_CONCURRENCY = 5
+# Send conditional requests and skip pages/records unchanged since last import
+INCREMENTAL_IMPORT = True
+# Parse and insert pages while later pages are still downloading
+STREAM_IMPORT = False
+# Pages buffered between the fetch, parse and write stages
+STREAM_QUEUE_SIZE = 4
+# Validate pages in this many worker processes (0: in the importer's own
+# process); only pays off for very large pages or dumps
+PARSE_WORKERS = 0
+# On-disk SWAPI response cache: "live" (no cache), "record" (fetch and store
+# every page) or "replay" (serve from the cache only, no network)
+SWAPI_CACHE_MODE = "live"
+SWAPI_CACHE_DIR = ".swapi_cache"
+# Where importers read records from: "swapi" (the HTTP API) or "dump" (local
+# <resource>.ndjson/.jsonl/.json[.gz] files in SWAPI_DUMP_DIR, read as pages
+# of DUMP_PAGE_SIZE records, see scripts/seed_dump.py)
+IMPORT_SOURCE = "swapi"
+SWAPI_DUMP_DIR = ".swapi_dump"
+DUMP_PAGE_SIZE = 1000
+# Checkpoint every committed batch and continue interrupted imports from there
+RESUME_IMPORT = True
+# Sharded imports (scripts/import_swapi.py --workers): each resource's pages
+# are split into shards of SHARD_PAGES pages, imported by IMPORT_WORKERS
+# processes; failed shards are retried until attempted SHARD_MAX_ATTEMPTS times
+IMPORT_WORKERS = 4
+SHARD_PAGES = 25
+SHARD_MAX_ATTEMPTS = 2
+# Binary snapshot of the imported data (scripts/snapshot.py), restored by
+# `make reset-db SNAPSHOT=<path>` instead of re-importing
+SNAPSHOT_PATH = "snapshots/swapi.snapshot.gz"
+
+# Shared HTTP client settings (one pooled client per import run)
+HTTP_TIMEOUT = 10.0
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_MAX_CONNECTIONS = 10
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY = 30.0
+# Requires the `h2` package (httpx[http2])
+HTTP2 = False
+HTTP_VERIFY_SSL = False
+
+# Read-only API routes go to the POSTGRES_REPLICAS: "round_robin" or
+# "least_loaded" (fewest open sessions). For READ_PIN_SECONDS after an import
+# job finished they read from the primary, until the replicas caught up; the
+# API checks for finished imports at most every READ_PIN_CHECK_INTERVAL
+READ_ROUTING = "round_robin"
+READ_PIN_SECONDS = 30.0
+READ_PIN_CHECK_INTERVAL = 1.0
+
+# Cached list counts (Paginator count="cached") are dropped once an import
+# job finished (checked at most every COUNT_CACHE_CHECK_INTERVAL seconds) and
+# after COUNT_CACHE_TTL seconds in any case. Keys include client filters, so
+# only the COUNT_CACHE_MAX_SIZE most recently used counts are kept
+COUNT_CACHE_TTL = 300.0
+COUNT_CACHE_CHECK_INTERVAL = 1.0
+COUNT_CACHE_MAX_SIZE = 1024
+
+# Import job queue (jobs are run by scripts/worker.py)
+JOB_POLL_INTERVAL = 2.0
+# Also how often the job's live importer stats are refreshed
+JOB_HEARTBEAT_INTERVAL = 5.0
+# Running jobs without a heartbeat for this long lost their worker
+JOB_STALE_AFTER = 60.0
+# Lost jobs are requeued until they have been attempted this many times
+JOB_MAX_ATTEMPTS = 3
@@ -7,11 +7,16 @@ from core.schemas.character import CharacterRead
 from core.schemas.pagination import PaginatedResponse
 from core.crud.utils.pagination import Paginator
 
-paginator = Paginator(limit=20)
+# Large list, counted by the page query itself
+paginator = Paginator(limit=20, count="window")
 
 
 async def get_characters(
-    session: AsyncSession, request: Request, name: str | None = None, page: int = 1
+    session: AsyncSession,
+    request: Request,
+    name: str | None = None,
+    page: int = 1,
+    cursor: str | None = None,
 ) -> PaginatedResponse:
     return await paginator.paginate(
         request=request,
@@ -19,6 +24,7 @@ async def get_characters(
         model=Character,
         schema=CharacterRead,
         page=page,
+        cursor=cursor,
         filter=name,
         filter_field=Character.name,
         options=[selectinload(Character.films), selectinload(Character.starships)],
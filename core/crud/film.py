@@ -5,11 +5,16 @@ from core.schemas.film import FilmRead
 from core.schemas.pagination import PaginatedResponse
 from core.crud.utils.pagination import Paginator
 
-paginator = Paginator(limit=20)
+# Small lists that only change with imports
+paginator = Paginator(limit=20, count="cached")
 
 
 async def get_films(
-    session: AsyncSession, request: Request, title: str | None = None, page: int = 1
+    session: AsyncSession,
+    request: Request,
+    title: str | None = None,
+    page: int = 1,
+    cursor: str | None = None,
 ) -> PaginatedResponse:
     return await paginator.paginate(
         request=request,
@@ -17,6 +22,7 @@ async def get_films(
         model=Film,
         schema=FilmRead,
         page=page,
+        cursor=cursor,
         filter=title,
         filter_field=Film.title,
     )
@@ -1,28 +1,58 @@
-import asyncio
-from core.database.session import async_session
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.crud.utils.counting import count_cache
+from core.database.session import async_session, read_router
+from core.models import ImportJob
+from core.schemas.job import ImportJobRead
+from core.services.jobs import ImportJobQueue
 from core.services.swapi import CharacterImporter, FilmImporter, StarshipImporter
+from core.services.swapi.client import create_client
+from core.services.swapi.scheduler import ImportScheduler
+from core.services.swapi.stats import ImporterStats
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def run_all_importers():
+async def run_all_importers(stats: dict[str, ImporterStats] | None = None):
     """
-    Run all SWAPI importers in order.
+    Run all SWAPI importers.
 
-    This function sequentially imports films, then starships, and finally characters,
-    ensuring that all many-to-many dependencies are satisfied.
-    Logs progress and handles any exceptions during the import process.
+    Films and starships are imported concurrently, each on its own session,
+    and characters start once both have finished, ensuring that all
+    many-to-many dependencies are satisfied.
+    All importers share one pooled HTTP client for the whole run.
+    Logs progress and re-raises the first error, so the worker running the
+    job can record it. Pass `stats` to follow each importer's `ImporterStats`
+    while the run is in progress. Reads of this process are pinned to the
+    primary afterwards (see `ReadRouter`) and cached list counts dropped.
     """
-    async with async_session() as session:
+    async with create_client() as client:
         try:
-            await FilmImporter(session).run()
-            await StarshipImporter(session).run()
-            await CharacterImporter(session).run()
+            await ImportScheduler(
+                [FilmImporter, StarshipImporter, CharacterImporter],
+                session_factory=async_session,
+                client=client,
+                stats=stats,
+            ).run()
             logger.info("All importers finished successfully.")
         except Exception:
             logger.exception("Importing failed")
+            raise
+        finally:
+            read_router.pin()
+            count_cache.clear()
 
 
-def initialize():
-    asyncio.create_task(run_all_importers())
+async def enqueue_import(session: AsyncSession) -> tuple[ImportJob, bool]:
+    """Queue an import for the worker, unless one is already queued or running."""
+    return await ImportJobQueue(session).enqueue()
+
+
+async def get_import_job(job_id: int, session: AsyncSession) -> ImportJobRead:
+    job = await session.get(ImportJob, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return ImportJobRead.model_validate(job, from_attributes=True)
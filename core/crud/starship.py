@@ -5,7 +5,8 @@ from core.schemas.starship import StarshipRead
 from core.schemas.pagination import PaginatedResponse
 from core.crud.utils.pagination import Paginator
 
-paginator = Paginator(limit=20)
+# Small lists that only change with imports
+paginator = Paginator(limit=20, count="cached")
 
 
 async def get_starships(
@@ -13,6 +14,7 @@ async def get_starships(
     request: Request,
     name: str | None = None,
     page: int = 1,
+    cursor: str | None = None,
 ) -> PaginatedResponse:
     return await paginator.paginate(
         request=request,
@@ -20,6 +22,7 @@ async def get_starships(
         model=Starship,
         schema=StarshipRead,
         page=page,
+        cursor=cursor,
         filter=name,
         filter_field=Starship.name,
     )
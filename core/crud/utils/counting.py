@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from sqlalchemy import Table, func, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import (
+    COUNT_CACHE_CHECK_INTERVAL,
+    COUNT_CACHE_MAX_SIZE,
+    COUNT_CACHE_TTL,
+)
+from core.models import ImportJob
+
+# How `Paginator` gets a list's total `count`:
+# - "exact": a separate `count(*)` query before the page
+# - "window": `count(*) OVER ()` on the page query itself, one round trip
+#   (keyset pages count separately, their WHERE only covers one side)
+# - "cached": exact counts by filter, kept until an import finishes
+# - "estimate": the planner's `pg_class.reltuples`, unfiltered lists only
+#   (filtered ones use "window")
+# - "none": no count at all (`count` is null)
+COUNT_STRATEGIES = ("exact", "window", "cached", "estimate", "none")
+
+
+class CountCache:
+    """
+    List counts by key, e.g. `(table, filter)`.
+
+    The data only changes through imports, so the cache is cleared whenever
+    an import job finishes: at most every `COUNT_CACHE_CHECK_INTERVAL`
+    seconds it looks up the last finished job, which also covers imports run
+    by the worker in another process. Entries expire after `ttl` seconds
+    regardless, for changes made outside of import jobs.
+
+    Keys come from client filters, so at most `max_size` counts are kept and
+    the least recently used one is dropped first.
+    """
+
+    def __init__(self, ttl: float | None = None, max_size: int | None = None):
+        self.ttl = COUNT_CACHE_TTL if ttl is None else ttl
+        self.max_size = COUNT_CACHE_MAX_SIZE if max_size is None else max_size
+        self.counts: OrderedDict[Hashable, tuple[int, float]] = OrderedDict()
+        self.last_import = None
+        self._next_check = 0.0
+
+    def clear(self) -> None:
+        self.counts.clear()
+
+    async def get(
+        self,
+        session: AsyncSession,
+        key: Hashable,
+        count: Callable[[], Awaitable[int]],
+    ) -> int:
+        """The cached count for `key`, or `await count()` stored for later."""
+        await self._check_imports(session)
+        now = time.monotonic()
+        if cached := self.counts.get(key):
+            if now - cached[1] < self.ttl:
+                self.counts.move_to_end(key)
+                return cached[0]
+            del self.counts[key]
+        total = await count()
+        self.counts[key] = (total, now)
+        while len(self.counts) > self.max_size:
+            self.counts.popitem(last=False)
+        return total
+
+    async def _check_imports(self, session: AsyncSession) -> None:
+        if time.monotonic() < self._next_check:
+            return
+        last_import = await session.scalar(select(func.max(ImportJob.finished_at)))
+        if last_import != self.last_import:
+            self.last_import = last_import
+            self.clear()
+        self._next_check = time.monotonic() + COUNT_CACHE_CHECK_INTERVAL
+
+
+count_cache = CountCache()
+
+
+async def estimated_count(session: AsyncSession, table: Table) -> int | None:
+    """The planner's row estimate of `table` (None if never analyzed)."""
+    estimate = await session.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table.name},
+    )
+    return estimate if estimate is not None and estimate >= 0 else None
@@ -1,11 +1,24 @@
+import base64
+import binascii
+import json
 from os import getenv
-from fastapi import Request
+from fastapi import HTTPException, Request
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
-from sqlalchemy import func, bindparam, ColumnElement
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Integer,
+    Select,
+    String,
+    bindparam,
+    func,
+    tuple_,
+)
 from starlette.datastructures import URL
 
+from core.crud.utils.counting import COUNT_STRATEGIES, count_cache, estimated_count
 from core.schemas.pagination import PaginatedResponse
 
 
@@ -14,13 +27,16 @@ class Paginator:
     A reusable pagination helper for SQLModel-based queries in a FastAPI context.
 
     This class encapsulates the logic needed to:
-    - Execute paginated database queries.
+    - Execute paginated database queries, in a stable order (`order_by`,
+      then id).
     - Apply optional `ILIKE` filters for search-like behavior.
     - Generate `PaginatedResponse` objects with `next` and `previous` URLs.
     - Serialize SQLModel objects to Pydantic schemas with proper attribute mapping.
 
     Attributes:
         limit (int): Number of items per page.
+        count (str): How the total `count` is worked out, one of
+            `COUNT_STRATEGIES` (see `core/crud/utils/counting.py`).
 
     Usage:
         Call the `paginate()` method by passing:
@@ -30,6 +46,18 @@ class Paginator:
         - A corresponding Pydantic response schema
         - The desired page number
         - Optional filtering logic (field and pattern)
+        - Optionally a `cursor`, for keyset pagination
+
+    Modes:
+        - Page numbers (`?page=N`): `OFFSET (page - 1) * limit`, so deep pages
+          get slower.
+        - Keyset (`?cursor=`, empty for the first page): rows after (or
+          before) the sort key of the previous page's last (or first) row,
+          as fast on any page. `next` and `previous` carry opaque cursor
+          tokens. Both modes return the same `PaginatedResponse`.
+
+        Either way one row more than `limit` is fetched to tell whether there
+        is a next page, so `next` never depends on the count.
 
     Notes:
         - Designed for clean separation of pagination from route/CRUD logic.
@@ -37,8 +65,11 @@ class Paginator:
         - Assumes Pydantic `model_validate` for from_attributes=True in non-test environments.
     """
 
-    def __init__(self, limit: int = 20):
+    def __init__(self, limit: int = 20, count: str = "exact"):
+        if count not in COUNT_STRATEGIES:
+            raise ValueError(f"Unsupported count strategy: {count}")
         self.limit = limit
+        self.count = count
 
     async def paginate(
         self,
@@ -47,16 +78,19 @@ class Paginator:
         session: AsyncSession,
         model: type[SQLModel],
         schema: type[BaseModel],
-        page: int,
+        page: int = 1,
         filter: str | None = None,
         filter_field: ColumnElement | None = None,
         options: list = [],
+        cursor: str | None = None,
+        order_by: ColumnElement | None = None,
     ) -> PaginatedResponse:
         if page < 1:
             raise ValueError("Page number must be >= 1")
 
-        offset = (page - 1) * self.limit
         params = {}
+        # Unique sort key: rows with equal `order_by` values are ordered by id
+        keys = [model.id] if order_by is None else [order_by, model.id]
 
         # NOTE
         # Queries should be performed inside the function that call paginator
@@ -64,34 +98,142 @@ class Paginator:
         # other than name for characters / starships and title for films.
 
         # Filtering logic
-        if filter and filter_field is not None:
+        filtered = bool(filter) and filter_field is not None
+        if filtered:
             pattern = f"%{filter}%"
             condition = filter_field.ilike(bindparam("pattern"))
             base_query = select(model).where(condition).options(*options)
             count_query = select(func.count()).select_from(base_query.subquery())
-            data_query = base_query.offset(offset).limit(self.limit)
             params = {"pattern": pattern}
         else:
             base_query = select(model).options(*options)
             count_query = select(func.count()).select_from(model)
-            data_query = base_query.offset(offset).limit(self.limit)
 
-        # Execute queries
-        count_result = await session.execute(count_query, params)
-        total = count_result.scalar_one()
+        strategy = self.count
+        if strategy == "estimate" and filtered:
+            strategy = "window"
+        if strategy == "window" and cursor is not None:
+            strategy = "exact"
+
+        async def exact_count() -> int:
+            return (await session.execute(count_query, params)).scalar_one()
+
+        total = None
+        if strategy == "exact":
+            total = await exact_count()
+        elif strategy == "cached":
+            key = (model.__tablename__, filter if filtered else None)
+            total = await count_cache.get(session, key, exact_count)
+        elif strategy == "estimate":
+            total = await estimated_count(session, model.__table__)
+            if total is None:
+                total = await exact_count()
+
+        if cursor is not None:
+            items, next_url, prev_url = await self._keyset_page(
+                request, session, base_query, params, keys, cursor
+            )
+        else:
+            offset = (page - 1) * self.limit
+            data_query = base_query.order_by(*keys).offset(offset).limit(self.limit + 1)
+            if strategy == "window":
+                data_query = data_query.add_columns(func.count().over())
+            result = await session.execute(data_query, params)
+            if strategy == "window":
+                rows = result.all()
+                items = [row[0] for row in rows]
+                # Past the last page there's no row to carry the count
+                total = rows[0][1] if rows else (await exact_count() if offset else 0)
+            else:
+                items = list(result.scalars().all())
+            more = len(items) > self.limit
+            items = items[: self.limit]
+
+            # Build pagination URLs
+            def build_url(p: int) -> str:
+                return str(URL(str(request.url)).include_query_params(page=p))
+
+            next_url = build_url(page + 1) if more else None
+            prev_url = build_url(page - 1) if page > 1 else None
+
+        return PaginatedResponse(
+            count=total,
+            next=next_url,
+            previous=prev_url,
+            results=self._serialize(schema, items),
+        )
+
+    async def _keyset_page(
+        self,
+        request: Request,
+        session: AsyncSession,
+        base_query: Select,
+        params: dict,
+        keys: list[ColumnElement],
+        cursor: str,
+    ) -> tuple[list, str | None, str | None]:
+        """One page of rows after (or before) the cursor, and the page URLs."""
+        after, backwards = self.decode_cursor(cursor, keys) if cursor else (None, False)
+
+        query = base_query
+        if after is not None:
+            row, bound = tuple_(*keys), tuple(after)
+            query = query.where(row < bound if backwards else row > bound)
+        # Backwards, the rows closest to the cursor come first
+        order = [key.desc() for key in keys] if backwards else keys
+        # One extra row tells whether there is a page beyond this one
+        result = await session.execute(
+            query.order_by(*order).limit(self.limit + 1), params
+        )
+        items = list(result.scalars().all())
+        more = len(items) > self.limit
+        items = items[: self.limit]
+        if backwards:
+            items.reverse()
+        if not items:
+            return items, None, None
 
-        result = await session.execute(data_query, params)
-        items = result.scalars().all()
+        def build_url(obj, backwards: bool) -> str:
+            values = [getattr(obj, key.key) for key in keys]
+            url = URL(str(request.url)).remove_query_params("page")
+            return str(
+                url.include_query_params(cursor=self.encode_cursor(values, backwards))
+            )
 
-        # Build pagination URLs
-        total_pages = (total + self.limit - 1) // self.limit
+        has_next = True if backwards else more
+        has_prev = more if backwards else after is not None
+        next_url = build_url(items[-1], False) if has_next else None
+        prev_url = build_url(items[0], True) if has_prev else None
+        return items, next_url, prev_url
 
-        def build_url(p: int) -> str:
-            return str(URL(str(request.url)).include_query_params(page=p))
+    @staticmethod
+    def encode_cursor(values: list, backwards: bool = False) -> str:
+        """Opaque token for the rows after (or before) the sort key `values`."""
+        payload = json.dumps([values, backwards], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
-        next_url = build_url(page + 1) if page < total_pages else None
-        prev_url = build_url(page - 1) if page > 1 else None
+    @staticmethod
+    def decode_cursor(cursor: str, keys: list[ColumnElement]) -> tuple[list, bool]:
+        """
+        Sort key values and direction of a cursor token, checked against the
+        `keys` columns so a tampered token is a 400 rather than a database
+        error.
+        """
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values, backwards = json.loads(payload)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if (
+            not isinstance(values, list)
+            or len(values) != len(keys)
+            or not all(map(_fits_column, values, keys))
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return values, bool(backwards)
 
+    @staticmethod
+    def _serialize(schema: type[BaseModel], items) -> list:
         # NOTE
         # I know how this looks but i cannot find a solution for the issue
         # where i need model_validate in order to return results of character
@@ -99,15 +241,22 @@ class Paginator:
         # so i use model_dump in that case.
         # Why is this happening is a mystery to me.
         if getenv("ENVIRONMENT") == "test":
-            results = [schema(**obj.model_dump()) for obj in items]
-        else:
-            results = [
-                schema.model_validate(obj, from_attributes=True) for obj in items
-            ]
+            # Internal columns (e.g. swapi_id) aren't part of the read schemas
+            fields = set(schema.model_fields)
+            return [schema(**obj.model_dump(include=fields)) for obj in items]
+        return [schema.model_validate(obj, from_attributes=True) for obj in items]
 
-        return PaginatedResponse(
-            count=total,
-            next=next_url,
-            previous=prev_url,
-            results=results,
+
+def _fits_column(value, column: ColumnElement) -> bool:
+    """Whether a decoded cursor value can be bound against `column`."""
+    if isinstance(column.type, Integer):
+        bits = 64 if isinstance(column.type, BigInteger) else 32
+        return (
+            isinstance(value, int)
+            and not isinstance(value, bool)
+            and -(2 ** (bits - 1)) <= value < 2 ** (bits - 1)
         )
+    if isinstance(column.type, String):
+        # Postgres text can't hold NUL characters
+        return isinstance(value, str) and "\x00" not in value
+    return value is not None
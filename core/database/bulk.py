@@ -0,0 +1,166 @@
+from collections.abc import Iterable, Sequence
+from sqlalchemy import (
+    Table,
+    TableClause,
+    and_,
+    column,
+    or_,
+    select,
+    table as table_clause,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+WRITE_MODES = ("copy", "insert", "orm")
+ON_CONFLICT_ACTIONS = ("nothing", "update")
+
+
+class BulkWriter:
+    """
+    Bulk write helper for entity and link tables, bypassing the ORM unit of work.
+
+    Modes:
+    - `copy`: PostgreSQL `COPY` through asyncpg's `copy_records_to_table` into
+      a temporary staging table, then a single `INSERT ... SELECT` into the
+      target so conflicts can still be resolved.
+    - `insert`: multi-row `INSERT ... RETURNING` (SQLAlchemy "insertmanyvalues").
+
+    Entities are upserted on their natural key (`ON CONFLICT DO NOTHING` or
+    `DO UPDATE`) and link rows are inserted with `ON CONFLICT DO NOTHING`,
+    so writing the same batch twice is harmless.
+
+    Both modes run on the session's connection and inside its transaction;
+    committing stays the caller's responsibility.
+
+    `inserted_rows` counts the entity rows actually inserted (or updated) and
+    `link_rows` the link rows submitted, across all calls.
+    """
+
+    def __init__(self, session: AsyncSession, mode: str = "copy"):
+        if mode not in ("copy", "insert"):
+            raise ValueError(f"Unsupported bulk write mode: {mode}")
+        self.session = session
+        self.mode = mode
+        self.inserted_rows = 0
+        self.link_rows = 0
+
+    async def upsert(
+        self,
+        table: Table,
+        rows: Sequence[dict],
+        key: str,
+        on_conflict: str = "nothing",
+        backfill: Sequence[str] = (),
+    ) -> dict:
+        """
+        Upsert entity rows on their unique `key` column.
+
+        With `on_conflict="nothing"`, the `backfill` columns of existing rows
+        are still set when they are NULL and the incoming value isn't (e.g.
+        columns added after the row was first imported); rows that already
+        have them are left untouched.
+
+        Returns a `{key value: id}` map covering every row of the batch,
+        including rows that already existed.
+        """
+        if on_conflict not in ON_CONFLICT_ACTIONS:
+            raise ValueError(f"Unsupported on_conflict action: {on_conflict}")
+        if not rows:
+            return {}
+
+        # ON CONFLICT DO UPDATE can't touch the same row twice in one statement
+        rows = list({row[key]: row for row in rows}.values())
+        columns = list(rows[0].keys())
+
+        params = None
+        if self.mode == "copy":
+            stage = await self._stage(table, columns, [tuple(r.values()) for r in rows])
+            stmt = insert(table).from_select(columns, select(*stage.c))
+        else:
+            stmt, params = insert(table), rows
+
+        if on_conflict == "update":
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={c: stmt.excluded[c] for c in columns if c != key},
+            )
+        elif backfill:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={c: stmt.excluded[c] for c in backfill},
+                where=or_(
+                    *(
+                        and_(table.c[c].is_(None), stmt.excluded[c].is_not(None))
+                        for c in backfill
+                    )
+                ),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[key])
+
+        result = await self.session.execute(
+            stmt.returning(table.c[key], table.c.id), params
+        )
+        ids = dict(result.all())
+        self.inserted_rows += len(ids)
+
+        # Skipped conflicts aren't RETURNed, look those up (O(batch))
+        if missing := [row[key] for row in rows if row[key] not in ids]:
+            result = await self.session.execute(
+                select(table.c[key], table.c.id).where(table.c[key].in_(missing))
+            )
+            ids.update(result.all())
+
+        return ids
+
+    async def insert_links(
+        self, table: Table, columns: Sequence[str], pairs: Iterable[tuple]
+    ) -> None:
+        """Insert rows into a link table, ignoring the ones that already exist."""
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return
+        self.link_rows += len(pairs)
+
+        params = None
+        if self.mode == "copy":
+            stage = await self._stage(table, columns, pairs)
+            stmt = insert(table).from_select(list(columns), select(*stage.c))
+        else:
+            stmt = insert(table)
+            params = [dict(zip(columns, pair)) for pair in pairs]
+
+        await self.session.execute(stmt.on_conflict_do_nothing(), params)
+
+    async def copy_records(
+        self, table_name: str, columns: Sequence[str], records: list[tuple]
+    ) -> None:
+        """
+        COPY records straight into a table through the asyncpg connection.
+
+        Must run after a statement has been issued on the session in the
+        current transaction, since asyncpg begins it lazily.
+        """
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name, records=records, columns=list(columns)
+        )
+
+    async def _stage(
+        self, table: Table, columns: Sequence[str], records: list[tuple]
+    ) -> TableClause:
+        """COPY records into an empty temporary copy of `table`'s columns."""
+        stage = table_clause(f"_stage_{table.name}", *(column(c) for c in columns))
+        column_list = ", ".join(columns)
+        # Creating the stage through SQLAlchemy also begins the transaction
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage.name} ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {table.name} WITH NO DATA"
+            )
+        )
+        await self.session.execute(text(f"TRUNCATE {stage.name}"))
+        await self.copy_records(stage.name, columns, records)
+        return stage
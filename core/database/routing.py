@@ -0,0 +1,98 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import READ_PIN_CHECK_INTERVAL, READ_PIN_SECONDS, READ_ROUTING
+from core.models import ImportJob
+
+READ_ROUTINGS = ("round_robin", "least_loaded")
+
+
+class ReadRouter:
+    """
+    Picks the engine that serves a read-only request.
+
+    Reads go to the replicas, `round_robin` or `least_loaded` (the replica
+    with the fewest sessions open through this router); without replicas
+    everything stays on the primary. Writes never go through the router.
+
+    Read-your-writes after imports: once an import job has finished, reads
+    are pinned to the primary for `pin_seconds`, until the replicas have
+    caught up. Imports run in the worker, so the router looks up the last
+    finished job on the primary, at most every `READ_PIN_CHECK_INTERVAL`
+    seconds. `pin()` pins this process's reads directly.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        routing: str | None = None,
+        pin_seconds: float | None = None,
+    ):
+        self.routing = routing or READ_ROUTING
+        if self.routing not in READ_ROUTINGS:
+            raise ValueError(f"Unsupported read routing: {self.routing}")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.pin_seconds = READ_PIN_SECONDS if pin_seconds is None else pin_seconds
+        self.sessions = {
+            engine: async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+            for engine in (primary, *self.replicas)
+        }
+        self.in_flight: Counter[AsyncEngine] = Counter()
+        self.pinned_until = 0.0
+        self._next_check = 0.0
+        self._check_lock = asyncio.Lock()
+        self._cycle = itertools.cycle(self.replicas)
+
+    def pin(self, seconds: float | None = None) -> None:
+        """Send this process's reads to the primary for a while."""
+        until = time.monotonic() + (self.pin_seconds if seconds is None else seconds)
+        self.pinned_until = max(self.pinned_until, until)
+
+    async def pick(self) -> AsyncEngine:
+        if not self.replicas:
+            return self.primary
+        await self._check_imports()
+        if time.monotonic() < self.pinned_until:
+            return self.primary
+        if self.routing == "least_loaded":
+            return min(self.replicas, key=lambda engine: self.in_flight[engine])
+        return next(self._cycle)
+
+    async def _check_imports(self) -> None:
+        """Pin reads to the primary if an import job finished recently."""
+        if not self.pin_seconds or time.monotonic() < self._next_check:
+            return
+        async with self._check_lock:
+            if time.monotonic() < self._next_check:
+                return
+            async with self.sessions[self.primary]() as session:
+                age = await session.scalar(
+                    select(
+                        func.extract(
+                            "epoch", func.now() - func.max(ImportJob.finished_at)
+                        )
+                    )
+                )
+            if age is not None and age < self.pin_seconds:
+                self.pin(self.pin_seconds - float(age))
+            self._next_check = time.monotonic() + READ_PIN_CHECK_INTERVAL
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        engine = await self.pick()
+        self.in_flight[engine] += 1
+        try:
+            async with self.sessions[engine]() as session:
+                yield session
+        finally:
+            self.in_flight[engine] -= 1
@@ -1,12 +1,29 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from typing import AsyncGenerator
-from .settings import engine
+from .routing import ReadRouter
+from .settings import db_settings, engine
 
 async_session = async_sessionmaker(
     bind=engine, expire_on_commit=False, class_=AsyncSession
 )
 
+read_router = ReadRouter(
+    engine,
+    [
+        db_settings.create_engine(
+            url, application_name=f"{db_settings.DB_APPLICATION_NAME}-read"
+        )
+        for url in db_settings.replica_database_urls
+    ],
+)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """A session for read-only routes, on a replica when there are any."""
+    async with read_router.session() as session:
+        yield session
@@ -2,6 +2,45 @@ from os import getenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
+# Engine profile per ENVIRONMENT, any DB_* setting overrides its entry.
+# statement_cache_size: asyncpg prepared statements kept per connection (0
+# behind PgBouncer in transaction mode); statement_timeout in milliseconds
+# (None: the server's default, imports can run long statements).
+ENGINE_PROFILES = {
+    "production": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 10.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+        "statement_timeout": 30_000,
+    },
+    "docker": {
+        "echo": False,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+        "statement_cache_size": 100,
+        "statement_timeout": None,
+    },
+    "test": {
+        "echo": False,
+        "pool_size": 2,
+        "max_overflow": 5,
+        "pool_timeout": 30.0,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache_size": 100,
+        "statement_timeout": None,
+    },
+}
+# Without (or with an unknown) ENVIRONMENT, e.g. scripts run on the host
+DEFAULT_PROFILE = "docker"
+
 
 class DatabaseSettings(BaseSettings):
     POSTGRES_USER: str
@@ -9,6 +48,20 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_SERVER: str
     POSTGRES_PORT: int = 5432
+    # Read replicas as comma-separated host[:port], same user and database
+    POSTGRES_REPLICAS: str = ""
+
+    # Overrides of the environment's engine profile
+    DB_ECHO: bool | None = None
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float | None = None
+    DB_POOL_RECYCLE: int | None = None
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int | None = None
+    DB_STATEMENT_TIMEOUT: int | None = None
+    # Shown in pg_stat_activity, to tell the API, workers and scripts apart
+    DB_APPLICATION_NAME: str = "swapi"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -20,6 +73,17 @@ class DatabaseSettings(BaseSettings):
             else f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def replica_database_urls(self) -> list[str]:
+        urls = []
+        for replica in filter(None, map(str.strip, self.POSTGRES_REPLICAS.split(","))):
+            host, _, port = replica.partition(":")
+            urls.append(
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{host}:{port or 5432}/{self.POSTGRES_DB}"
+            )
+        return urls
+
     @property
     def alembic_database_url(self) -> str:
         return (
@@ -27,11 +91,61 @@ class DatabaseSettings(BaseSettings):
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def engine_profile(self) -> dict:
+        """The ENVIRONMENT's engine profile with the DB_* overrides applied."""
+        profile = dict(
+            ENGINE_PROFILES.get(getenv("ENVIRONMENT"), ENGINE_PROFILES[DEFAULT_PROFILE])
+        )
+        overrides = {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            "statement_timeout": self.DB_STATEMENT_TIMEOUT,
+        }
+        profile.update({k: v for k, v in overrides.items() if v is not None})
+        return profile
+
+    def engine_options(self, application_name: str | None = None, **overrides) -> dict:
+        """
+        Keyword arguments for `create_async_engine`, from the engine profile.
+
+        `overrides` replace profile entries (e.g. `pool_size=1` for a
+        one-connection worker process).
+        """
+        profile = {**self.engine_profile, **overrides}
+        server_settings = {
+            "application_name": application_name or self.DB_APPLICATION_NAME
+        }
+        if profile["statement_timeout"] is not None:
+            server_settings["statement_timeout"] = str(profile["statement_timeout"])
+        return {
+            "echo": profile["echo"],
+            "pool_size": profile["pool_size"],
+            "max_overflow": profile["max_overflow"],
+            "pool_timeout": profile["pool_timeout"],
+            "pool_recycle": profile["pool_recycle"],
+            "pool_pre_ping": profile["pool_pre_ping"],
+            "connect_args": {
+                "statement_cache_size": profile["statement_cache_size"],
+                "server_settings": server_settings,
+            },
+        }
+
+    def create_engine(
+        self, url: str | None = None, application_name: str | None = None, **overrides
+    ) -> AsyncEngine:
+        """An engine with the environment's profile, for `url` or the app's."""
+        return create_async_engine(
+            url or self.async_database_url,
+            **self.engine_options(application_name, **overrides),
+        )
+
 
 db_settings = DatabaseSettings()
 
-engine: AsyncEngine = create_async_engine(
-    db_settings.async_database_url,
-    echo=True,
-    future=True,
-)
+engine: AsyncEngine = db_settings.create_engine()
@@ -0,0 +1,234 @@
+import asyncio
+import gzip
+import json
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+from sqlalchemy import Table, func, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.models import (
+    Character,
+    CharacterFilmLink,
+    CharacterStarshipLink,
+    Film,
+    ImportCheckpoint,
+    ImportShard,
+    StagedLink,
+    Starship,
+    StarshipFilmLink,
+    SyncState,
+)
+
+# Tables in a snapshot, parents before the link tables that reference them.
+# The sync state goes along so incremental imports continue from the data.
+SNAPSHOT_TABLES: tuple[Table, ...] = tuple(
+    model.__table__
+    for model in (
+        Film,
+        Starship,
+        Character,
+        CharacterFilmLink,
+        StarshipFilmLink,
+        CharacterStarshipLink,
+        SyncState,
+    )
+)
+# Progress of unfinished imports (resume checkpoints, sharded runs) refers to
+# the data a restore replaces, so it is emptied rather than snapshotted
+RUN_STATE_TABLES: tuple[Table, ...] = tuple(
+    model.__table__ for model in (ImportCheckpoint, ImportShard, StagedLink)
+)
+MAGIC = b"SWAPISNAP\n"
+FORMAT_VERSION = 1
+# Length prefix of the header and of every chunk of COPY data
+FRAME = struct.Struct(">I")
+# gzip's default (9) is several times slower for a few percent smaller files
+COMPRESS_LEVEL = 3
+
+
+async def schema_revision(session: AsyncSession) -> str | None:
+    """The database's Alembic revision (None when it isn't managed by Alembic)."""
+    exists = await session.scalar(select(func.to_regclass("alembic_version")))
+    if exists is None:
+        return None
+    return await session.scalar(text("SELECT version_num FROM alembic_version"))
+
+
+async def _driver_connection(session: AsyncSession):
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+
+def _write_frame(file: IO[bytes], data: bytes) -> None:
+    file.write(FRAME.pack(len(data)))
+    file.write(data)
+
+
+def _read_frame(file: IO[bytes]) -> bytes:
+    prefix = file.read(FRAME.size)
+    if len(prefix) != FRAME.size:
+        raise ValueError("Truncated snapshot")
+    (size,) = FRAME.unpack(prefix)
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated snapshot")
+    return data
+
+
+def read_header(file: IO[bytes]) -> dict:
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a SWAPI snapshot")
+    header = json.loads(_read_frame(file))
+    if header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format: {header.get('format')}")
+    return header
+
+
+async def export_snapshot(session: AsyncSession, path: str | Path) -> dict:
+    """
+    Write every snapshot table to one gzip-compressed file with binary COPY.
+
+    The file starts with a JSON header (schema revision, tables, columns and
+    row counts), followed by each table's `COPY ... (FORMAT binary)` output
+    in length-prefixed chunks, an empty chunk ending each table. Everything
+    is read in one repeatable-read transaction, so the snapshot is
+    consistent even while an import is writing. Returns the header.
+
+    Must run on a session without an open transaction.
+    """
+    if session.in_transaction():
+        raise RuntimeError("Snapshots must be exported outside of a transaction")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    try:
+        tables = []
+        for table in SNAPSHOT_TABLES:
+            rows = await session.scalar(select(func.count()).select_from(table))
+            tables.append(
+                {"name": table.name, "columns": list(table.c.keys()), "rows": rows}
+            )
+        header = {
+            "format": FORMAT_VERSION,
+            "revision": await schema_revision(session),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "tables": tables,
+        }
+
+        driver_connection = await _driver_connection(session)
+        with gzip.open(path, "wb", compresslevel=COMPRESS_LEVEL) as file:
+            file.write(MAGIC)
+            _write_frame(file, json.dumps(header).encode())
+            for table in tables:
+
+                async def write(data: bytes) -> None:
+                    # Compression is blocking work, keep it off the event loop
+                    await asyncio.to_thread(_write_frame, file, data)
+
+                await driver_connection.copy_from_table(
+                    table["name"],
+                    output=write,
+                    columns=table["columns"],
+                    format="binary",
+                )
+                _write_frame(file, b"")
+    finally:
+        await session.rollback()
+    return header
+
+
+async def restore_snapshot(session: AsyncSession, path: str | Path) -> dict:
+    """
+    Replace the contents of the snapshot tables with a snapshot file.
+
+    The snapshot must come from a database at the same schema revision with
+    the same columns. All tables are truncated and loaded with binary COPY
+    in a single transaction, then the id sequences are moved past the
+    restored ids; on any error nothing changes. Returns the header.
+
+    The sync state comes back with the data; `RUN_STATE_TABLES` are emptied,
+    so no resume or sharded run continues on top of the restored data.
+
+    Foreign keys are dropped during the load and added back afterwards,
+    which checks each of them in one pass instead of once per row.
+    """
+    tables = {table.name: table for table in SNAPSHOT_TABLES}
+    with gzip.open(Path(path), "rb") as file:
+        header = read_header(file)
+        revision = await schema_revision(session)
+        if header["revision"] != revision:
+            raise ValueError(
+                f"Snapshot is of schema revision {header['revision']}, the "
+                f"database is at {revision}: migrate it or take a new snapshot"
+            )
+        for entry in header["tables"]:
+            table = tables.get(entry["name"])
+            if table is None or entry["columns"] != list(table.c.keys()):
+                raise ValueError(f"Snapshot table {entry['name']} doesn't match")
+
+        try:
+            names = ", ".join(
+                [entry["name"] for entry in header["tables"]]
+                + [table.name for table in RUN_STATE_TABLES]
+            )
+            await session.execute(text(f"TRUNCATE {names}"))
+            foreign_keys = await _drop_foreign_keys(session, header["tables"])
+            driver_connection = await _driver_connection(session)
+            for entry in header["tables"]:
+
+                async def chunks():
+                    while data := await asyncio.to_thread(_read_frame, file):
+                        yield data
+
+                status = await driver_connection.copy_to_table(
+                    entry["name"],
+                    source=chunks(),
+                    columns=entry["columns"],
+                    format="binary",
+                )
+                if int(status.split()[-1]) != entry["rows"]:
+                    raise ValueError(
+                        f"Snapshot table {entry['name']} holds {status.split()[-1]}"
+                        f" rows, its header says {entry['rows']}"
+                    )
+                if "id" in tables[entry["name"]].c:
+                    await _reset_sequence(session, entry["name"])
+            for table_name, name, definition in foreign_keys:
+                await session.execute(
+                    text(f"ALTER TABLE {table_name} ADD CONSTRAINT {name} {definition}")
+                )
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+    return header
+
+
+async def _reset_sequence(session: AsyncSession, table_name: str) -> None:
+    """Make the table's id sequence continue after the largest stored id."""
+    await session.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+            f"coalesce(max(id), 1), max(id) IS NOT NULL) FROM {table_name}"
+        )
+    )
+
+
+async def _drop_foreign_keys(
+    session: AsyncSession, tables: list[dict]
+) -> list[tuple[str, str, str]]:
+    """Drop the tables' foreign keys, returning `(table, name, definition)`s."""
+    result = await session.execute(
+        text(
+            "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+            "FROM pg_constraint WHERE contype = 'f' AND conrelid = ANY("
+            "SELECT to_regclass(name) FROM unnest(CAST(:names AS text[])) AS name)"
+        ),
+        {"names": [entry["name"] for entry in tables]},
+    )
+    foreign_keys = [tuple(row) for row in result]
+    for table_name, name, _ in foreign_keys:
+        await session.execute(text(f"ALTER TABLE {table_name} DROP CONSTRAINT {name}"))
+    return foreign_keys
@@ -1,6 +1,10 @@
 from .character import Character
 from .film import Film
 from .starship import Starship
+from .sync import SyncState
+from .job import ImportJob
+from .checkpoint import ImportCheckpoint
+from .shard import ImportShard, StagedLink
 from .links import (
     CharacterFilmLink,
     StarshipFilmLink,
@@ -14,4 +18,9 @@ __all__ = [
     "CharacterFilmLink",
     "StarshipFilmLink",
     "CharacterStarshipLink",
+    "SyncState",
+    "ImportJob",
+    "ImportCheckpoint",
+    "ImportShard",
+    "StagedLink",
 ]
@@ -11,7 +11,10 @@ if TYPE_CHECKING:
 
 class Character(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    name: str
+    name: str = Field(unique=True)
+    swapi_id: int | None = Field(default=None, index=True)
+    # Hash of the imported content, re-imports only rewrite rows where it changed
+    content_hash: str | None = None
     gender: str | None
     birth_year: str | None
 
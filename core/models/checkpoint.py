@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, text
+from sqlmodel import SQLModel, Field
+
+
+class ImportCheckpoint(SQLModel, table=True):
+    """Last batch an unfinished import of a SWAPI resource committed."""
+
+    resource: str = Field(primary_key=True)
+    # Page the last written record came from
+    page: int
+    # SWAPI id of that record, records up to it are skipped on resume
+    record: int | None = None
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=text("now()")
+        )
+    )
@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import SQLModel, Field
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class ImportJob(SQLModel, table=True):
+    """A SWAPI import requested through the API and run by `scripts/worker.py`."""
+
+    __table_args__ = (
+        # Single flight: at most one queued or running job per kind
+        Index(
+            "ix_importjob_active_kind",
+            "kind",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    kind: str = "swapi"
+    status: str = Field(default="queued", index=True)
+    attempts: int = 0
+    worker: str | None = None
+    error: str | None = None
+    # `ImporterStats` snapshots by resource, refreshed with every heartbeat
+    stats: dict | None = Field(default=None, sa_column=Column(JSONB))
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=text("now()")
+        )
+    )
+    started_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    # Refreshed by the worker while the job runs, stale ones get requeued
+    heartbeat_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    finished_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
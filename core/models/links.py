@@ -1,18 +1,25 @@
 from sqlmodel import SQLModel, Field
 
+# The composite primary keys only serve lookups by their first column, the
+# second column of each link table has its own index for the reverse side.
+
 
 class CharacterFilmLink(SQLModel, table=True):
     character_id: int | None = Field(
         default=None, foreign_key="character.id", primary_key=True
     )
-    film_id: int | None = Field(default=None, foreign_key="film.id", primary_key=True)
+    film_id: int | None = Field(
+        default=None, foreign_key="film.id", primary_key=True, index=True
+    )
 
 
 class StarshipFilmLink(SQLModel, table=True):
     starship_id: int | None = Field(
         default=None, foreign_key="starship.id", primary_key=True
     )
-    film_id: int | None = Field(default=None, foreign_key="film.id", primary_key=True)
+    film_id: int | None = Field(
+        default=None, foreign_key="film.id", primary_key=True, index=True
+    )
 
 
 class CharacterStarshipLink(SQLModel, table=True):
@@ -20,5 +27,5 @@ class CharacterStarshipLink(SQLModel, table=True):
         default=None, foreign_key="character.id", primary_key=True
     )
     starship_id: int | None = Field(
-        default=None, foreign_key="starship.id", primary_key=True
+        default=None, foreign_key="starship.id", primary_key=True, index=True
     )
@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import SQLModel, Field
+
+SHARD_STATUSES = ("pending", "running", "done", "failed")
+# Staged once per written character (target 0): the characters whose link
+# sets the merge replaces
+STAGED_CHARACTER = "character"
+
+
+class ImportShard(SQLModel, table=True):
+    """A page range of one SWAPI resource, imported by a `ShardedImport` worker."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    # Every shard of one sharded import shares its run id
+    run_id: str = Field(index=True)
+    resource: str
+    first_page: int
+    last_page: int
+    status: str = Field(default="pending", index=True)
+    attempts: int = 0
+    worker: str | None = None
+    error: str | None = None
+    # `ImporterStats` snapshot of the shard's importer
+    stats: dict | None = Field(default=None, sa_column=Column(JSONB))
+    started_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    finished_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=text("now()")
+        )
+    )
+
+
+class StagedLink(SQLModel, table=True):
+    """
+    A character link written by a shard, by SWAPI ids.
+
+    Shards import films, starships and characters at the same time, so
+    character links are only resolved to primary keys once every shard is
+    done (`merge_links()`).
+    """
+
+    run_id: str = Field(primary_key=True)
+    # "films", "starships" or `STAGED_CHARACTER`
+    kind: str = Field(primary_key=True)
+    character_swapi_id: int = Field(primary_key=True)
+    target_swapi_id: int = Field(primary_key=True)
@@ -6,7 +6,10 @@ from sqlmodel import SQLModel, Field, Relationship
 
 class Starship(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    name: str
+    name: str = Field(unique=True)
+    swapi_id: int | None = Field(default=None, index=True)
+    # Hash of the imported content, re-imports only rewrite rows where it changed
+    content_hash: str | None = None
     model: str | None
     manufacturer: str | None
 
@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime
+from sqlmodel import SQLModel, Field
+
+
+class SyncState(SQLModel, table=True):
+    """What the last successful import saw for one page of a SWAPI resource."""
+
+    resource: str = Field(primary_key=True)
+    page: int = Field(primary_key=True)
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    # Total upstream count and this page's size, to plan pages on a 304
+    count: int | None = None
+    record_count: int | None = None
+    # Newest `edited` timestamp among the page's records
+    max_edited: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    synced_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
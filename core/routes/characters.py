@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
-from core.database.session import get_session
+from core.database.session import get_read_session
 from core.schemas import CharacterRead
 from core.crud.character import get_characters, get_character
 from core.schemas.pagination import PaginatedResponse
@@ -12,12 +12,17 @@ router = APIRouter(prefix="/characters", tags=["Characters"])
 async def characters(
     request: Request,
     page: int = Query(1, ge=1),
+    cursor: str | None = Query(
+        None, description="Keyset pagination token; empty for the first page"
+    ),
     name: str | None = Query(None, min_length=1),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    return await get_characters(session, request, name, page)
+    return await get_characters(session, request, name, page, cursor)
 
 
 @router.get("/{character_id}/", response_model=CharacterRead)
-async def character(character_id: int, session: AsyncSession = Depends(get_session)):
+async def character(
+    character_id: int, session: AsyncSession = Depends(get_read_session)
+):
     return await get_character(character_id, session)
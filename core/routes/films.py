@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
-from core.database.session import get_session
+from core.database.session import get_read_session
 from core.schemas import FilmRead
 from core.crud.film import get_films, get_film
 from core.schemas.pagination import PaginatedResponse
@@ -12,12 +12,15 @@ router = APIRouter(prefix="/films", tags=["Films"])
 async def films(
     request: Request,
     page: int = Query(1, ge=1),
+    cursor: str | None = Query(
+        None, description="Keyset pagination token; empty for the first page"
+    ),
     title: str | None = Query(None, min_length=1),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    return await get_films(session, request, title, page)
+    return await get_films(session, request, title, page, cursor)
 
 
 @router.get("/{film_id}/", response_model=FilmRead)
-async def film(film_id: int, session: AsyncSession = Depends(get_session)):
+async def film(film_id: int, session: AsyncSession = Depends(get_read_session)):
     return await get_film(film_id, session)
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, status, HTTPException
-from core.crud.integrations import initialize
+from fastapi import APIRouter, Depends, status, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.crud.integrations import enqueue_import, get_import_job
+from core.database.session import get_session
+from core.schemas.job import ImportJobAccepted, ImportJobRead
 
 router = APIRouter(prefix="/import", tags=["Integration"])
 
 
-@router.post("/", status_code=status.HTTP_202_ACCEPTED)
-async def fetch_data():
+@router.post(
+    "/", status_code=status.HTTP_202_ACCEPTED, response_model=ImportJobAccepted
+)
+async def fetch_data(session: AsyncSession = Depends(get_session)):
     try:
-        initialize()
-        return {"detail": "Import started in the background"}
+        job, created = await enqueue_import(session)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    detail = "Import queued" if created else "Import already queued or running"
+    return ImportJobAccepted(
+        detail=detail, job=ImportJobRead.model_validate(job, from_attributes=True)
+    )
+
+
+@router.get("/{job_id}/", response_model=ImportJobRead)
+async def import_status(job_id: int, session: AsyncSession = Depends(get_session)):
+    return await get_import_job(job_id, session)
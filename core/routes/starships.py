@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
-from core.database.session import get_session
+from core.database.session import get_read_session
 from core.schemas import StarshipRead
 from core.crud.starship import get_starships, get_starship
 from core.schemas.pagination import PaginatedResponse
@@ -12,12 +12,15 @@ router = APIRouter(prefix="/starships", tags=["Starships"])
 async def starships(
     request: Request,
     page: int = Query(1, ge=1),
+    cursor: str | None = Query(
+        None, description="Keyset pagination token; empty for the first page"
+    ),
     name: str | None = Query(None, min_length=1),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    return await get_starships(session, request, name, page)
+    return await get_starships(session, request, name, page, cursor)
 
 
 @router.get("/{starship_id}/", response_model=StarshipRead)
-async def starship(starship_id: int, session: AsyncSession = Depends(get_session)):
+async def starship(starship_id: int, session: AsyncSession = Depends(get_read_session)):
     return await get_starship(starship_id, session)
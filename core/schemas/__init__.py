@@ -1,5 +1,6 @@
 from .character import CharacterCreate, CharacterRead
 from .film import FilmCreate, FilmRead
+from .job import ImportJobAccepted, ImportJobRead
 from .starship import StarshipCreate, StarshipRead
 
 __all__ = [
@@ -7,6 +8,8 @@ __all__ = [
     "CharacterRead",
     "FilmCreate",
     "FilmRead",
+    "ImportJobAccepted",
+    "ImportJobRead",
     "StarshipCreate",
     "StarshipRead",
 ]
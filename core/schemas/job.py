@@ -0,0 +1,20 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class ImportJobRead(BaseModel, extra="forbid"):
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    error: str | None
+    stats: dict | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ImportJobAccepted(BaseModel):
+    detail: str
+    job: ImportJobRead
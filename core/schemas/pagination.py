@@ -5,7 +5,8 @@ T = TypeVar("T")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    count: int
+    # Null for lists that don't count (Paginator count="none")
+    count: int | None
     next: str | None
     previous: str | None
     results: list[T]
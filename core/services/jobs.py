@@ -0,0 +1,147 @@
+from datetime import timedelta
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import JOB_MAX_ATTEMPTS, JOB_STALE_AFTER
+from core.models import ImportJob
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ImportJobQueue:
+    """
+    Postgres-backed queue of import jobs.
+
+    - `enqueue()` is single flight: a partial unique index allows one queued
+      or running job per kind, so a second request gets the active job back.
+    - `claim()` picks the oldest queued job with `FOR UPDATE SKIP LOCKED`,
+      so any number of workers can poll without blocking on each other or
+      claiming the same job.
+    - Workers `heartbeat()` while a job runs, `requeue_stale()` hands jobs
+      of workers that died back to the queue (or fails them after
+      `JOB_MAX_ATTEMPTS`).
+    - A claim's attempt number is its lease: `heartbeat()`, `finish()` and
+      `release()` only update the job while it's still running that attempt,
+      so a worker whose job was requeued as stale can't overwrite the run of
+      the worker that claimed it next. They return whether the lease held.
+
+    Every method commits its own short transaction.
+    """
+
+    def __init__(self, session: AsyncSession, kind: str = "swapi"):
+        self.session = session
+        self.kind = kind
+
+    async def enqueue(self) -> tuple[ImportJob, bool]:
+        """Queue a job unless one is active; returns (job, created)."""
+        while True:
+            result = await self.session.execute(
+                insert(ImportJob)
+                .values(kind=self.kind, status="queued")
+                .on_conflict_do_nothing(
+                    index_elements=["kind"],
+                    index_where=ImportJob.status.in_(ACTIVE_STATUSES),
+                )
+                .returning(ImportJob)
+            )
+            job = result.scalar_one_or_none()
+            created = job is not None
+            if not created:
+                result = await self.session.execute(
+                    select(ImportJob).where(
+                        ImportJob.kind == self.kind,
+                        ImportJob.status.in_(ACTIVE_STATUSES),
+                    )
+                )
+                job = result.scalar_one_or_none()
+            await self.session.commit()
+            # The active job may have finished in between, queue a new one then
+            if job is not None:
+                return job, created
+
+    async def claim(self, worker: str) -> ImportJob | None:
+        next_job = (
+            select(ImportJob.id)
+            .where(ImportJob.kind == self.kind, ImportJob.status == "queued")
+            .order_by(ImportJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(ImportJob)
+            .where(ImportJob.id == next_job)
+            .values(
+                status="running",
+                worker=worker,
+                attempts=ImportJob.attempts + 1,
+                error=None,
+                stats=None,
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            .returning(ImportJob)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        job = result.scalar_one_or_none()
+        await self.session.commit()
+        return job
+
+    async def heartbeat(
+        self, job_id: int, attempt: int, stats: dict | None = None
+    ) -> bool:
+        return await self._set(job_id, attempt, heartbeat_at=func.now(), stats=stats)
+
+    async def finish(
+        self,
+        job_id: int,
+        attempt: int,
+        error: str | None = None,
+        stats: dict | None = None,
+    ) -> bool:
+        return await self._set(
+            job_id,
+            attempt,
+            status="failed" if error else "succeeded",
+            error=error,
+            stats=stats,
+            finished_at=func.now(),
+        )
+
+    async def release(self, job_id: int, attempt: int) -> bool:
+        """Put a running job back in the queue (e.g. on worker shutdown)."""
+        return await self._set(job_id, attempt, status="queued", worker=None)
+
+    async def requeue_stale(self) -> None:
+        stale = (
+            ImportJob.kind == self.kind,
+            ImportJob.status == "running",
+            ImportJob.heartbeat_at < func.now() - timedelta(seconds=JOB_STALE_AFTER),
+        )
+        await self.session.execute(
+            update(ImportJob)
+            .where(*stale, ImportJob.attempts < JOB_MAX_ATTEMPTS)
+            .values(status="queued", worker=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            update(ImportJob)
+            .where(*stale, ImportJob.attempts >= JOB_MAX_ATTEMPTS)
+            .values(status="failed", error="Worker lost", finished_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def _set(self, job_id: int, attempt: int, **values) -> bool:
+        result = await self.session.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.id == job_id,
+                ImportJob.attempts == attempt,
+                ImportJob.status == "running",
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount > 0
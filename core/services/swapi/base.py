@@ -1,10 +1,47 @@
 import abc
 import asyncio
+import contextlib
+import itertools
 import math
 import logging
+import multiprocessing
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
 import httpx
+from pydantic import BaseModel
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from core.config import CHUNK_SIZE, MAX_RETRIES, RETRYABLE_CODES, SWAPI_BASE_URL
+from core.config import (
+    DIFF_IMPORT,
+    FETCH_CONCURRENCY,
+    IMPORT_SOURCE,
+    INCREMENTAL_IMPORT,
+    MAX_RETRIES,
+    PARSE_WORKERS,
+    RESUME_IMPORT,
+    RETRYABLE_CODES,
+    STREAM_IMPORT,
+    STREAM_QUEUE_SIZE,
+    SWAPI_BASE_URL,
+    SWAPI_CACHE_DIR,
+    SWAPI_CACHE_MODE,
+    SWAPI_DUMP_DIR,
+    UPSERT_ON_CONFLICT,
+    WRITE_MODE,
+)
+from core.database.bulk import WRITE_MODES, BulkWriter
+from core.services.swapi.batching import BatchSizer
+from core.services.swapi.cache import CACHE_MODES, CacheMiss, ResponseCache
+from core.services.swapi.checkpoint import CheckpointTracker
+from core.services.swapi.client import create_client
+from core.services.swapi.diff import Changeset, content_hash
+from core.services.swapi.dump import IMPORT_SOURCES, DumpReader
+from core.services.swapi.stats import ImporterStats
+from core.services.swapi.sync import SyncTracker
+from core.services.swapi.throttle import Throttle, backoff_delay, parse_retry_after
+from core.services.swapi.validation import validate_batch
 
 logger = logging.getLogger(__name__)
 
@@ -16,31 +53,156 @@ class SwapiImporterBase(abc.ABC):
     Responsibilities:
     - Fetch paginated data from a SWAPI resource endpoint.
     - Parse each item into a database model instance.
-    - Deduplicate data using a `prefetch_existing()` hook.
+    - Deduplicate data on a unique natural key (`ON CONFLICT`) for bulk
+      writes, or with a `prefetch_existing()` hook for ORM writes.
     - Insert parsed objects into the database in batches.
+    - Keep the SWAPI id of every record (`swapi_id`) so other importers can
+      resolve links to it without loading the rows.
     - Handle network errors, retries, and malformed responses gracefully.
 
     Subclasses must implement:
         - `resource`: the SWAPI resource name (e.g. 'people', 'films', 'starships')
+        - `model`: the SQLModel table the importer writes to
+        - `natural_key`: the unique column bulk writes upsert on (e.g. 'name')
         - `parse()`: logic to convert a raw SWAPI dict into a database model
 
     Optional override:
-        - `prefetch_existing()`: preload existing DB entries to support deduplication
+        - `depends_on`: importers that must finish first (see `ImportScheduler`)
+        - `prefetch_existing()`: preload existing DB entries (ORM writes dedupe
+          against these, bulk writes rely on the unique constraint instead)
+        - `write_links()`: bulk insert link table rows for a written batch
+          (runs for every write mode)
+        - `schema` and `prepare()`: enable the batch parse path (see
+          `parse_batch()`), `to_row()` to add or record anything the schema
+          doesn't cover
 
     Notes:
-    - Uses `httpx.AsyncClient` with retry logic for robustness.
+    - Uses a pooled `httpx.AsyncClient` with retry logic for robustness. Pass
+      `client` to share one pool across importers, otherwise the importer
+      opens its own for the duration of `fetch_all()`.
+    - Requests go through a `Throttle` (AIMD rate limiter, circuit breaker);
+      retries back off with jitter and honour `Retry-After`. Pass `throttle`
+      to share one upstream budget across importers.
+    - With `stream=True` pages are parsed and written while later pages are
+      still downloading, keeping memory flat regardless of dataset size.
+    - `write_mode` selects how batches are written: `copy` (PostgreSQL COPY),
+      `insert` (multi-row INSERT ... RETURNING) or `orm` (session.add_all).
+      `on_conflict` decides whether bulk writes skip (`nothing`) or refresh
+      (`update`) rows that already exist.
+    - With `incremental=True` pages are requested conditionally (ETag /
+      Last-Modified) and pages or records unchanged since the last successful
+      run are skipped, see `SyncTracker`.
+    - Pages are validated in one pydantic call each and flow to the writers
+      as plain row dicts (`parse_batch()`). With `parse_workers` the
+      validation runs in that many worker processes, for very large dumps.
+    - `batch_mode` decides how many records go in each write batch, see
+      `BatchSizer`: `adaptive` (sized to a target commit time), `fixed`
+      (`CHUNK_SIZE`) or `single` (one transaction for the whole run).
+    - `cache_mode` puts an on-disk `ResponseCache` under `fetch_page()`:
+      `live` (no cache), `record` (fetch and store every page) or `replay`
+      (serve pages from the cache only, never touching the network).
+    - With `resume=True` every committed batch also stores a checkpoint (page
+      and SWAPI id of its last record, see `CheckpointTracker`). A run that
+      finds one continues after it instead of starting over at page 1, and
+      clears it once everything has been written.
+    - With `diff=True` (bulk write modes) every row carries a `content_hash`
+      of its content and links. Batches are compared against the stored
+      hashes, only new and changed rows are written and links are synced as
+      deltas, see `Changeset`. `dry_run=True` records the changeset in
+      `self.changes` without writing anything.
+    - `source="dump"` reads the records from a local dump file under
+      `dump_dir` instead of the API (`DumpReader`), through the same parse
+      and write stages; dumps are always streamed and never synced.
+    - `pages=(first, last)` limits the run to that inclusive page range (a
+      shard of a `ShardedImport`). Page 1 isn't fetched to plan the range,
+      and shards keep no sync state or checkpoints of their own.
+    - `base_url` points the importer at another SWAPI compatible upstream
+      (a mirror, or `FakeSwapi`), defaults to `SWAPI_BASE_URL`.
     - Designed to be subclassed by specific importers for each resource type.
     - Ensures clean logging for monitoring import progress and errors.
     """
 
-    def __init__(self, session: AsyncSession):
+    resource: str
+    model: type[SQLModel]
+    natural_key: str
+    schema: type[BaseModel] | None = None
+    depends_on: tuple[type["SwapiImporterBase"], ...] = ()
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        client: httpx.AsyncClient | None = None,
+        stream: bool | None = None,
+        write_mode: str | None = None,
+        on_conflict: str | None = None,
+        incremental: bool | None = None,
+        cache_mode: str | None = None,
+        throttle: Throttle | None = None,
+        resume: bool | None = None,
+        parse_workers: int | None = None,
+        batch_mode: str | None = None,
+        pages: tuple[int, int] | None = None,
+        base_url: str | None = None,
+        diff: bool | None = None,
+        dry_run: bool = False,
+        source: str | None = None,
+        dump_dir: str | None = None,
+    ):
         self.session = session
-
-    @property
-    @abc.abstractmethod
-    def resource(self) -> str:
-        """SWAPI resource name (e.g., 'people', 'films')."""
-        raise NotImplementedError
+        self.client = client
+        self.stream = STREAM_IMPORT if stream is None else stream
+        self.write_mode = write_mode or WRITE_MODE
+        if self.write_mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode: {self.write_mode}")
+        self.on_conflict = on_conflict or UPSERT_ON_CONFLICT
+        # The diff relies on the bulk writers, ORM writes keep skipping rows
+        self.diff = (DIFF_IMPORT if diff is None else diff) and self.write_mode != "orm"
+        self.dry_run = dry_run
+        if dry_run and not self.diff:
+            raise ValueError("Dry runs need diffing and a bulk write mode")
+        self.changes: Changeset | None = None
+        # Stand-in primary keys of the rows a dry run would insert
+        self.placeholder_ids = itertools.count(-1, -1)
+        self.incremental = INCREMENTAL_IMPORT if incremental is None else incremental
+        # A shard only sees part of the pages, it can't tell what was deleted
+        # upstream or where the whole resource left off
+        self.pages = pages
+        if pages:
+            self.incremental = False
+        self.sync: SyncTracker | None = None
+        self.cache_mode = cache_mode or SWAPI_CACHE_MODE
+        if self.cache_mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode: {self.cache_mode}")
+        self.throttle = throttle or Throttle()
+        self.resume = RESUME_IMPORT if resume is None else resume
+        if pages or dry_run:
+            self.resume = False
+        self.checkpoint: CheckpointTracker | None = None
+        self.parse_workers = PARSE_WORKERS if parse_workers is None else parse_workers
+        self.pool: ProcessPoolExecutor | None = None
+        self.batcher = BatchSizer(batch_mode)
+        self.stats = ImporterStats(self.resource)
+        self.stats.batch_sizes = self.batcher.snapshot()
+        self.cache = (
+            ResponseCache(SWAPI_CACHE_DIR) if self.cache_mode != "live" else None
+        )
+        self.base_url = base_url or SWAPI_BASE_URL
+        self.source = source or IMPORT_SOURCE
+        if self.source not in IMPORT_SOURCES:
+            raise ValueError(f"Unsupported import source: {self.source}")
+        self.dump: DumpReader | None = None
+        if self.source == "dump":
+            self.dump = DumpReader(dump_dir or SWAPI_DUMP_DIR, self.resource)
+            # Read front to back with flat memory, nothing to sync against
+            self.stream = True
+            self.incremental = False
+
+    @staticmethod
+    def extract_id(url: str | None) -> int | None:
+        """SWAPI id from a resource URL (e.g. `.../films/1/` -> 1)."""
+        if not url:
+            return None
+        return int(url.rstrip("/").split("/")[-1])
 
     async def prefetch_existing(self) -> None:
         """
@@ -54,91 +216,545 @@ class SwapiImporterBase(abc.ABC):
         """Parse SWAPI object into a model and add to session."""
         raise NotImplementedError
 
+    @contextlib.asynccontextmanager
+    async def http_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or open a pooled one for the block."""
+        if self.client is not None:
+            yield self.client
+            return
+
+        async with create_client() as client:
+            self.client = client
+            try:
+                yield client
+            finally:
+                self.client = None
+
     async def fetch_page(self, page: int) -> dict:
         """Perform api call per page"""
-        url = f"{SWAPI_BASE_URL}/{self.resource}/?page={page}"
+        if self.dump:
+            return await self.dump.page(page)
 
-        for attempt in range(MAX_RETRIES):
-            try:
-                # Disabling SSL verification with 'verify=false'
-                async with httpx.AsyncClient(verify=False, timeout=10) as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    data = response.json()
+        url = f"{self.base_url}/{self.resource}/?page={page}"
+
+        if self.cache_mode == "replay":
+            response = await asyncio.to_thread(self.cache.load, url)
+            if response is None:
+                raise CacheMiss(f"[{self.resource}] Page {page} is not cached: {url}")
+            self.stats.record_page(len(response.content))
+            return self._read_page(page, response)
 
-                    if not isinstance(data, dict) or "results" not in data:
-                        raise ValueError(f"Malformed response: {data}")
+        async with self.http_client() as client:
+            return await self._fetch_with_retries(client, url, page)
 
-                    return data
+    def _read_page(self, page: int, response: httpx.Response) -> dict:
+        """Validate a successful page response and record it for syncing."""
+        data = response.json()
+
+        if not isinstance(data, dict) or "results" not in data:
+            raise ValueError(f"Malformed response: {data}")
+
+        return self.sync.observe(page, response, data) if self.sync else data
+
+    async def _fetch_with_retries(
+        self, client: httpx.AsyncClient, url: str, page: int
+    ) -> dict:
+        # Recording needs every body, so don't let the upstream answer 304
+        headers = None
+        if self.sync and self.cache_mode != "record":
+            headers = self.sync.conditional_headers(page)
+
+        for attempt in range(MAX_RETRIES):
+            # Fails fast with CircuitOpenError while the upstream is down
+            trial = await self.throttle.before_request()
+            try:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url, headers=headers)
+                finally:
+                    self.stats.record_fetch(time.perf_counter() - start)
+                if self.sync and response.status_code == 304:
+                    self.stats.record_page(0)
+                    self.throttle.record_success()
+                    logger.info(f"[{self.resource}] Page {page} not modified")
+                    return self.sync.unchanged(page)
+
+                response.raise_for_status()
+                self.throttle.record_success()
+                self.stats.record_page(len(response.content))
+                data = self._read_page(page, response)
+                if self.cache_mode == "record":
+                    await asyncio.to_thread(self.cache.store, url, response)
+                return data
 
             except httpx.HTTPStatusError as e:
                 status = e.response.status_code
+                retry_after = None
+                if status in RETRYABLE_CODES:
+                    retry_after = parse_retry_after(
+                        e.response.headers.get("Retry-After")
+                    )
+                self.throttle.record_failure(status, retry_after)
                 if status in RETRYABLE_CODES:
                     logger.warning(
                         f"[{self.resource}] HTTP {status} on {url}, retrying ({attempt + 1}/{MAX_RETRIES})"
                     )
-                    await asyncio.sleep(2**attempt)
+                    await self._backoff(attempt, retry_after)
                 else:
                     logger.error(f"[{self.resource}] Non-retryable HTTP error: {e}")
                     raise
 
             except httpx.RequestError as e:
+                self.throttle.record_failure()
                 logger.warning(
                     f"[{self.resource}] Network error on {url}: {e}, retrying ({attempt + 1}/{MAX_RETRIES})"
                 )
-                await asyncio.sleep(2**attempt)
+                await self._backoff(attempt)
 
             except Exception as e:
                 logger.error(f"[{self.resource}] Unexpected error: {e}")
                 raise
 
+            finally:
+                # A cancelled or failed half-open trial must not block the circuit
+                self.throttle.end_trial(trial)
+
         raise RuntimeError(
             f"[{self.resource}] Failed to fetch page {page} after {MAX_RETRIES} attempts."
         )
 
+    async def _backoff(self, attempt: int, retry_after: float | None = None) -> None:
+        # Nothing to wait for after the last attempt
+        if attempt + 1 < MAX_RETRIES:
+            self.throttle.retries += 1
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+
     async def fetch_all(self) -> list[dict]:
-        """Collect all results from paginated endpoints"""
+        """
+        Collect all results from paginated endpoints.
+
+        Page 1 is fetched first to learn the total count, the remaining pages
+        are then fetched concurrently (at most `FETCH_CONCURRENCY` in flight)
+        and their results are returned in page order.
+        """
         logger.info(f"[{self.resource}] Fetching all data...")
-        all_results = []
 
-        first_page = await self.fetch_page(1)
-        all_results.extend(first_page["results"])
+        return [record async for page in self.iter_pages() for record in page]
 
-        total_count = first_page.get("count", 0)
-        page_size = len(first_page["results"]) or 1
-        total_pages = math.ceil(total_count / page_size)
+    async def iter_pages(self) -> AsyncIterator[list[dict]]:
+        """Yield the results of each page, in page order, as soon as it arrives."""
+        async for _, records in self.iter_numbered_pages():
+            yield records
 
-        for page in range(2, total_pages + 1):
-            logger.info(f"[{self.resource}] Fetching page {page}/{total_pages}")
-            page_data = await self.fetch_page(page)
-            all_results.extend(page_data.get("results", []))
+    async def iter_numbered_pages(
+        self, start_page: int = 1, end_page: int | None = None
+    ) -> AsyncIterator[tuple[int, list[dict]]]:
+        """
+        Yield `(page, results)` from `start_page` on, in page order.
 
-        return all_results
+        At most `FETCH_CONCURRENCY` requests are in flight and at most
+        `STREAM_QUEUE_SIZE` finished pages are held ahead of the consumer, so
+        a slow consumer pauses the downloads instead of buffering the dataset.
+        Without `end_page`, page 1 is always fetched to plan the remaining
+        pages; with it, exactly `start_page..end_page` are fetched.
+        """
+        if self.dump:
+            async for page, records in self.dump.iter_pages(start_page, end_page):
+                self.stats.record_page(0)
+                yield page, await self._changed_records(page, {"results": records})
+            return
 
-    async def run(self):
-        """Main drive of the importer"""
-        logger.info(f"[{self.resource}] Starting import process...")
+        # Replays are served from disk, don't open a connection pool for them
+        replay = self.cache_mode == "replay"
+        async with contextlib.nullcontext() if replay else self.http_client():
+            if end_page is None:
+                first_page = await self.fetch_page(1)
+                if start_page <= 1:
+                    yield 1, await self._changed_records(1, first_page)
+                end_page = self.count_pages(first_page)
+                start_page = max(2, start_page)
+
+            semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+            async def fetch(page: int) -> dict:
+                async with semaphore:
+                    logger.info(f"[{self.resource}] Fetching page {page}/{end_page}")
+                    return page, await self.fetch_page(page)
+
+            pending: deque[asyncio.Task] = deque()
+            next_page = start_page
+            try:
+                while pending or next_page <= end_page:
+                    while (
+                        next_page <= end_page
+                        and len(pending) < FETCH_CONCURRENCY + STREAM_QUEUE_SIZE
+                    ):
+                        pending.append(asyncio.create_task(fetch(next_page)))
+                        next_page += 1
+
+                    page, page_data = await pending.popleft()
+                    yield page, await self._changed_records(page, page_data)
+            finally:
+                # Don't leave sibling requests running once one page has failed
+                # or the consumer has stopped early
+                for task in pending:
+                    task.cancel()
+
+    @staticmethod
+    def count_pages(first_page: dict) -> int:
+        """Number of pages of a resource, from its first page."""
+        total_count = first_page.get("count") or 0
+        # Pages served from the sync state carry the size they had upstream
+        page_size = first_page.get("page_size") or len(first_page["results"]) or 1
+        return math.ceil(total_count / page_size)
+
+    async def _changed_records(self, page: int, page_data: dict) -> list[dict]:
+        records = page_data.get("results", [])
+        saved = self.checkpoint.saved if self.checkpoint else None
+        if saved and page == saved.page and saved.record is not None:
+            # Resuming: skip the records of this page that were written already
+            ids = [self.extract_id(record.get("url")) for record in records]
+            if saved.record in ids:
+                records = records[ids.index(saved.record) + 1 :]
+        if not self.sync:
+            return records
+        if not self.page_complete(records):
+            self.sync.forget(page)
+        return await self.sync.changed_records(page, records)
+
+    def page_complete(self, records: list[dict]) -> bool:
+        """
+        Whether a page's records can be written completely this run. Pages
+        that can't (e.g. links to records that aren't imported yet) aren't
+        remembered by incremental imports, so the next run fetches them again.
+        """
+        return True
 
-        await self.prefetch_existing()
+    def prepare(self, raw_data: dict) -> dict | None:
+        """Input for `schema` from one raw record, None to skip the record."""
+        return {name: raw_data.get(name) for name in self.schema.model_fields}
 
-        raw_data_list = await self.fetch_all()
-        objects = []
+    def to_row(self, raw_data: dict, data: dict, links: dict | None = None) -> dict:
+        """
+        Row to write for one validated record. `links` count towards its
+        content hash, so a new link is a change of the row.
+        """
+        row = {**data, "swapi_id": self.extract_id(raw_data.get("url"))}
+        row["content_hash"] = content_hash({**row, **(links or {})})
+        return row
+
+    async def parse_batch(self, raw_data_list: list[dict]) -> list:
+        """
+        Validate a page of raw records at once, returning rows to write.
 
+        The page is validated with a single `TypeAdapter(list[schema])` call
+        (in `self.pool` when there is one) instead of one model per record,
+        and no ORM objects are built. Invalid records are logged and counted
+        as rejected, the rest of the page goes on.
+        Importers without a `schema` fall back to `parse_many()`.
+        """
+        if self.schema is None:
+            return await self.parse_many(raw_data_list)
+
+        start = time.perf_counter()
+        accepted, inputs = [], []
+        for raw in raw_data_list:
+            if (data := self.prepare(raw)) is not None:
+                accepted.append(raw)
+                inputs.append(data)
+
+        if self.pool:
+            loop = asyncio.get_running_loop()
+            validated, errors = await loop.run_in_executor(
+                self.pool, validate_batch, self.schema, inputs
+            )
+        else:
+            validated, errors = validate_batch(self.schema, inputs)
+
+        for index, error in errors.items():
+            key = inputs[index].get(self.natural_key)
+            logger.warning(
+                f"[{self.resource}] Skipping invalid record {key!r}: {error}"
+            )
+
+        rows = []
+        for raw, data in zip(accepted, validated):
+            if data is None:
+                continue
+            try:
+                rows.append(self.to_row(raw, data))
+            except Exception as e:
+                logger.error(f"[{self.resource}] Skipping invalid record: {e}")
+
+        # Rejected covers invalid records and the ones `prepare()` skipped
+        self.stats.record_parse(
+            len(rows), len(raw_data_list) - len(rows), time.perf_counter() - start
+        )
+        return rows
+
+    async def parse_many(self, raw_data_list: list[dict]) -> list:
+        """Parse a page of raw records, skipping the ones that fail."""
+        start = time.perf_counter()
+        objects = []
         for raw in raw_data_list:
             try:
                 if obj := await self.parse(raw):
                     objects.append(obj)
             except Exception as e:
                 logger.error(f"[{self.resource}] Skipping invalid record: {e}")
+        # Rejected covers invalid records and the ones `parse()` skipped
+        self.stats.record_parse(
+            len(objects),
+            len(raw_data_list) - len(objects),
+            time.perf_counter() - start,
+        )
+        return objects
 
-        if not objects:
-            logger.warning(f"[{self.resource}] No valid records to insert.")
-            return
+    async def write(self, objects: list) -> None:
+        """
+        Insert one batch of parsed rows (or model objects) and commit it.
 
-        logger.info(f"[{self.resource}] Inserting {len(objects)} records in batches...")
+        In `single` batch mode the batch is only flushed, `run()` commits
+        once everything has been written.
+        """
+        start = time.perf_counter()
+        rows = [
+            obj if isinstance(obj, dict) else obj.model_dump(exclude={"id"})
+            for obj in objects
+        ]
+        if self.write_mode == "orm":
+            instances = [self.model(**row) for row in rows]
+            self.session.add_all(instances)
+            await self.session.flush()
+            ids = [obj.id for obj in instances]
+            writer = BulkWriter(self.session, "insert")
+            writer.inserted_rows = len(instances)
+        else:
+            writer = BulkWriter(self.session, self.write_mode)
+            on_conflict = self.on_conflict
+            if self.changes:
+                # Only new and changed rows go on, the changed ones overwrite
+                rows, stored_ids, unchanged = await self.changes.split(
+                    writer, self.model.__table__, self.natural_key, rows
+                )
+                self.discard(unchanged)
+                on_conflict = "update"
+            if self.dry_run:
+                ids = [
+                    next(self.placeholder_ids) if id_ is None else id_
+                    for id_ in stored_ids
+                ]
+            else:
+                id_map = await writer.upsert(
+                    self.model.__table__,
+                    rows,
+                    self.natural_key,
+                    on_conflict,
+                    # Rows imported before `swapi_id` existed pick it up on rerun
+                    backfill=("swapi_id",),
+                )
+                ids = [id_map[row[self.natural_key]] for row in rows]
 
-        for i in range(0, len(objects), CHUNK_SIZE):
-            self.session.add_all(objects[i : i + CHUNK_SIZE])
+        await self.write_links(writer, rows, ids)
+        # Same transaction as the batch, so a resume never skips unwritten rows
+        if self.checkpoint:
+            await self.checkpoint.save()
+        if self.batcher.commits_batches and not self.dry_run:
             await self.session.commit()
+        seconds = time.perf_counter() - start
+        self.stats.record_write(
+            len(objects), writer.inserted_rows, writer.link_rows, seconds
+        )
+        self.batcher.observe(len(objects), seconds)
+        self.stats.batch_sizes = self.batcher.snapshot()
+        if self.changes:
+            self.stats.changes = self.changes.snapshot()
+
+    def discard(self, rows: list[dict]) -> None:
+        """Optional hook to drop state kept for rows that won't be written."""
+        pass
+
+    async def write_links(
+        self, writer: BulkWriter, rows: list[dict], ids: list[int]
+    ) -> None:
+        """
+        Optional hook to bulk insert link rows for a written batch (by pk).
+        When diffing (`self.changes`), sync the links with
+        `Changeset.sync_links()` instead.
+        """
+        pass
+
+    async def run(self):
+        """Main drive of the importer"""
+        logger.info(
+            f"[{self.resource}] Starting {'streaming ' if self.stream else ''}"
+            "import process..."
+        )
+
+        self.stats.start()
+        status = "failed"
+        try:
+            await self.prefetch_existing()
+
+            if self.diff:
+                self.changes = Changeset(self.resource, self.dry_run)
+            if self.incremental:
+                self.sync = SyncTracker(
+                    self.session, self.resource, getattr(self.model, self.natural_key)
+                )
+                await self.sync.load()
+
+            start_page, end_page = self.pages or (1, None)
+            if self.resume:
+                self.checkpoint = CheckpointTracker(self.session, self.resource)
+                if saved := await self.checkpoint.load():
+                    start_page = saved.page
+                    self.stats.resumed_from = {
+                        "page": saved.page,
+                        "record": saved.record,
+                    }
+                    logger.info(
+                        f"[{self.resource}] Resuming after record {saved.record} "
+                        f"of page {saved.page}"
+                    )
+
+            if self.parse_workers and self.schema:
+                # Spawned, forking would copy the event loop and DB connections
+                self.pool = ProcessPoolExecutor(
+                    self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+
+            pages = (
+                self.iter_numbered_pages(start_page, end_page)
+                if self.stream
+                else self._fetch_all_pages(start_page, end_page)
+            )
+            inserted = await self._run_pipeline(pages)
+
+            if self.dry_run:
+                # Nothing was written, and nothing may be remembered either
+                await self.session.rollback()
+            else:
+                # Only remember what was seen once everything has been written
+                if self.sync:
+                    await self.sync.save()
+                if self.checkpoint:
+                    await self.checkpoint.clear()
+                # Also commits the whole run in `single` batch mode
+                await self.session.commit()
+            status = "succeeded"
+        finally:
+            self.sync = None
+            self.checkpoint = None
+            if self.pool:
+                self.pool.shutdown(cancel_futures=True)
+                self.pool = None
+            self.stats.finish(status)
+            logger.info(self.stats.summary())
+            if self.changes:
+                self.stats.changes = self.changes.snapshot()
+                logger.info(self.changes.summary())
+
+        if not inserted:
+            logger.warning(f"[{self.resource}] No valid records to insert.")
+            return
 
         logger.info(f"[{self.resource}] Import completed successfully.")
+
+    async def _fetch_all_pages(
+        self, start_page: int = 1, end_page: int | None = None
+    ) -> AsyncIterator[tuple[int, list[dict]]]:
+        # Non-streaming mode: download everything first, then parse and insert
+        logger.info(f"[{self.resource}] Fetching all data...")
+        pages = [page async for page in self.iter_numbered_pages(start_page, end_page)]
+        for page in pages:
+            yield page
+
+    async def _run_pipeline(self, pages: AsyncIterator[tuple[int, list[dict]]]) -> int:
+        """
+        Run the fetch -> parse -> write stages concurrently.
+
+        The stages are connected by bounded queues, so while one batch is
+        being written the next pages are already downloading and parsing, and
+        a slow stage applies backpressure to the ones before it.
+        Returns the number of inserted records.
+        """
+        raw_queue: asyncio.Queue[tuple[int, list[dict]] | None] = asyncio.Queue(
+            STREAM_QUEUE_SIZE
+        )
+        parsed_queue: asyncio.Queue[tuple[int, list] | None] = asyncio.Queue(
+            STREAM_QUEUE_SIZE
+        )
+        inserted = 0
+
+        async def fetch_stage():
+            while True:
+                start = time.perf_counter()
+                try:
+                    raw_page = await anext(pages)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    self.stats.fetch_time += time.perf_counter() - start
+                await raw_queue.put(raw_page)
+            await raw_queue.put(None)
+
+        async def parse_stage():
+            # With a process pool, validate several pages at once (in order)
+            in_flight: deque[tuple[int, asyncio.Task]] = deque()
+            try:
+                while (raw_page := await raw_queue.get()) is not None:
+                    page, records = raw_page
+                    task = asyncio.create_task(self.parse_batch(records))
+                    in_flight.append((page, task))
+                    if len(in_flight) >= max(1, self.parse_workers):
+                        page, task = in_flight.popleft()
+                        await parsed_queue.put((page, await task))
+                while in_flight:
+                    page, task = in_flight.popleft()
+                    await parsed_queue.put((page, await task))
+            finally:
+                for _, task in in_flight:
+                    task.cancel()
+            await parsed_queue.put(None)
+
+        async def write_stage():
+            nonlocal inserted
+            # (page, object) pairs, the page of a batch's last object is its
+            # checkpoint
+            buffer = []
+            while (parsed := await parsed_queue.get()) is not None:
+                page, objects = parsed
+                buffer.extend((page, obj) for obj in objects)
+                # The size can change after every batch in adaptive mode
+                while len(buffer) >= (size := self.batcher.size):
+                    batch, buffer = buffer[:size], buffer[size:]
+                    await self._write_batch(batch)
+                    inserted += len(batch)
+            if buffer:
+                await self._write_batch(buffer)
+                inserted += len(buffer)
+
+        tasks = [
+            asyncio.create_task(stage())
+            for stage in (fetch_stage, parse_stage, write_stage)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            await pages.aclose()
+
+        return inserted
+
+    async def _write_batch(self, batch: list[tuple[int, object]]) -> None:
+        logger.info(f"[{self.resource}] Inserting batch of {len(batch)} records...")
+        if self.checkpoint:
+            page, last = batch[-1]
+            row = last if isinstance(last, dict) else vars(last)
+            self.checkpoint.stage(page, row.get("swapi_id"))
+        await self.write([obj for _, obj in batch])
@@ -0,0 +1,78 @@
+from core.config import (
+    BATCH_MAX_SIZE,
+    BATCH_MIN_SIZE,
+    BATCH_MODE,
+    BATCH_TARGET_SECONDS,
+    CHUNK_SIZE,
+)
+
+BATCH_MODES = ("adaptive", "fixed", "single")
+# Commit times this close to the target leave the size alone
+TOLERANCE = 0.2
+# Most a batch can grow or shrink from one batch to the next
+MAX_STEP = 2.0
+
+
+class BatchSizer:
+    """
+    Picks how many records the importer writes (and commits) per batch.
+
+    - `adaptive`: starts at `initial` and after every batch scales the size
+      towards `target` seconds per commit, using the latency the batch just
+      had. Steps are capped at 2x either way and clamped to
+      `[min_size, max_size]`, so one slow commit (autovacuum, a lock) doesn't
+      collapse the batch size.
+    - `fixed`: always `initial` records per batch and commit.
+    - `single`: `initial` records per batch, but the whole run is committed
+      as one transaction at the end (all or nothing, no checkpoints).
+
+    `sizes` is the history of the sizes chosen, for the import summary.
+    """
+
+    def __init__(
+        self,
+        mode: str | None = None,
+        initial: int | None = None,
+        target: float = BATCH_TARGET_SECONDS,
+        min_size: int = BATCH_MIN_SIZE,
+        max_size: int = BATCH_MAX_SIZE,
+    ):
+        self.mode = mode or BATCH_MODE
+        if self.mode not in BATCH_MODES:
+            raise ValueError(f"Unsupported batch mode: {self.mode}")
+        self.size = initial or CHUNK_SIZE
+        self.target = target
+        self.min_size = min_size
+        self.max_size = max_size
+        self.sizes = [self.size]
+
+    @property
+    def commits_batches(self) -> bool:
+        return self.mode != "single"
+
+    def observe(self, records: int, seconds: float) -> None:
+        """Adjust the size after a batch of `records` took `seconds` to write."""
+        if self.mode != "adaptive" or records <= 0 or seconds <= 0:
+            return
+
+        ratio = self.target / seconds
+        if abs(ratio - 1) <= TOLERANCE:
+            return
+        # Scale from the records actually written (the last batch of a run
+        # can be short), but never by more than MAX_STEP at once
+        wanted = records * ratio
+        wanted = min(max(wanted, self.size / MAX_STEP), self.size * MAX_STEP)
+        size = int(min(max(wanted, self.min_size), self.max_size))
+        if size != self.size:
+            self.size = size
+            self.sizes.append(size)
+
+    def snapshot(self) -> dict:
+        return {
+            "mode": self.mode,
+            "initial": self.sizes[0],
+            "last": self.size,
+            "min": min(self.sizes),
+            "max": max(self.sizes),
+            "changes": len(self.sizes) - 1,
+        }
@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+
+CACHE_MODES = ("live", "record", "replay")
+
+
+class CacheMiss(LookupError):
+    """Raised in replay mode when a page was never recorded."""
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of SWAPI responses.
+
+    Layout under `directory`:
+    - `objects/<hash[:2]>/<hash>.json.gz`: gzip-compressed response bodies,
+      named by the sha256 of the body, so identical pages are stored once.
+    - `index/<sha256(url)>.json`: per URL, the body hash, ETag,
+      Last-Modified and when it was fetched.
+
+    Files are written to a temporary name and renamed into place, so an
+    interrupted recording never leaves a truncated entry behind.
+
+    Used by `SwapiImporterBase.fetch_page()` in `record` mode (fetch and
+    store) and `replay` mode (serve from disk, no network).
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _index_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / "index" / f"{key}.json"
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.directory / "objects" / content_hash[:2] / f"{content_hash}.json.gz"
+
+    def load(self, url: str) -> httpx.Response | None:
+        """Rebuild the recorded response for `url`, or None if there is none."""
+        try:
+            entry = json.loads(self._index_path(url).read_text())
+            body = gzip.decompress(
+                self._object_path(entry["content_hash"]).read_bytes()
+            )
+        except FileNotFoundError:
+            return None
+
+        headers = {}
+        if entry.get("etag"):
+            headers["ETag"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["Last-Modified"] = entry["last_modified"]
+        return httpx.Response(
+            200,
+            content=body,
+            headers=headers,
+            request=httpx.Request("GET", url),
+        )
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """Record a successful response for `url`."""
+        body = response.content
+        content_hash = hashlib.sha256(body).hexdigest()
+
+        object_path = self._object_path(content_hash)
+        if not object_path.exists():
+            self._write(object_path, gzip.compress(body))
+
+        entry = {
+            "url": url,
+            "content_hash": content_hash,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write(self._index_path(url), json.dumps(entry).encode())
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -1,68 +1,197 @@
 import logging
 from sqlmodel import select
-from core.models import Character
+from core.database.bulk import BulkWriter
+from core.models import (
+    Character,
+    CharacterFilmLink,
+    CharacterStarshipLink,
+    StagedLink,
+)
 from core.models.film import Film
+from core.models.shard import STAGED_CHARACTER
 from core.models.starship import Starship
 from core.schemas.character import CharacterCreate
 from core.services.swapi.base import SwapiImporterBase
+from core.services.swapi.films import FilmImporter
+from core.services.swapi.starships import StarshipImporter
 
 logger = logging.getLogger(__name__)
 
 
 class CharacterImporter(SwapiImporterBase):
+    resource = "people"
+    model = Character
+    natural_key = "name"
+    schema = CharacterCreate
+    # Links are resolved against already imported films and starships
+    depends_on = (FilmImporter, StarshipImporter)
     existing_names: set[str] = set()
-    film_map: dict[int, Film] = {}
-    starship_map: dict[int, Starship] = {}
+    # swapi_id -> primary key, links are resolved and written as plain ids
+    film_ids: dict[int, int] = {}
+    starship_ids: dict[int, int] = {}
 
-    @property
-    def resource(self) -> str:
-        return "people"
+    def __init__(self, *args, link_run: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # name -> (film pks, starship pks) of parsed characters awaiting write
+        self.pending_links: dict[str, tuple[list[int], list[int]]] = {}
+        # Sharded imports: stage links by SWAPI id under this run instead of
+        # resolving them, films and starships may not be imported yet (see
+        # `merge_links()`)
+        self.link_run = link_run
 
     async def prefetch_existing(self):
-        # Deduplicate by name
-        result = await self.session.execute(select(Character.name))
-        self.existing_names = set(result.scalars().all())
-
-        # Prefetch all films
-        films_result = await self.session.execute(select(Film))
-        self.film_map = {film.id: film for film in films_result.scalars()}
-
-        # Prefetch all starships
-        starships_result = await self.session.execute(select(Starship))
-        self.starship_map = {
-            starship.id: starship for starship in starships_result.scalars()
-        }
+        # Deduplicate by name (bulk writes use ON CONFLICT on the unique name)
+        if self.write_mode == "orm":
+            result = await self.session.execute(select(Character.name))
+            self.existing_names = set(result.scalars().all())
 
-    def extract_id(self, url: str) -> int:
-        return int(url.rstrip("/").split("/")[-1])
+        if self.link_run:
+            return
+        self.film_ids = await self._load_ids(Film)
+        self.starship_ids = await self._load_ids(Starship)
 
-    async def parse(self, raw_data: dict) -> Character | None:
+    async def _load_ids(self, model: type[Film] | type[Starship]) -> dict[int, int]:
+        result = await self.session.execute(
+            select(model.swapi_id, model.id)
+            .where(model.swapi_id.is_not(None))
+            .order_by(model.id)
+        )
+        return dict(result.all())
+
+    def page_complete(self, records: list[dict]) -> bool:
+        # Links to films and starships imported later are added by the rerun
+        return all(
+            id_ in ids
+            for record in records
+            for kind, ids in (
+                ("films", self.film_ids),
+                ("starships", self.starship_ids),
+            )
+            for url in record.get(kind, [])
+            if (id_ := self.extract_id(url))
+        )
+
+    def prepare(self, raw_data: dict) -> dict | None:
         name = raw_data.get("name")
         if not name or name in self.existing_names:
             return None  # skip duplicates
 
-        try:
-            valid_data = CharacterCreate(
-                name=name,
-                gender=raw_data.get("gender"),
-                birth_year=raw_data.get("birth_year"),
+        return {
+            "name": name,
+            "gender": raw_data.get("gender"),
+            "birth_year": raw_data.get("birth_year"),
+        }
+
+    def to_row(self, raw_data: dict, data: dict, links: dict | None = None) -> dict:
+        links = {
+            kind: sorted(
+                {id_ for url in raw_data.get(kind, []) if (id_ := self.extract_id(url))}
             )
+            for kind in ("films", "starships")
+        }
+        if self.link_run:
+            self.pending_links[data["name"]] = (links["films"], links["starships"])
+            # Links are only resolved by `merge_links()` after the run, so
+            # the row gets no hash and is written (and relinked) every time
+            return {**super().to_row(raw_data, data), "content_hash": None}
+
+        # Hash the links that are actually written: a link to a record that
+        # isn't imported yet changes the row once it is
+        resolved = {
+            "films": [
+                self.film_ids[id_] for id_ in links["films"] if id_ in self.film_ids
+            ],
+            "starships": [
+                self.starship_ids[id_]
+                for id_ in links["starships"]
+                if id_ in self.starship_ids
+            ],
+        }
+        self.pending_links[data["name"]] = (resolved["films"], resolved["starships"])
+        return super().to_row(raw_data, data, resolved)
+
+    async def parse(self, raw_data: dict) -> Character | None:
+        if (data := self.prepare(raw_data)) is None:
+            return None
+
+        try:
+            valid_data = CharacterCreate(**data)
         except Exception as e:
             logger.warning(f"[characters] Validation failed: {e}")
             return None
 
-        film_ids = [self.extract_id(url) for url in raw_data.get("films", [])]
-        starship_ids = [self.extract_id(url) for url in raw_data.get("starships", [])]
+        return Character(**self.to_row(raw_data, valid_data.model_dump()))
+
+    def discard(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.pending_links.pop(row["name"], None)
 
-        films = [self.film_map[id_] for id_ in film_ids if id_ in self.film_map]
-        starships = [
-            self.starship_map[id_] for id_ in starship_ids if id_ in self.starship_map
+    async def write_links(
+        self, writer: BulkWriter, rows: list[dict], ids: list[int]
+    ) -> None:
+        if self.link_run:
+            await self._stage_links(writer, rows)
+            return
+
+        links = [
+            (character_id, self.pending_links.pop(row["name"], ([], [])))
+            for row, character_id in zip(rows, ids)
+        ]
+        film_pairs = [
+            (character_id, film_id)
+            for character_id, (film_ids, _) in links
+            for film_id in film_ids
+        ]
+        starship_pairs = [
+            (character_id, starship_id)
+            for character_id, (_, starship_ids) in links
+            for starship_id in starship_ids
         ]
+        if self.changes:
+            # New and changed characters: add and remove links as needed
+            await self.changes.sync_links(
+                writer,
+                CharacterFilmLink.__table__,
+                ("character_id", "film_id"),
+                film_pairs,
+                ids,
+                [row["name"] for row in rows],
+            )
+            await self.changes.sync_links(
+                writer,
+                CharacterStarshipLink.__table__,
+                ("character_id", "starship_id"),
+                starship_pairs,
+                ids,
+                [row["name"] for row in rows],
+            )
+            return
 
-        return Character(
-            name=valid_data.name,
-            gender=valid_data.gender,
-            birth_year=valid_data.birth_year,
-            films=films,
-            starships=starships,
+        await writer.insert_links(
+            CharacterFilmLink.__table__, ("character_id", "film_id"), film_pairs
+        )
+        await writer.insert_links(
+            CharacterStarshipLink.__table__,
+            ("character_id", "starship_id"),
+            starship_pairs,
+        )
+
+    async def _stage_links(self, writer: BulkWriter, rows: list[dict]) -> None:
+        staged = []
+        for row in rows:
+            film_ids, starship_ids = self.pending_links.pop(row["name"], ([], []))
+            if row.get("swapi_id") is None:
+                continue  # Nothing to resolve the character by later
+            staged.append((self.link_run, STAGED_CHARACTER, row["swapi_id"], 0))
+            staged.extend(
+                (self.link_run, "films", row["swapi_id"], id_) for id_ in film_ids
+            )
+            staged.extend(
+                (self.link_run, "starships", row["swapi_id"], id_)
+                for id_ in starship_ids
+            )
+        await writer.insert_links(
+            StagedLink.__table__,
+            ("run_id", "kind", "character_swapi_id", "target_swapi_id"),
+            staged,
         )
@@ -0,0 +1,54 @@
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.models import ImportCheckpoint
+
+
+class CheckpointTracker:
+    """
+    Remembers how far an import of one SWAPI resource got.
+
+    - `load()` returns the checkpoint an interrupted run left behind, if any.
+    - The importer `stage()`s the page and SWAPI id of the last record of
+      every batch, `save()` writes it in the batch's own transaction, so the
+      checkpoint never gets ahead of (or behind) the committed rows.
+    - `clear()` drops the checkpoint once the whole run has been written.
+
+    `save()` and `clear()` leave committing to the caller.
+    """
+
+    def __init__(self, session: AsyncSession, resource: str):
+        self.session = session
+        self.resource = resource
+        self.saved: ImportCheckpoint | None = None
+        self.pending: tuple[int, int | None] | None = None
+
+    async def load(self) -> ImportCheckpoint | None:
+        self.saved = await self.session.get(ImportCheckpoint, self.resource)
+        self.pending = None
+        return self.saved
+
+    def stage(self, page: int, record: int | None) -> None:
+        self.pending = (page, record)
+
+    async def save(self) -> None:
+        if self.pending is None:
+            return
+
+        page, record = self.pending
+        stmt = insert(ImportCheckpoint).values(
+            resource=self.resource, page=page, record=record
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["resource"],
+                set_={"page": page, "record": record, "updated_at": func.now()},
+            )
+        )
+        self.pending = None
+
+    async def clear(self) -> None:
+        await self.session.execute(
+            delete(ImportCheckpoint).where(ImportCheckpoint.resource == self.resource)
+        )
+        self.pending = None
@@ -0,0 +1,31 @@
+import httpx
+from core.config import (
+    HTTP2,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+    HTTP_VERIFY_SSL,
+)
+
+
+def create_client() -> httpx.AsyncClient:
+    """
+    Build the pooled HTTP client shared by the SWAPI importers.
+
+    One client is meant to live for a whole import run, so connections (and
+    their TCP/TLS handshakes) are reused across pages, retries and importers.
+    Use it as an async context manager so the pool is closed afterwards.
+    """
+    return httpx.AsyncClient(
+        # Disabling SSL verification is configurable via HTTP_VERIFY_SSL
+        verify=HTTP_VERIFY_SSL,
+        http2=HTTP2,
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
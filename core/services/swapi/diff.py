@@ -0,0 +1,164 @@
+import hashlib
+import json
+from collections.abc import Iterable, Sequence
+from sqlalchemy import Table, delete, select, tuple_
+from core.database.bulk import BulkWriter
+
+# Keys listed per change kind in `Changeset.summary()` (dry runs keep them all)
+SUMMARY_KEYS = 5
+
+
+def content_hash(row: dict) -> str:
+    """Stable hash of a row's content: key order, `id` and the hash don't count."""
+    content = {k: v for k, v in row.items() if k not in ("id", "content_hash")}
+    payload = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Changeset:
+    """
+    Diff of one resource's incoming records against the stored rows.
+
+    - `split()` looks up the stored `content_hash` of a batch's natural keys
+      in one query and keeps only the rows that are new (`inserts`) or whose
+      hash differs (`updates`); identical rows are only counted. Rows
+      without a hash always count as changed.
+    - `sync_links()` turns the wanted link pairs of a batch into a delta
+      against the stored ones: missing pairs are inserted, pairs that are no
+      longer wanted are deleted.
+
+    With `dry_run` nothing is written, the changeset only records what a
+    real run would write, with every new, changed and relinked key (`keys`,
+    in `snapshot()`) for review. Rows are never deleted, links that would be
+    removed show up as relinked keys.
+    """
+
+    def __init__(self, resource: str, dry_run: bool = False):
+        self.resource = resource
+        self.dry_run = dry_run
+        self.inserts = 0
+        self.updates = 0
+        self.unchanged = 0
+        self.links_added = 0
+        self.links_removed = 0
+        # The first few keys of each kind, for the summary (memory stays flat)
+        self.examples: dict[str, list] = {"inserts": [], "updates": []}
+        self.keys: dict[str, dict] | None = (
+            {"inserts": {}, "updates": {}, "relinked": {}} if dry_run else None
+        )
+        # Primary keys of the stored rows in the batch being written
+        self.stored_ids: set[int] = set()
+
+    async def split(
+        self, writer: BulkWriter, table: Table, key: str, rows: Sequence[dict]
+    ) -> tuple[list[dict], list[int | None], list[dict]]:
+        """
+        Split a batch into its new and changed rows, their primary keys (None
+        for new rows) and the unchanged rows.
+        """
+        # A key twice in one batch is one record, the last one wins
+        rows = list({row[key]: row for row in rows}.values())
+        result = await writer.session.execute(
+            select(table.c[key], table.c.id, table.c.content_hash).where(
+                table.c[key].in_([row[key] for row in rows])
+            )
+        )
+        stored = {natural_key: (id_, hash_) for natural_key, id_, hash_ in result}
+
+        changed, ids, unchanged = [], [], []
+        self.stored_ids = set()
+        for row in rows:
+            if row[key] not in stored:
+                self.inserts += 1
+                self._example("inserts", row[key])
+                ids.append(None)
+            elif (
+                row["content_hash"] is None
+                or stored[row[key]][1] != row["content_hash"]
+            ):
+                self.updates += 1
+                self._example("updates", row[key])
+                ids.append(stored[row[key]][0])
+                self.stored_ids.add(stored[row[key]][0])
+            else:
+                self.unchanged += 1
+                unchanged.append(row)
+                continue
+            changed.append(row)
+        return changed, ids, unchanged
+
+    def _example(self, kind: str, key) -> None:
+        if len(self.examples[kind]) < SUMMARY_KEYS:
+            self.examples[kind].append(key)
+        if self.keys is not None:
+            self.keys[kind][key] = None
+
+    async def sync_links(
+        self,
+        writer: BulkWriter,
+        table: Table,
+        columns: Sequence[str],
+        pairs: Iterable[tuple],
+        owners: Sequence[int],
+        keys: Sequence | None = None,
+    ) -> None:
+        """
+        Make the links of `owners` in `table` exactly `pairs`. `keys` (the
+        owners' natural keys) name the relinked rows of a dry run.
+        """
+        owner, target = columns
+        wanted = set(pairs)
+        existing = set()
+        # Rows that were just inserted have no links to compare with
+        if stored := [id_ for id_ in owners if id_ in self.stored_ids]:
+            result = await writer.session.execute(
+                select(table.c[owner], table.c[target]).where(
+                    table.c[owner].in_(stored)
+                )
+            )
+            existing = {tuple(row) for row in result}
+        added, removed = wanted - existing, existing - wanted
+        self.links_added += len(added)
+        self.links_removed += len(removed)
+        if self.dry_run:
+            if self.keys is not None and keys is not None:
+                names = dict(zip(owners, keys))
+                for owner_id, _ in sorted(added | removed):
+                    self.keys["relinked"][names[owner_id]] = None
+            return
+
+        await writer.insert_links(table, columns, added)
+        if removed:
+            await writer.session.execute(
+                delete(table).where(
+                    tuple_(table.c[owner], table.c[target]).in_(list(removed))
+                )
+            )
+
+    def snapshot(self) -> dict:
+        snapshot = {
+            "dry_run": self.dry_run,
+            "inserts": self.inserts,
+            "updates": self.updates,
+            "unchanged": self.unchanged,
+            "links_added": self.links_added,
+            "links_removed": self.links_removed,
+        }
+        if self.keys is not None:
+            snapshot["keys"] = {kind: list(keys) for kind, keys in self.keys.items()}
+        return snapshot
+
+    def summary(self) -> str:
+        def listed(kind: str, total: int) -> str:
+            keys = self.examples[kind]
+            shown = ", ".join(repr(k) for k in keys)
+            more = total - len(keys)
+            return f" ({shown}{f', +{more} more' if more > 0 else ''})" if keys else ""
+
+        verb = "would write" if self.dry_run else "wrote"
+        return (
+            f"[{self.resource}] {verb} {self.inserts} new"
+            f"{listed('inserts', self.inserts)}, {self.updates} changed"
+            f"{listed('updates', self.updates)}, {self.unchanged} unchanged, "
+            f"links +{self.links_added} -{self.links_removed}"
+        )
@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import itertools
+import json
+from collections.abc import AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import IO
+from core.config import DUMP_PAGE_SIZE
+
+IMPORT_SOURCES = ("swapi", "dump")
+# One record per line, or a single JSON array of records
+LINE_FORMATS = (".ndjson", ".jsonl")
+DUMP_FORMATS = (*LINE_FORMATS, ".json")
+# Characters read at a time from JSON array dumps
+READ_SIZE = 2**16
+
+
+def find_dump(directory: str | Path, resource: str) -> Path:
+    """The dump file of `resource` in `directory`, in any supported format."""
+    for suffix in DUMP_FORMATS:
+        for name in (f"{resource}{suffix}", f"{resource}{suffix}.gz"):
+            if (path := Path(directory) / name).is_file():
+                return path
+    raise FileNotFoundError(
+        f"No {resource} dump in {directory} "
+        f"(expected {resource}{{{','.join(DUMP_FORMATS)}}}[.gz])"
+    )
+
+
+def open_dump(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_json_array(file: IO[str]) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Reads `READ_SIZE` characters at a time and decodes each element as soon
+    as it is complete, so only the current element is ever held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = "", 0
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos
+        chunk = file.read(READ_SIZE)
+        buffer, pos = buffer[pos:] + chunk, 0
+        return bool(chunk)
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+        if pos == len(buffer):
+            if not fill():
+                raise ValueError("Truncated JSON array dump")
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise ValueError("JSON dumps must hold an array of records")
+            started = True
+            pos += 1
+        elif char == "]":
+            return
+        elif char == ",":
+            pos += 1
+        else:
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element goes on in the next chunk
+                if not fill():
+                    raise
+                continue
+            pos = end
+            yield element
+
+
+def write_dump(path: str | Path, records: Iterable[dict]) -> int:
+    """Write records as NDJSON (gzip-compressed for `.gz`); returns how many."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    opener = gzip.open if path.suffix == ".gz" else open
+    written = 0
+    with opener(path, "wt", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record, separators=(",", ":")))
+            file.write("\n")
+            written += 1
+    return written
+
+
+class DumpReader:
+    """
+    Reads one resource's SWAPI-shaped records from a local dump file.
+
+    The dump is `<directory>/<resource>.ndjson` (or `.jsonl`, one record per
+    line) or `<resource>.json` (one JSON array of records), optionally
+    gzip-compressed (`.gz`). Records are decoded one at a time, so memory
+    stays flat however large the dump is.
+
+    Every `page_size` records make a page, numbered from 1 like SWAPI's, so
+    dumps go through the same pipeline, checkpoints and shards as HTTP pages.
+    """
+
+    def __init__(
+        self, directory: str | Path, resource: str, page_size: int | None = None
+    ):
+        self.path = find_dump(directory, resource)
+        self.page_size = page_size or DUMP_PAGE_SIZE
+        self.lines = self.path.name.removesuffix(".gz").endswith(LINE_FORMATS)
+
+    def records(self, skip: int = 0) -> Iterator[dict]:
+        """Records of the dump in order, after the first `skip`."""
+        with open_dump(self.path) as file:
+            if not self.lines:
+                yield from itertools.islice(iter_json_array(file), skip, None)
+                return
+
+            lines = (line for line in file if line.strip())
+            # Skipped lines don't need decoding
+            for line in itertools.islice(lines, skip, None):
+                yield json.loads(line)
+
+    def count(self) -> int:
+        if self.lines:
+            with open_dump(self.path) as file:
+                return sum(1 for line in file if line.strip())
+        return sum(1 for _ in self.records())
+
+    async def page(self, page: int) -> dict:
+        """One page with the total count, SWAPI style (scans the dump)."""
+        skip = (page - 1) * self.page_size
+        results = await asyncio.to_thread(
+            lambda: list(itertools.islice(self.records(skip), self.page_size))
+        )
+        return {"count": await asyncio.to_thread(self.count), "results": results}
+
+    async def iter_pages(
+        self, start_page: int = 1, end_page: int | None = None
+    ) -> AsyncIterator[tuple[int, list[dict]]]:
+        """Yield `(page, records)` from `start_page` to `end_page` (or the end)."""
+        records = self.records(skip=(start_page - 1) * self.page_size)
+        page = start_page
+        try:
+            while end_page is None or page <= end_page:
+                # Decoding is blocking work, keep it off the event loop
+                batch = await asyncio.to_thread(
+                    list, itertools.islice(records, self.page_size)
+                )
+                if not batch:
+                    return
+                yield page, batch
+                page += 1
+        finally:
+            records.close()
@@ -0,0 +1,158 @@
+import asyncio
+import random
+from collections import Counter
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+# SWAPI serves 10 records per page
+PAGE_SIZE = 10
+EDITED = "2014-12-20T21:17:56.891000Z"
+
+
+class FakeSwapi:
+    """
+    Local stand-in for the SWAPI `people`, `films` and `starships` endpoints.
+
+    Serves a generated dataset with SWAPI's page shape (`count`, `next`,
+    `previous`, `results`); every character links to `links` films and
+    starships. `.app` is a plain ASGI app: mount it in tests with
+    `httpx.ASGITransport`, or serve it with uvicorn for real HTTP (see
+    `scripts/bench_import.py` and `scripts/bench_http_client.py`).
+    `record()` on its own generates the synthetic dumps of
+    `scripts/seed_dump.py --generate`.
+
+    Fault injection, per request:
+    - `latency` (+ up to `jitter`) seconds before answering
+    - `error_rate`: share of requests answered with a 500
+    - `throttle_rate`: share of requests answered with a 429 and a
+      `Retry-After` of `retry_after` seconds
+
+    Faults are drawn from a seeded RNG, so runs are reproducible. `requests`
+    counts served responses by status code.
+    """
+
+    def __init__(
+        self,
+        people: int = 82,
+        films: int = 6,
+        starships: int = 36,
+        links: int = 3,
+        page_size: int = PAGE_SIZE,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 42,
+    ):
+        self.sizes = {"people": people, "films": films, "starships": starships}
+        self.links = links
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.requests: Counter[int] = Counter()
+        self.app = self._create_app()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def record(self, resource: str, swapi_id: int, base_url: str) -> dict:
+        url = f"{base_url}/{resource}/{swapi_id}/"
+        if resource == "films":
+            return {
+                "title": f"Film {swapi_id}",
+                "episode_id": swapi_id,
+                "director": "George Lucas",
+                "producer": "Gary Kurtz, Rick McCallum",
+                "release_date": "1977-05-25",
+                "edited": EDITED,
+                "url": url,
+            }
+        if resource == "starships":
+            return {
+                "name": f"Starship {swapi_id}",
+                "model": "T-65 X-wing",
+                "manufacturer": "Incom Corporation",
+                "edited": EDITED,
+                "url": url,
+            }
+
+        # Same links for a character on every request
+        rng = random.Random(swapi_id)
+        films, starships = self.sizes["films"], self.sizes["starships"]
+        return {
+            "name": f"Character {swapi_id}",
+            "gender": "n/a",
+            "birth_year": "19BBY",
+            "films": [
+                f"{base_url}/films/{id_}/"
+                for id_ in rng.sample(range(1, films + 1), min(self.links, films))
+            ],
+            "starships": [
+                f"{base_url}/starships/{id_}/"
+                for id_ in rng.sample(
+                    range(1, starships + 1), min(self.links, starships)
+                )
+            ],
+            "edited": EDITED,
+            "url": url,
+        }
+
+    def page(self, resource: str, page: int, base_url: str) -> dict:
+        count = self.sizes[resource]
+        first = (page - 1) * self.page_size + 1
+        if page < 1 or (first > count and page != 1):
+            raise HTTPException(status_code=404, detail="Not found")
+
+        last = min(first + self.page_size - 1, count)
+        url = f"{base_url}/{resource}/?page="
+        return {
+            "count": count,
+            "next": f"{url}{page + 1}" if last < count else None,
+            "previous": f"{url}{page - 1}" if page > 1 else None,
+            "results": [
+                self.record(resource, swapi_id, base_url)
+                for swapi_id in range(first, last + 1)
+            ],
+        }
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI(title="Fake SWAPI")
+
+        @app.get("/api/{resource}/")
+        async def list_resource(resource: str, request: Request, page: int = 1):
+            if resource not in self.sizes:
+                self.requests[404] += 1
+                raise HTTPException(status_code=404, detail="Not found")
+
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            if delay:
+                await asyncio.sleep(delay)
+
+            roll = self.random.random()
+            if roll < self.throttle_rate:
+                self.requests[429] += 1
+                return JSONResponse(
+                    {"detail": "Request was throttled."},
+                    status_code=429,
+                    headers={"Retry-After": f"{self.retry_after:g}"},
+                )
+            if roll < self.throttle_rate + self.error_rate:
+                self.requests[500] += 1
+                return JSONResponse({"detail": "Server error"}, status_code=500)
+
+            base_url = str(request.base_url).rstrip("/") + "/api"
+            try:
+                data = self.page(resource, page, base_url)
+            except HTTPException:
+                self.requests[404] += 1
+                raise
+            self.requests[200] += 1
+            return data
+
+        return app
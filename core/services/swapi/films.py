@@ -8,31 +8,41 @@ logger = logging.getLogger(__name__)
 
 
 class FilmImporter(SwapiImporterBase):
+    resource = "films"
+    model = Film
+    natural_key = "title"
+    schema = FilmCreate
     existing_titles: set[str] = set()
 
-    @property
-    def resource(self) -> str:
-        return "films"
-
     async def prefetch_existing(self):
+        # Bulk writes dedupe with ON CONFLICT on the unique title
+        if self.write_mode != "orm":
+            return
+
         result = await self.session.execute(select(Film.title))
         self.existing_titles = set(result.scalars().all())
 
-    async def parse(self, raw_data: dict) -> Film | None:
+    def prepare(self, raw_data: dict) -> dict | None:
         title = raw_data.get("title")
         if not title or title in self.existing_titles:
             return None
 
+        return {
+            "title": title,
+            "release_date": raw_data.get("release_date"),
+            "episode_id": raw_data.get("episode_id"),
+            "director": raw_data.get("director"),
+            "producer": raw_data.get("producer"),
+        }
+
+    async def parse(self, raw_data: dict) -> Film | None:
+        if (data := self.prepare(raw_data)) is None:
+            return None
+
         try:
-            valid_data = FilmCreate(
-                title=title,
-                release_date=raw_data.get("release_date"),
-                episode_id=raw_data.get("episode_id"),
-                director=raw_data.get("director"),
-                producer=raw_data.get("producer"),
-            )
+            valid_data = FilmCreate(**data)
         except Exception as e:
             logger.warning(f"[films] Validation failed: {e}")
             return None
 
-        return Film(**valid_data.model_dump())
+        return Film(**self.to_row(raw_data, valid_data.model_dump()))
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.services.swapi.base import SwapiImporterBase
+from core.services.swapi.stats import ImporterStats
+from core.services.swapi.throttle import Throttle
+
+logger = logging.getLogger(__name__)
+
+
+class ImportScheduler:
+    """
+    Runs SWAPI importers as a dependency graph.
+
+    Each importer class lists the importers it needs in `depends_on`. An
+    importer starts as soon as all of its dependencies have finished, so
+    independent importers (films, starships) run at the same time, each on
+    its own session and connection, while characters wait for both.
+
+    If an importer fails, the importers depending on it are skipped, the
+    independent ones still finish, and the first error is re-raised.
+
+    All importers share one `Throttle`, so the rate limit and the circuit
+    breaker apply to the upstream as a whole rather than per resource.
+
+    `stats` maps each resource to its importer's live `ImporterStats` as
+    soon as the importer is created; pass a dict to watch a run in progress.
+
+    Usage:
+        scheduler = ImportScheduler(
+            [FilmImporter, StarshipImporter, CharacterImporter],
+            session_factory=async_session,
+            client=client,
+        )
+        timings = await scheduler.run()
+    """
+
+    def __init__(
+        self,
+        importers: Sequence[type[SwapiImporterBase]],
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+        client: httpx.AsyncClient | None = None,
+        throttle: Throttle | None = None,
+        stats: dict[str, ImporterStats] | None = None,
+        **importer_kwargs,
+    ):
+        self.importers = list(importers)
+        self.session_factory = session_factory
+        self.client = client
+        self.throttle = throttle or Throttle()
+        self.stats = {} if stats is None else stats
+        self.importer_kwargs = importer_kwargs
+        self._check_graph()
+
+    def _check_graph(self) -> None:
+        for importer in self.importers:
+            for dependency in importer.depends_on:
+                if dependency not in self.importers:
+                    raise ValueError(
+                        f"{importer.__name__} depends on {dependency.__name__}, "
+                        "which is not scheduled"
+                    )
+
+        # Kahn's algorithm: every importer must become ready at some point
+        remaining = {importer: set(importer.depends_on) for importer in self.importers}
+        while ready := [i for i, deps in remaining.items() if not deps]:
+            for importer in ready:
+                del remaining[importer]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        if remaining:
+            names = ", ".join(importer.__name__ for importer in remaining)
+            raise ValueError(f"Importer dependency cycle between {names}")
+
+    async def run(self) -> dict[str, float]:
+        """Run every importer, returning the wall time of each stage by resource."""
+        timings: dict[str, float] = {}
+        tasks: dict[type[SwapiImporterBase], asyncio.Task] = {}
+
+        async def run_one(importer_cls: type[SwapiImporterBase]) -> None:
+            dependencies = [tasks[d] for d in importer_cls.depends_on]
+            try:
+                await asyncio.gather(*dependencies)
+            except Exception:
+                logger.warning(f"{importer_cls.__name__} skipped: a dependency failed")
+                raise
+
+            async with self.session_factory() as session:
+                importer = importer_cls(
+                    session,
+                    client=self.client,
+                    throttle=self.throttle,
+                    **self.importer_kwargs,
+                )
+                self.stats[importer.resource] = importer.stats
+                start = time.perf_counter()
+                try:
+                    await importer.run()
+                finally:
+                    timings[importer.resource] = time.perf_counter() - start
+                    logger.info(
+                        f"[{importer.resource}] Stage finished in "
+                        f"{timings[importer.resource]:.2f}s"
+                    )
+
+        start = time.perf_counter()
+        for importer_cls in self.importers:
+            tasks[importer_cls] = asyncio.create_task(run_one(importer_cls))
+
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        logger.info(f"Import finished in {time.perf_counter() - start:.2f}s")
+        logger.info(f"Upstream throttle stats: {self.throttle.stats()}")
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        return timings
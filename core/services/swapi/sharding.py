@@ -0,0 +1,496 @@
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+import httpx
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import IMPORT_WORKERS, SHARD_MAX_ATTEMPTS, SHARD_PAGES
+from core.database.settings import db_settings
+from core.models import (
+    Character,
+    CharacterFilmLink,
+    CharacterStarshipLink,
+    Film,
+    ImportShard,
+    StagedLink,
+    Starship,
+)
+from core.models.shard import STAGED_CHARACTER
+from core.services.swapi.base import SwapiImporterBase
+from core.services.swapi.client import create_client
+from core.services.swapi.throttle import RateLimiter, Throttle
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+# Staged link kind -> (link table, its target column, target model)
+STAGED_LINKS = {
+    "films": (CharacterFilmLink, "film_id", Film),
+    "starships": (CharacterStarshipLink, "starship_id", Starship),
+}
+
+
+def worker_name(index: int | None = None) -> str:
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    return name if index is None else f"{name}/{index}"
+
+
+class ShardQueue:
+    """
+    Shard table of one sharded import run.
+
+    Works like `ImportJobQueue`: `claim()` takes the next pending shard with
+    `FOR UPDATE SKIP LOCKED`, so any number of workers can pull shards
+    without blocking on each other or importing one twice.
+
+    Every method commits its own short transaction.
+    """
+
+    def __init__(self, session: AsyncSession, run_id: str):
+        self.session = session
+        self.run_id = run_id
+
+    async def plan(self, resource: str, total_pages: int, shard_pages: int) -> int:
+        """Split `total_pages` pages of `resource` into shards; returns how many."""
+        shards = [
+            {
+                "run_id": self.run_id,
+                "resource": resource,
+                "first_page": first,
+                "last_page": min(first + shard_pages - 1, total_pages),
+            }
+            for first in range(1, total_pages + 1, shard_pages)
+        ]
+        if shards:
+            await self.session.execute(insert(ImportShard), shards)
+        await self.session.commit()
+        return len(shards)
+
+    async def claim(self, worker: str) -> ImportShard | None:
+        next_shard = (
+            select(ImportShard.id)
+            .where(ImportShard.run_id == self.run_id, ImportShard.status == "pending")
+            .order_by(ImportShard.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(ImportShard)
+            .where(ImportShard.id == next_shard)
+            .values(
+                status="running",
+                worker=worker,
+                attempts=ImportShard.attempts + 1,
+                error=None,
+                started_at=func.now(),
+            )
+            .returning(ImportShard)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        shard = result.scalar_one_or_none()
+        await self.session.commit()
+        return shard
+
+    async def finish(
+        self, shard_id: int, error: str | None = None, stats: dict | None = None
+    ) -> None:
+        await self.session.execute(
+            update(ImportShard)
+            .where(ImportShard.id == shard_id)
+            .values(
+                status="failed" if error else "done",
+                error=error,
+                stats=stats,
+                finished_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def requeue_unfinished(self, max_attempts: int) -> int:
+        """
+        Hand failed shards, and running ones whose worker is gone, back to the
+        queue while they have attempts left. Only call once no worker of the
+        run is alive. Returns how many shards were requeued.
+        """
+        result = await self.session.execute(
+            update(ImportShard)
+            .where(
+                ImportShard.run_id == self.run_id,
+                ImportShard.status.in_(("running", "failed")),
+                ImportShard.attempts < max_attempts,
+            )
+            .values(status="pending", worker=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def clear(self) -> None:
+        """Delete the shards and staged links of the run."""
+        await self.session.execute(
+            delete(ImportShard).where(ImportShard.run_id == self.run_id)
+        )
+        await self.session.execute(
+            delete(StagedLink).where(StagedLink.run_id == self.run_id)
+        )
+        await self.session.commit()
+
+    async def shards(self) -> list[ImportShard]:
+        result = await self.session.execute(
+            select(ImportShard)
+            .where(ImportShard.run_id == self.run_id)
+            .order_by(ImportShard.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+
+async def merge_links(session: AsyncSession, run_id: str) -> int:
+    """
+    Replace the links of every character written by `run_id` with the links
+    it staged, resolved to primary keys.
+
+    Per link table, one `DELETE` drops the links of those characters that
+    weren't staged again and one `INSERT ... SELECT` joins the staged SWAPI
+    ids to the imported rows; links to records that weren't imported are
+    dropped. The staged rows are deleted in the same transaction. Returns the
+    number of link rows inserted.
+    """
+    characters = (
+        select(Character.id)
+        .join(StagedLink, StagedLink.character_swapi_id == Character.swapi_id)
+        .where(StagedLink.run_id == run_id, StagedLink.kind == STAGED_CHARACTER)
+    )
+    inserted = 0
+    for kind, (link_model, column, target) in STAGED_LINKS.items():
+        resolved = (
+            select(Character.id, target.id)
+            .distinct()
+            .select_from(StagedLink)
+            .join(Character, Character.swapi_id == StagedLink.character_swapi_id)
+            .join(target, target.swapi_id == StagedLink.target_swapi_id)
+            .where(StagedLink.run_id == run_id, StagedLink.kind == kind)
+        )
+        target_column = getattr(link_model, column)
+        await session.execute(
+            delete(link_model).where(
+                link_model.character_id.in_(characters),
+                tuple_(link_model.character_id, target_column).not_in(resolved),
+            )
+        )
+        result = await session.execute(
+            insert(link_model)
+            .from_select(["character_id", column], resolved)
+            .on_conflict_do_nothing()
+        )
+        inserted += result.rowcount
+    await session.execute(delete(StagedLink).where(StagedLink.run_id == run_id))
+    await session.commit()
+    return inserted
+
+
+async def run_shards(
+    run_id: str,
+    importers: Sequence[type[SwapiImporterBase]],
+    session_factory: SessionFactory,
+    client: httpx.AsyncClient | None,
+    throttle: Throttle,
+    worker: str,
+    **importer_kwargs,
+) -> int:
+    """
+    Import shards of `run_id` until none are left; returns how many this
+    worker imported. A failing shard is recorded as failed and the worker
+    goes on with the next one.
+    """
+    by_resource = {importer_cls.resource: importer_cls for importer_cls in importers}
+    imported = 0
+    while True:
+        async with session_factory() as session:
+            queue = ShardQueue(session, run_id)
+            if (shard := await queue.claim(worker)) is None:
+                return imported
+
+            importer_cls = by_resource[shard.resource]
+            # Importers linking to others stage their links for `merge_links()`
+            extra = {"link_run": run_id} if importer_cls.depends_on else {}
+            importer = importer_cls(
+                session,
+                client=client,
+                throttle=throttle,
+                pages=(shard.first_page, shard.last_page),
+                **extra,
+                **importer_kwargs,
+            )
+            logger.info(
+                f"[{shard.resource}] Worker {worker} importing pages "
+                f"{shard.first_page}-{shard.last_page}"
+            )
+            error = None
+            try:
+                await importer.run()
+                imported += 1
+            except Exception as e:
+                logger.exception(f"[{shard.resource}] Shard {shard.id} failed")
+                error = f"{type(e).__name__}: {e}"
+                await session.rollback()
+            await queue.finish(shard.id, error, importer.stats.snapshot())
+
+
+def shard_worker(
+    run_id: str, importers: Sequence[type[SwapiImporterBase]], options: dict
+) -> None:
+    """Entry point of a spawned `ShardedImport` worker process."""
+    logging.basicConfig(level=options["log_level"])
+    asyncio.run(_shard_worker(run_id, importers, **options))
+
+
+async def _shard_worker(
+    run_id: str,
+    importers: Sequence[type[SwapiImporterBase]],
+    database_url: str,
+    rate: float,
+    max_rate: float,
+    importer_kwargs: dict,
+    log_level: int,
+) -> None:
+    engine = db_settings.create_engine(
+        database_url, application_name=f"swapi-{worker_name()}"
+    )
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    throttle = Throttle(RateLimiter(rate=rate, max_rate=max_rate))
+    try:
+        async with create_client() as client:
+            await run_shards(
+                run_id,
+                importers,
+                session_factory,
+                client,
+                throttle,
+                worker_name(),
+                **importer_kwargs,
+            )
+    finally:
+        await engine.dispose()
+
+
+class ShardedImport:
+    """
+    Imports SWAPI resources in parallel shards of pages.
+
+    1. Plan: page 1 of every resource gives its page count. The pages are
+       split into shards of `shard_pages` pages, stored as `ImportShard` rows
+       of a new run.
+    2. Import: `workers` worker processes (spawned) claim shards from the
+       table until none are left. Each one fetches, validates and bulk
+       writes its shards on its own connection and HTTP client, with a
+       `1/workers` share of the throttle's rate limit. Shards of every
+       resource run at the same time: characters stage their links by SWAPI
+       id (`StagedLink`) instead of waiting for films and starships. Failed
+       shards, and those of a worker that died, are retried until attempted
+       `SHARD_MAX_ATTEMPTS` times.
+    3. Merge: once every shard is done, the staged links are resolved to
+       primary keys and replace the links of the imported characters
+       (`merge_links()`).
+
+    The shards and staged links of a run are deleted when it finishes,
+    failed or not; the summary keeps the totals of its shards.
+
+    With `processes=False` the workers are tasks of this process sharing
+    `session_factory`, `client` and `throttle` (for tests and small runs).
+    Worker processes connect to `database_url`, the configured database by
+    default.
+
+    Usage:
+        summary = await ShardedImport(
+            [FilmImporter, StarshipImporter, CharacterImporter],
+            session_factory=async_session,
+            workers=8,
+        ).run()
+    """
+
+    def __init__(
+        self,
+        importers: Sequence[type[SwapiImporterBase]],
+        session_factory: SessionFactory,
+        workers: int | None = None,
+        shard_pages: int | None = None,
+        processes: bool = True,
+        client: httpx.AsyncClient | None = None,
+        throttle: Throttle | None = None,
+        database_url: str | None = None,
+        max_attempts: int | None = None,
+        **importer_kwargs,
+    ):
+        self.importers = list(importers)
+        self.session_factory = session_factory
+        self.workers = workers or IMPORT_WORKERS
+        self.shard_pages = shard_pages or SHARD_PAGES
+        self.processes = processes
+        self.client = client
+        self.throttle = throttle or Throttle()
+        self.database_url = database_url or db_settings.async_database_url
+        self.max_attempts = max_attempts or SHARD_MAX_ATTEMPTS
+        self.importer_kwargs = importer_kwargs
+
+    async def run(self) -> dict:
+        """Plan, import and merge a new run; returns its summary."""
+        run_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        try:
+            shards, link_rows = await self._import(run_id)
+        finally:
+            async with self.session_factory() as session:
+                await ShardQueue(session, run_id).clear()
+
+        summary = self.summarize(run_id, shards, link_rows)
+        summary["wall_time_s"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Sharded import {run_id} finished: {summary}")
+
+        if failed := [shard for shard in shards if shard.status != "done"]:
+            raise RuntimeError(
+                f"{len(failed)} of {len(shards)} shards of import {run_id} "
+                f"failed, first error: {failed[0].error}"
+            )
+        return summary
+
+    async def _import(self, run_id: str) -> tuple[list[ImportShard], int]:
+        async with contextlib.AsyncExitStack() as stack:
+            client = self.client or await stack.enter_async_context(create_client())
+            planned = await self.plan(run_id, client)
+            logger.info(
+                f"Sharded import {run_id}: {planned} shards, {self.workers} workers"
+            )
+
+            while True:
+                await self._run_workers(run_id, client, planned)
+                async with self.session_factory() as session:
+                    queue = ShardQueue(session, run_id)
+                    if not (
+                        planned := await queue.requeue_unfinished(self.max_attempts)
+                    ):
+                        break
+                logger.warning(f"Sharded import {run_id}: retrying {planned} shards")
+
+        async with self.session_factory() as session:
+            link_rows = await merge_links(session, run_id)
+            shards = await ShardQueue(session, run_id).shards()
+        return shards, link_rows
+
+    async def plan(self, run_id: str, client: httpx.AsyncClient) -> int:
+        """Create the shards of every resource; returns how many."""
+        planned = 0
+        async with self.session_factory() as session:
+            queue = ShardQueue(session, run_id)
+            for importer_cls in self.importers:
+                importer = importer_cls(
+                    session,
+                    client=client,
+                    throttle=self.throttle,
+                    **self.importer_kwargs,
+                )
+                total_pages = importer.count_pages(await importer.fetch_page(1))
+                planned += await queue.plan(
+                    importer.resource, total_pages, self.shard_pages
+                )
+        return planned
+
+    async def _run_workers(
+        self, run_id: str, client: httpx.AsyncClient, shards: int
+    ) -> None:
+        workers = min(self.workers, shards)
+        if not self.processes:
+            await asyncio.gather(
+                *(
+                    run_shards(
+                        run_id,
+                        self.importers,
+                        self.session_factory,
+                        client,
+                        self.throttle,
+                        worker_name(index),
+                        **self.importer_kwargs,
+                    )
+                    for index in range(workers)
+                )
+            )
+            return
+
+        limiter = self.throttle.limiter
+        options = {
+            "database_url": self.database_url,
+            # The upstream's budget is shared by all worker processes
+            "rate": limiter.rate / workers,
+            "max_rate": limiter.max_rate / workers,
+            "importer_kwargs": self.importer_kwargs,
+            "log_level": logging.getLogger().level,
+        }
+        # Spawned, forking would copy the event loop and DB connections
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=shard_worker,
+                args=(run_id, self.importers, options),
+                name=f"shard-worker-{index}",
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            await asyncio.gather(
+                *(asyncio.to_thread(process.join) for process in processes)
+            )
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        for process in processes:
+            if process.exitcode:
+                logger.error(f"{process.name} exited with code {process.exitcode}")
+
+    @staticmethod
+    def summarize(run_id: str, shards: list[ImportShard], link_rows: int) -> dict:
+        resources: dict[str, dict] = {}
+        for shard in shards:
+            totals = resources.setdefault(
+                shard.resource,
+                {
+                    "shards": 0,
+                    "failed": 0,
+                    "attempts": 0,
+                    "requests": 0,
+                    "pages_fetched": 0,
+                    "records_written": 0,
+                    "rows_inserted": 0,
+                },
+            )
+            totals["shards"] += 1
+            totals["failed"] += shard.status != "done"
+            totals["attempts"] += shard.attempts
+            stats = shard.stats or {}
+            totals["requests"] += stats.get("fetch_latency", {}).get("count", 0)
+            totals["pages_fetched"] += stats.get("pages_fetched", 0)
+            totals["records_written"] += stats.get("records_written", 0)
+            totals["rows_inserted"] += stats.get("rows_inserted", 0)
+        return {
+            "run_id": run_id,
+            "resources": resources,
+            "workers": len({shard.worker for shard in shards if shard.worker}),
+            "link_rows": link_rows,
+        }
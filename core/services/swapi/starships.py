@@ -8,29 +8,39 @@ logger = logging.getLogger(__name__)
 
 
 class StarshipImporter(SwapiImporterBase):
+    resource = "starships"
+    model = Starship
+    natural_key = "name"
+    schema = StarshipCreate
     existing_names: set[str] = set()
 
-    @property
-    def resource(self) -> str:
-        return "starships"
-
     async def prefetch_existing(self):
+        # Bulk writes dedupe with ON CONFLICT on the unique name
+        if self.write_mode != "orm":
+            return
+
         result = await self.session.execute(select(Starship.name))
         self.existing_names = set(result.scalars().all())
 
-    async def parse(self, raw_data: dict) -> Starship | None:
+    def prepare(self, raw_data: dict) -> dict | None:
         name = raw_data.get("name")
         if not name or name in self.existing_names:
             return None
 
+        return {
+            "name": name,
+            "model": raw_data.get("model"),
+            "manufacturer": raw_data.get("manufacturer"),
+        }
+
+    async def parse(self, raw_data: dict) -> Starship | None:
+        if (data := self.prepare(raw_data)) is None:
+            return None
+
         try:
-            valid_data = StarshipCreate(
-                name=name,
-                model=raw_data.get("model"),
-                manufacturer=raw_data.get("manufacturer"),
-            )
+            valid_data = StarshipCreate(**data)
         except Exception as e:
             logger.warning(f"[starships] Validation failed: {e}")
             return None
 
-        return Starship(**valid_data.model_dump())
+        return Starship(**self.to_row(raw_data, valid_data.model_dump()))
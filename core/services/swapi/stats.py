@@ -0,0 +1,196 @@
+import bisect
+import time
+
+try:
+    from resource import RUSAGE_SELF, getrusage
+except ImportError:  # Not available on Windows
+    getrusage = None
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far."""
+    if getrusage is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return getrusage(RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cheap enough to update per request)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound (ms) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return round(self.max * 1000, 1)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max * 1000, 1),
+            "buckets": {
+                label: count for label, count in zip(labels, self.counts) if count
+            },
+        }
+
+
+class ImporterStats:
+    """
+    Counters and timings of one importer run.
+
+    Stage times (`fetch_time`, `parse_time`, `write_time`) are the time each
+    pipeline stage spent busy. The stages overlap when streaming, so the
+    largest one points at the bottleneck: network, validation or the DB.
+
+    `snapshot()` is a JSON-friendly dict (stored on the import job while it
+    runs), `summary()` the one-line version logged at the end of a run.
+    """
+
+    def __init__(self, resource: str):
+        self.resource = resource
+        self.status = "pending"
+        self.started: float | None = None
+        self.finished: float | None = None
+        # Checkpoint an interrupted run left behind, if this one resumed it
+        self.resumed_from: dict | None = None
+
+        self.pages_fetched = 0
+        self.bytes_fetched = 0
+        self.fetch_latency = LatencyHistogram()
+        self.records_parsed = 0
+        self.records_rejected = 0
+        self.batches_written = 0
+        self.records_written = 0
+        self.rows_inserted = 0
+        self.link_rows = 0
+        self.batch_commit_latency = LatencyHistogram()
+        # `BatchSizer.snapshot()` of the sizes the write batches were given
+        self.batch_sizes: dict | None = None
+        # `Changeset.snapshot()` of a diffing import
+        self.changes: dict | None = None
+
+        self.fetch_time = 0.0
+        self.parse_time = 0.0
+        self.write_time = 0.0
+        self.peak_rss = peak_rss_bytes()
+
+    def start(self) -> None:
+        self.status = "running"
+        self.started = time.perf_counter()
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        self.finished = time.perf_counter()
+        self.update_peak_rss()
+
+    def update_peak_rss(self) -> None:
+        self.peak_rss = peak_rss_bytes()
+
+    def record_fetch(self, seconds: float) -> None:
+        self.fetch_latency.observe(seconds)
+
+    def record_page(self, size: int) -> None:
+        self.pages_fetched += 1
+        self.bytes_fetched += size
+
+    def record_parse(self, parsed: int, rejected: int, seconds: float) -> None:
+        self.records_parsed += parsed
+        self.records_rejected += rejected
+        self.parse_time += seconds
+
+    def record_write(
+        self, records: int, rows_inserted: int, link_rows: int, seconds: float
+    ) -> None:
+        self.batches_written += 1
+        self.records_written += records
+        self.rows_inserted += rows_inserted
+        self.link_rows += link_rows
+        self.write_time += seconds
+        self.batch_commit_latency.observe(seconds)
+        self.update_peak_rss()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def snapshot(self) -> dict:
+        elapsed = self.elapsed
+        return {
+            "resource": self.resource,
+            "status": self.status,
+            "elapsed_s": round(elapsed, 3),
+            "resumed_from": self.resumed_from,
+            "pages_fetched": self.pages_fetched,
+            "bytes_fetched": self.bytes_fetched,
+            "fetch_latency": self.fetch_latency.snapshot(),
+            "records_parsed": self.records_parsed,
+            "records_rejected": self.records_rejected,
+            "batches_written": self.batches_written,
+            "records_written": self.records_written,
+            "rows_inserted": self.rows_inserted,
+            "link_rows": self.link_rows,
+            "batch_commit_latency": self.batch_commit_latency.snapshot(),
+            "batch_sizes": self.batch_sizes,
+            "changes": self.changes,
+            "timings_s": {
+                "fetch": round(self.fetch_time, 3),
+                "parse": round(self.parse_time, 3),
+                "write": round(self.write_time, 3),
+            },
+            "records_per_s": round(self.records_written / elapsed, 1)
+            if elapsed
+            else None,
+            "peak_rss_bytes": self.peak_rss,
+        }
+
+    def summary(self) -> str:
+        fetch = self.fetch_latency
+        commit = self.batch_commit_latency
+        rss = f"{self.peak_rss / 2**20:.0f}MiB" if self.peak_rss else "n/a"
+        sizes = self.batch_sizes
+        batching = (
+            f"{sizes['mode']} batches of {sizes['initial']}->{sizes['last']} "
+            f"(min {sizes['min']}, max {sizes['max']})"
+            if sizes
+            else "batches"
+        )
+        return (
+            f"[{self.resource}] {self.status} in {self.elapsed:.2f}s: "
+            f"{self.pages_fetched} pages ({self.bytes_fetched / 1024:.0f}KiB, "
+            f"fetch p50 {fetch.percentile(0.5)}ms p95 {fetch.percentile(0.95)}ms), "
+            f"{self.records_parsed} parsed / {self.records_rejected} rejected, "
+            f"{self.rows_inserted} rows inserted + {self.link_rows} link rows in "
+            f"{self.batches_written} {batching} (commit p95 "
+            f"{commit.percentile(0.95)}ms), "
+            f"fetch {self.fetch_time:.2f}s / parse {self.parse_time:.2f}s / "
+            f"write {self.write_time:.2f}s, peak RSS {rss}"
+        )
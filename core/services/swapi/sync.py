@@ -0,0 +1,167 @@
+import hashlib
+import math
+from datetime import datetime, timezone
+import httpx
+from sqlalchemy import ColumnElement, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.models import SyncState
+
+
+def parse_edited(value: str | None) -> datetime | None:
+    """Parse SWAPI's ISO 8601 `edited` timestamp, ignoring malformed values."""
+    if not value:
+        return None
+    try:
+        edited = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return edited if edited.tzinfo else edited.replace(tzinfo=timezone.utc)
+
+
+class SyncTracker:
+    """
+    Tracks per-page sync state for one SWAPI resource across import runs.
+
+    - `conditional_headers()` turns the stored ETag / Last-Modified of a page
+      into `If-None-Match` / `If-Modified-Since` request headers.
+    - `observe()` records a freshly fetched page and tells whether its body
+      actually changed (content hash), `unchanged()` builds the empty page
+      returned when it didn't (or the upstream answered 304).
+    - `changed_records()` drops the records of a page that were stored
+      already and whose `edited` timestamp is not newer than anything the
+      previous run saw on that page. Records that were never stored (added
+      with an old timestamp, or rejected last time) always go through; only
+      the page's own keys are looked up.
+    - `forget()` drops a page the importer couldn't write completely (e.g.
+      links to records that aren't imported yet): its stored state is
+      deleted on `save()`, so the next run fetches and diffs it in full.
+
+    New state is only kept in memory until `save()`, which the importer calls
+    once the run has been written, so a failed run is simply fetched again.
+    """
+
+    def __init__(self, session: AsyncSession, resource: str, key: ColumnElement):
+        self.session = session
+        self.resource = resource
+        # Natural key column of the resource's table
+        self.key = key
+        self.previous: dict[int, SyncState] = {}
+        self.current: dict[int, SyncState] = {}
+        self.forgotten: set[int] = set()
+
+    async def load(self) -> None:
+        result = await self.session.execute(
+            select(SyncState).where(SyncState.resource == self.resource)
+        )
+        self.previous = {state.page: state for state in result.scalars().all()}
+        self.current = {}
+        self.forgotten = set()
+
+    def conditional_headers(self, page: int) -> dict[str, str]:
+        headers = {}
+        if state := self.previous.get(page):
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    def unchanged(self, page: int) -> dict:
+        """The page as seen last time, without records to import."""
+        state = self.previous[page]
+        self.current[page] = state.model_copy(
+            update={"synced_at": datetime.now(timezone.utc)}
+        )
+        return {
+            "count": state.count,
+            "results": [],
+            "page_size": state.record_count,
+            "unchanged": True,
+        }
+
+    def observe(self, page: int, response: httpx.Response, data: dict) -> dict:
+        """Record a fetched page; returns `unchanged()` if its body is identical."""
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        previous = self.previous.get(page)
+        if previous and previous.content_hash == content_hash:
+            return self.unchanged(page)
+
+        self.current[page] = SyncState(
+            resource=self.resource,
+            page=page,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=content_hash,
+            count=data.get("count"),
+            record_count=len(data["results"]),
+            max_edited=max(
+                filter(None, (parse_edited(r.get("edited")) for r in data["results"])),
+                default=None,
+            ),
+            synced_at=datetime.now(timezone.utc),
+        )
+        return data
+
+    async def changed_records(self, page: int, records: list[dict]) -> list[dict]:
+        state = self.previous.get(page)
+        if state is None or state.max_edited is None:
+            return records
+        seen = {
+            record.get(self.key.key)
+            for record in records
+            if (edited := parse_edited(record.get("edited"))) is not None
+            and edited <= state.max_edited
+        }
+        if not seen:
+            return records
+
+        # A connection of its own, pages are filtered while the writer uses
+        # the session
+        async with self.session.bind.connect() as connection:
+            result = await connection.execute(
+                select(self.key).where(self.key.in_(seen))
+            )
+            stored = set(result.scalars().all())
+        return [record for record in records if record.get(self.key.key) not in stored]
+
+    def forget(self, page: int) -> None:
+        self.current.pop(page, None)
+        self.forgotten.add(page)
+
+    async def save(self) -> None:
+        """Persist the state of every page seen in this run (caller commits)."""
+        if self.forgotten:
+            await self.session.execute(
+                delete(SyncState).where(
+                    SyncState.resource == self.resource,
+                    SyncState.page.in_(self.forgotten),
+                )
+            )
+        if not self.current:
+            return
+
+        rows = [state.model_dump() for state in self.current.values()]
+        stmt = insert(SyncState).values(rows)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["resource", "page"],
+                set_={
+                    c: stmt.excluded[c]
+                    for c in rows[0]
+                    if c not in ("resource", "page")
+                },
+            )
+        )
+
+        # Forget pages that no longer exist upstream
+        if first := self.current.get(1):
+            page_size = first.record_count or 1
+            total_pages = max(1, math.ceil((first.count or 0) / page_size))
+            await self.session.execute(
+                delete(SyncState).where(
+                    SyncState.resource == self.resource,
+                    SyncState.page > total_pages,
+                )
+            )
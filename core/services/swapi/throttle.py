@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from core.config import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_DECREASE,
+    RATE_LIMIT_INCREASE,
+    RATE_LIMIT_INITIAL,
+    RATE_LIMIT_MAX,
+    RATE_LIMIT_MIN,
+    THROTTLE_CODES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the upstream is considered down."""
+
+
+def parse_retry_after(value) -> float | None:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP date)."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """
+    "Full jitter" exponential backoff: a random delay up to
+    `BACKOFF_BASE * 2**attempt` (capped at `BACKOFF_MAX`), so concurrent
+    retries don't hit the upstream in lockstep. A `Retry-After` from the
+    upstream is a lower bound (also capped at `BACKOFF_MAX`).
+    """
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, BACKOFF_MAX))
+    return delay
+
+
+class RateLimiter:
+    """
+    Token bucket whose refill rate adapts with AIMD.
+
+    Every successful response adds `increase / rate` requests/second, i.e.
+    roughly `increase` more per second of traffic (additive increase), a
+    throttling response (429/503) multiplies the rate by `decrease`
+    (multiplicative decrease), at most once per second so a burst of
+    concurrent 429s counts as one signal. A `Retry-After` pauses the whole
+    bucket, not just the request that got it.
+    """
+
+    decrease_interval = 1.0
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_INITIAL,
+        min_rate: float = RATE_LIMIT_MIN,
+        max_rate: float = RATE_LIMIT_MAX,
+        burst: int = RATE_LIMIT_BURST,
+        increase: float = RATE_LIMIT_INCREASE,
+        decrease: float = RATE_LIMIT_DECREASE,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = float("-inf")
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.throttle_events = 0
+        self.wait_time = 0.0
+        self.started: float | None = None
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait for a token; waiters are served in arrival order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    if self.started is None:
+                        self.started = now
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+                self.wait_time += wait
+                await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        self.throttle_events += 1
+        now = time.monotonic()
+        if retry_after:
+            self.paused_until = max(
+                self.paused_until, now + min(retry_after, BACKOFF_MAX)
+            )
+        if now - self.last_decrease >= self.decrease_interval:
+            self.last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            logger.warning(f"Upstream is throttling, rate lowered to {self.rate:.2f}/s")
+
+    @property
+    def effective_rate(self) -> float:
+        """Requests per second actually sent since the first one."""
+        if self.started is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started
+        return self.acquired / elapsed if elapsed > 0 else float(self.acquired)
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the upstream is down.
+
+    `closed`: requests flow, consecutive failures (5xx, network errors) are
+    counted. After `failure_threshold` of them the circuit is `open` and
+    every request raises `CircuitOpenError` for `reset_timeout` seconds.
+    Then it is `half_open`: a single trial request goes through, closing the
+    circuit on success or opening it again on failure. A trial that ends
+    without a result (cancelled, unexpected error) must be handed back with
+    `end_trial()` so the next request can take its place.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.trials = 0
+        self.opens = 0
+
+    def check(self) -> int | None:
+        """Return the trial number when this request is the half-open trial."""
+        if self.state == "open":
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"Upstream circuit is open, retry in {remaining:.1f}s"
+                )
+            self.state = "half_open"
+            self.trial_in_flight = False
+
+        if self.state == "half_open":
+            if self.trial_in_flight:
+                raise CircuitOpenError("Upstream circuit is half-open, trial in flight")
+            self.trial_in_flight = True
+            self.trials += 1
+            return self.trials
+        return None
+
+    def end_trial(self, trial: int | None) -> None:
+        # Only the latest trial holds the slot, an older one finishing late
+        # must not free a newer one
+        if trial is not None and trial == self.trials:
+            self.trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opens += 1
+                logger.error(
+                    f"Upstream circuit opened after {self.failures} failures, "
+                    f"failing fast for {self.reset_timeout:.0f}s"
+                )
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+class Throttle:
+    """
+    Upstream protection shared by every importer of a run: one `RateLimiter`
+    for the total request rate and one `CircuitBreaker` for upstream health.
+
+    Usage (see `SwapiImporterBase._fetch_with_retries()`):
+        trial = await throttle.before_request()   # may raise CircuitOpenError
+        try:
+            ...send...
+            throttle.record_success() / throttle.record_failure(status, retry_after)
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+        finally:
+            throttle.end_trial(trial)
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = 0
+
+    async def before_request(self) -> int | None:
+        trial = self.breaker.check()
+        try:
+            await self.limiter.acquire()
+        except BaseException:
+            self.breaker.end_trial(trial)
+            raise
+        return trial
+
+    def end_trial(self, trial: int | None) -> None:
+        self.breaker.end_trial(trial)
+
+    def record_success(self) -> None:
+        self.limiter.on_success()
+        self.breaker.record_success()
+
+    def record_failure(
+        self, status: int | None = None, retry_after: float | None = None
+    ) -> None:
+        """Record a failed request; `status` is None for network errors."""
+        if status in THROTTLE_CODES:
+            self.limiter.on_throttle(retry_after)
+        if status is None or status >= 500:
+            self.breaker.record_failure()
+        else:
+            # The upstream answered, it is up even if it throttles us
+            self.breaker.record_success()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.limiter.acquired,
+            "retries": self.retries,
+            "rate_limit": round(self.limiter.rate, 2),
+            "effective_rate": round(self.limiter.effective_rate, 2),
+            "throttle_events": self.limiter.throttle_events,
+            "throttle_wait": round(self.limiter.wait_time, 3),
+            "circuit_state": self.breaker.state,
+            "circuit_opens": self.breaker.opens,
+        }
@@ -0,0 +1,37 @@
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+@lru_cache
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def validate_batch(
+    schema: type[BaseModel], records: list[dict]
+) -> tuple[list[dict | None], dict[int, str]]:
+    """
+    Validate a whole page of records against `schema` in one pydantic call.
+
+    Returns the validated records as plain dicts, positionally (None where a
+    record was invalid), and an error message per invalid record index. One
+    bad record doesn't fail the others: they are validated again without it.
+
+    Module level and free of importer state, so it can run in a process pool.
+    """
+    adapter = list_adapter(schema)
+    try:
+        return adapter.dump_python(adapter.validate_python(records)), {}
+    except ValidationError as e:
+        errors: dict[int, str] = {}
+        for error in e.errors(include_url=False):
+            index, *field = error["loc"]
+            location = ".".join(str(part) for part in field) or "record"
+            errors.setdefault(index, f"{location}: {error['msg']}")
+
+    valid = [i for i in range(len(records)) if i not in errors]
+    rows: list[dict | None] = [None] * len(records)
+    validated = adapter.validate_python([records[i] for i in valid])
+    for index, row in zip(valid, adapter.dump_python(validated)):
+        rows[index] = row
+    return rows, errors
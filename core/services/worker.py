@@ -0,0 +1,124 @@
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import JOB_HEARTBEAT_INTERVAL, JOB_POLL_INTERVAL
+from core.crud.integrations import run_all_importers
+from core.database.session import async_session
+from core.models import ImportJob
+from core.services.jobs import ImportJobQueue
+from core.services.swapi.stats import ImporterStats
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot(stats: dict[str, ImporterStats]) -> dict:
+    return {resource: s.snapshot() for resource, s in list(stats.items())}
+
+
+class ImportWorker:
+    """
+    Runs queued import jobs outside the API processes.
+
+    Polls `ImportJobQueue` every `poll_interval` seconds, runs claimed jobs
+    one at a time and records how they ended. Start as many worker
+    processes as needed (`scripts/worker.py`), claims never overlap.
+
+    While a job runs, every heartbeat also stores a snapshot of its
+    importers' `ImporterStats` on the job row (`GET /api/import/{job_id}/`).
+
+    Usage:
+        await ImportWorker().run_forever(stop_event)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = async_session,
+        run_import: Callable[
+            [dict[str, ImporterStats]], Awaitable[None]
+        ] = run_all_importers,
+        poll_interval: float | None = None,
+        name: str | None = None,
+    ):
+        self.session_factory = session_factory
+        self.run_import = run_import
+        self.poll_interval = poll_interval or JOB_POLL_INTERVAL
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run_forever(self, stop: asyncio.Event | None = None) -> None:
+        stop = stop or asyncio.Event()
+        logger.info(f"[worker {self.name}] Waiting for import jobs")
+        while not stop.is_set():
+            try:
+                job = await self.run_once()
+            except Exception:
+                logger.exception(f"[worker {self.name}] Polling failed")
+                job = None
+
+            # Keep draining the queue, otherwise sleep until the next poll
+            if job is None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+
+    async def run_once(self) -> ImportJob | None:
+        """Claim and run one job, if any is queued."""
+        async with self.session_factory() as session:
+            queue = ImportJobQueue(session)
+            await queue.requeue_stale()
+            job = await queue.claim(self.name)
+        if job is None:
+            return None
+
+        logger.info(f"[worker {self.name}] Running import job {job.id}")
+        stats: dict[str, ImporterStats] = {}
+        heartbeat = asyncio.create_task(self._heartbeat(job, stats))
+        error = None
+        try:
+            await self.run_import(stats)
+        except asyncio.CancelledError:
+            # Shutting down: let another worker pick the job up again
+            async with self.session_factory() as session:
+                await ImportJobQueue(session).release(job.id, job.attempts)
+            raise
+        except Exception as e:
+            logger.exception(f"[worker {self.name}] Import job {job.id} failed")
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+
+        async with self.session_factory() as session:
+            finished = await ImportJobQueue(session).finish(
+                job.id, job.attempts, error, snapshot(stats)
+            )
+        if finished:
+            logger.info(f"[worker {self.name}] Import job {job.id} finished")
+        else:
+            logger.warning(
+                f"[worker {self.name}] Import job {job.id} was requeued while "
+                f"running, its result is discarded"
+            )
+        return job
+
+    async def _heartbeat(self, job: ImportJob, stats: dict[str, ImporterStats]) -> None:
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            try:
+                async with self.session_factory() as session:
+                    if not await ImportJobQueue(session).heartbeat(
+                        job.id, job.attempts, snapshot(stats)
+                    ):
+                        logger.warning(
+                            f"[worker {self.name}] Lost import job {job.id} "
+                            f"to a requeue"
+                        )
+                        return
+            except Exception:
+                logger.exception(f"[worker {self.name}] Heartbeat failed")
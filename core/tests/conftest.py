@@ -6,7 +6,8 @@ from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from core.database.settings import db_settings
-from core.database.session import get_session
+from core.crud.utils.counting import count_cache
+from core.database.session import get_read_session, get_session
 from core.main import app
 from httpx import AsyncClient, ASGITransport
 
@@ -48,6 +49,9 @@ async def client(session: AsyncSession):
         yield session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    # Every test starts from an empty database
+    count_cache.clear()
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -0,0 +1,109 @@
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.database.bulk import BulkWriter
+from core.models import Character, CharacterFilmLink, Film
+
+
+def character_rows(*names: str, gender: str = "n/a") -> list[dict]:
+    return [{"name": name, "gender": gender, "birth_year": None} for name in names]
+
+
+@pytest.mark.parametrize("mode", ["copy", "insert"])
+async def test_upsert_returns_id_for_every_key(session: AsyncSession, mode):
+    writer = BulkWriter(session, mode)
+    rows = character_rows(*(f"Character {i}" for i in range(5)))
+
+    ids = await writer.upsert(Character.__table__, rows, "name")
+    await session.commit()
+
+    result = await session.execute(select(Character.name, Character.id))
+    assert ids == dict(result.all())
+
+
+@pytest.mark.parametrize("mode", ["copy", "insert"])
+async def test_upsert_do_nothing_keeps_existing_rows(session: AsyncSession, mode):
+    session.add(Character(name="Luke Skywalker", gender="male", birth_year="19BBY"))
+    await session.commit()
+
+    writer = BulkWriter(session, mode)
+    ids = await writer.upsert(
+        Character.__table__,
+        character_rows("Luke Skywalker", "Leia Organa", gender="unknown"),
+        "name",
+        on_conflict="nothing",
+    )
+    await session.commit()
+
+    result = await session.execute(select(Character))
+    characters = {c.name: c for c in result.scalars().all()}
+    assert set(ids) == {"Luke Skywalker", "Leia Organa"}
+    assert ids["Luke Skywalker"] == characters["Luke Skywalker"].id
+    assert characters["Luke Skywalker"].gender == "male"
+    assert characters["Leia Organa"].gender == "unknown"
+
+
+@pytest.mark.parametrize("mode", ["copy", "insert"])
+async def test_upsert_do_update_refreshes_existing_rows(session: AsyncSession, mode):
+    session.add(Character(name="Luke Skywalker", gender="male", birth_year="19BBY"))
+    await session.commit()
+
+    writer = BulkWriter(session, mode)
+    await writer.upsert(
+        Character.__table__,
+        # In-batch duplicates are collapsed, the last one wins
+        character_rows("Luke Skywalker", "Luke Skywalker", gender="unknown"),
+        "name",
+        on_conflict="update",
+    )
+    await session.commit()
+
+    result = await session.execute(select(Character.name, Character.gender))
+    assert result.all() == [("Luke Skywalker", "unknown")]
+
+
+@pytest.mark.parametrize("mode", ["copy", "insert"])
+async def test_insert_links_ignores_existing_pairs(session: AsyncSession, mode):
+    writer = BulkWriter(session, mode)
+    film_ids = await writer.upsert(
+        Film.__table__,
+        [
+            {
+                "title": "A New Hope",
+                "episode_id": 4,
+                "director": None,
+                "producer": None,
+                "release_date": None,
+            }
+        ],
+        "title",
+    )
+    character_ids = await writer.upsert(
+        Character.__table__, character_rows("Luke Skywalker"), "name"
+    )
+    pair = (character_ids["Luke Skywalker"], film_ids["A New Hope"])
+
+    await writer.insert_links(
+        CharacterFilmLink.__table__, ("character_id", "film_id"), [pair]
+    )
+    await writer.insert_links(
+        CharacterFilmLink.__table__, ("character_id", "film_id"), [pair, pair]
+    )
+    await session.commit()
+
+    result = await session.execute(select(CharacterFilmLink))
+    links = result.scalars().all()
+    assert [(link.character_id, link.film_id) for link in links] == [pair]
+
+
+async def test_empty_batches_are_noops(session: AsyncSession):
+    writer = BulkWriter(session, "copy")
+    assert await writer.upsert(Character.__table__, [], "name") == {}
+    await writer.insert_links(
+        CharacterFilmLink.__table__, ("character_id", "film_id"), []
+    )
+
+
+def test_unsupported_mode_raises(session: AsyncSession):
+    with pytest.raises(ValueError, match="Unsupported bulk write mode"):
+        BulkWriter(session, "orm")
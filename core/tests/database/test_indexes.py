@@ -0,0 +1,105 @@
+from pathlib import Path
+import pytest
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.models import (
+    Character,
+    CharacterFilmLink,
+    CharacterStarshipLink,
+    StarshipFilmLink,
+)
+
+
+ALEMBIC_INI = Path(__file__).parents[3] / "alembic.ini"
+# Add search indexes
+SEARCH_INDEXES_REVISION = "b89dbe39fbc1"
+
+
+def upgrade(connection, revision: str) -> None:
+    """Run the `upgrade()` of one migration on `connection`, as alembic does."""
+    script = ScriptDirectory.from_config(Config(ALEMBIC_INI))
+    with Operations.context(MigrationContext.configure(connection)):
+        script.get_revision(revision).module.upgrade()
+
+
+async def plan(session: AsyncSession, query) -> str:
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await session.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(result.scalars())
+
+
+def link_pairs(link: str, owner: str, target: str, targets: int) -> str:
+    """Link every `owner` row to two of the `targets` `target` rows."""
+    return (
+        f"INSERT INTO {link} ({owner}_id, {target}_id) "
+        f"SELECT o.id, t.id FROM {owner} o JOIN {target} t ON t.swapi_id IN "
+        f"(o.swapi_id % {targets} + 1, (o.swapi_id + 7) % {targets} + 1)"
+    )
+
+
+async def seed(session: AsyncSession) -> None:
+    for table, column, count in (
+        ("film", "title", 50),
+        ("starship", "name", 500),
+        ("character", "name", 5000),
+    ):
+        await session.execute(
+            text(
+                f"INSERT INTO {table} ({column}, swapi_id) "
+                f"SELECT '{table} ' || i, i FROM generate_series(1, {count}) i"
+            )
+        )
+    await session.execute(
+        text(link_pairs("characterfilmlink", "character", "film", 50))
+    )
+    await session.execute(text(link_pairs("starshipfilmlink", "starship", "film", 50)))
+    await session.execute(
+        text(link_pairs("characterstarshiplink", "character", "starship", 500))
+    )
+    session.add(Character(name="Luke Skywalker"))
+    await session.commit()
+    await session.execute(text("ANALYZE"))
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        CharacterFilmLink.film_id,
+        StarshipFilmLink.film_id,
+        CharacterStarshipLink.starship_id,
+    ],
+)
+async def test_link_lookups_by_second_column_use_index(session: AsyncSession, column):
+    await seed(session)
+
+    query = select(column.table).where(column == 7)
+
+    assert f"ix_{column.table.name}_{column.name}" in await plan(session, query)
+
+
+async def test_ilike_search_uses_trigram_index(session: AsyncSession):
+    available = await session.scalar(
+        text("SELECT count(*) FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if not available:
+        pytest.skip("pg_trgm isn't available on this server")
+
+    # Trigram indexes aren't part of the models, only of the migration
+    async with session.bind.connect() as connection:
+        await connection.run_sync(upgrade, SEARCH_INDEXES_REVISION)
+    await seed(session)
+
+    query = select(Character).where(Character.name.ilike("%skywalker%"))
+    assert "ix_character_name_trgm" in await plan(session, query)
+    # Unindexed, the same search scans the table
+    assert "Seq Scan" in await plan(
+        session, select(Character).where(Character.gender.ilike("%skywalker%"))
+    )
@@ -0,0 +1,45 @@
+from sqlalchemy import text
+from core.database.settings import ENGINE_PROFILES
+from core.tests.database.utils import settings
+
+
+def test_profile_follows_environment(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    assert settings().engine_profile == ENGINE_PROFILES["production"]
+
+    monkeypatch.setenv("ENVIRONMENT", "somewhere")
+    assert settings().engine_profile == ENGINE_PROFILES["docker"]
+    assert settings().engine_profile["echo"] is False
+
+
+def test_overrides_and_connect_args(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+
+    options = settings(DB_STATEMENT_TIMEOUT=0).engine_options("swapi-worker")
+
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == ENGINE_PROFILES["production"]["max_overflow"]
+    assert options["connect_args"] == {
+        "statement_cache_size": ENGINE_PROFILES["production"]["statement_cache_size"],
+        "server_settings": {
+            "application_name": "swapi-worker",
+            "statement_timeout": "0",
+        },
+    }
+    default = settings().engine_options(statement_timeout=None)
+    assert "statement_timeout" not in default["connect_args"]["server_settings"]
+
+
+async def test_engine_applies_server_settings(session):
+    options = settings(DB_STATEMENT_TIMEOUT=1500, DB_APPLICATION_NAME="swapi-test")
+    engine = options.create_engine(session.bind.url, pool_size=1)
+    try:
+        async with engine.connect() as connection:
+            timeout = await connection.scalar(text("SHOW statement_timeout"))
+            name = await connection.scalar(text("SHOW application_name"))
+    finally:
+        await engine.dispose()
+
+    assert (timeout, name) == ("1500ms", "swapi-test")
+    assert engine.pool.size() == 1
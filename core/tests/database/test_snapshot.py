@@ -0,0 +1,139 @@
+import gzip
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.database import snapshot
+from core.database.snapshot import export_snapshot, read_header, restore_snapshot
+from core.models import (
+    Character,
+    Film,
+    ImportCheckpoint,
+    ImportShard,
+    StagedLink,
+    Starship,
+    SyncState,
+)
+
+
+async def seed(session: AsyncSession) -> None:
+    films = [Film(title=f"Film {i}", swapi_id=i, episode_id=i) for i in (1, 2)]
+    ship = Starship(name="X-wing", swapi_id=12, films=films[:1])
+    session.add_all(films)
+    session.add(
+        Character(
+            name="Luke", swapi_id=1, films=films, starships=[ship], content_hash="ab"
+        )
+    )
+    session.add(Character(name="Leia", swapi_id=5, films=films[1:]))
+    await session.commit()
+
+
+async def contents(session: AsyncSession) -> dict:
+    session.expire_all()
+    result = await session.execute(
+        select(Character).options(
+            selectinload(Character.films), selectinload(Character.starships)
+        )
+    )
+    return {
+        c.name: (
+            c.id,
+            c.swapi_id,
+            c.content_hash,
+            sorted(f.title for f in c.films),
+            [s.name for s in c.starships],
+        )
+        for c in result.scalars().all()
+    }
+
+
+async def test_restore_brings_back_exported_data(session: AsyncSession, tmp_path):
+    await seed(session)
+    expected = await contents(session)
+    await session.commit()
+    path = tmp_path / "swapi.snapshot.gz"
+
+    header = await export_snapshot(session, path)
+
+    assert {t["name"]: t["rows"] for t in header["tables"]} == {
+        "film": 2,
+        "starship": 1,
+        "character": 2,
+        "characterfilmlink": 3,
+        "starshipfilmlink": 1,
+        "characterstarshiplink": 1,
+        "syncstate": 0,
+    }
+
+    await session.delete((await session.execute(select(Film))).scalars().first())
+    session.add(Character(name="Han"))
+    await session.commit()
+
+    assert await restore_snapshot(session, path) == header
+    assert await contents(session) == expected
+
+    # New rows get ids after the restored ones
+    session.add(Character(name="Han"))
+    await session.commit()
+    assert (await contents(session))["Han"][0] > max(v[0] for v in expected.values())
+
+
+async def test_restore_resets_import_progress(session: AsyncSession, tmp_path):
+    await seed(session)
+    now = datetime.now(timezone.utc)
+    session.add(SyncState(resource="people", page=1, etag='"a"', synced_at=now))
+    await session.commit()
+    path = tmp_path / "swapi.snapshot.gz"
+    await export_snapshot(session, path)
+
+    # An interrupted run of some later data
+    session.add(SyncState(resource="people", page=2, etag='"b"', synced_at=now))
+    session.add(ImportCheckpoint(resource="people", page=2, record=15))
+    session.add(ImportShard(run_id="run", resource="people", first_page=1, last_page=2))
+    session.add(
+        StagedLink(run_id="run", kind="films", character_swapi_id=1, target_swapi_id=2)
+    )
+    await session.commit()
+
+    await restore_snapshot(session, path)
+
+    session.expire_all()
+    states = (await session.execute(select(SyncState))).scalars().all()
+    assert [(s.page, s.etag) for s in states] == [(1, '"a"')]
+    for model in (ImportCheckpoint, ImportShard, StagedLink):
+        assert (await session.execute(select(model))).scalars().all() == []
+
+
+async def test_restore_checks_schema_revision(
+    session: AsyncSession, tmp_path, monkeypatch
+):
+    await seed(session)
+    path = tmp_path / "swapi.snapshot.gz"
+    await export_snapshot(session, path)
+
+    async def other_revision(session):
+        return "ffffffffffff"
+
+    monkeypatch.setattr(snapshot, "schema_revision", other_revision)
+    with pytest.raises(ValueError, match="schema revision None"):
+        await restore_snapshot(session, path)
+
+
+async def test_truncated_snapshot_changes_nothing(session: AsyncSession, tmp_path):
+    await seed(session)
+    expected = await contents(session)
+    await session.commit()
+    path = tmp_path / "swapi.snapshot.gz"
+    await export_snapshot(session, path)
+    with gzip.open(path, "rb") as file:
+        data = file.read()
+    with gzip.open(path, "wb") as file:
+        file.write(data[: len(data) - 40])
+
+    with gzip.open(path, "rb") as file:
+        assert read_header(file)["format"] == snapshot.FORMAT_VERSION
+    with pytest.raises(ValueError, match="Truncated"):
+        await restore_snapshot(session, path)
+    assert await contents(session) == expected
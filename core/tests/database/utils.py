@@ -0,0 +1,11 @@
+from core.database.settings import DatabaseSettings
+
+
+def settings(**overrides) -> DatabaseSettings:
+    return DatabaseSettings(
+        POSTGRES_USER="postgres",
+        POSTGRES_PASSWORD="secret",
+        POSTGRES_DB="swapi",
+        POSTGRES_SERVER="db",
+        **overrides,
+    )
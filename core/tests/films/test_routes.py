@@ -1,6 +1,8 @@
 import pytest_asyncio
 from httpx import AsyncClient
 from sqlmodel.ext.asyncio.session import AsyncSession
+from core.crud import film as film_crud
+from core.crud.utils.pagination import Paginator
 from core.models import Film
 
 
@@ -49,6 +51,34 @@ async def test_get_films_with_filter(client: AsyncClient, sample_films):
     assert data["results"][0]["title"] == "The Empire Strikes Back"
 
 
+async def test_get_films_with_cursor(client: AsyncClient, sample_films, monkeypatch):
+    monkeypatch.setattr(film_crud.paginator, "limit", 2)
+    first = (await client.get("/api/films/?cursor=")).json()
+    second = (await client.get(first["next"])).json()
+
+    assert first["count"] == second["count"] == 3
+    assert [f["title"] for f in first["results"] + second["results"]] == [
+        "A New Hope",
+        "The Empire Strikes Back",
+        "Return of the Jedi",
+    ]
+    assert second["next"] is None
+    assert "cursor=" in second["previous"]
+
+    response = await client.get("/api/films/?cursor=garbage")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+async def test_get_films_with_mistyped_cursor(client: AsyncClient, sample_films):
+    for values in (["abc"], [{"a": 1}], [None], [True], [2**40]):
+        cursor = Paginator.encode_cursor(values)
+        response = await client.get(f"/api/films/?cursor={cursor}")
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid cursor"}
+
+
 async def test_get_films_invalid_page(client: AsyncClient):
     response = await client.get("/api/films/?page=0")
     assert response.status_code == 422
@@ -1,29 +1,50 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, patch
 
 from core.crud.integrations import run_all_importers
 
 
+def wire_dependencies(film_imp_mock, ship_imp_mock, char_imp_mock):
+    """Give the importer mocks the dependency graph of the real importers."""
+    for mock, name in [
+        (film_imp_mock, "FilmImporter"),
+        (ship_imp_mock, "StarshipImporter"),
+        (char_imp_mock, "CharacterImporter"),
+    ]:
+        mock.__name__ = name
+        mock.depends_on = ()
+    char_imp_mock.depends_on = (film_imp_mock, ship_imp_mock)
+
+
 @pytest.mark.asyncio
 @patch("core.crud.integrations.FilmImporter")
 @patch("core.crud.integrations.StarshipImporter")
 @patch("core.crud.integrations.CharacterImporter")
 @patch("core.crud.integrations.async_session")
+@patch("core.crud.integrations.create_client")
 @patch("core.crud.integrations.logger")
 async def test_run_all_importers_failure(
-    logger_mock, async_session_mock, char_imp_mock, ship_imp_mock, film_imp_mock
+    logger_mock,
+    create_client_mock,
+    async_session_mock,
+    char_imp_mock,
+    ship_imp_mock,
+    film_imp_mock,
 ):
     """
-    If one importer fails, logs the error but doesn't crash the test
+    If one importer fails, the error is logged and re-raised (so the worker
+    can record it), and importers depending on it are not run
     """
     mock_session = AsyncMock()
     async_session_mock.return_value.__aenter__.return_value = mock_session
+    wire_dependencies(film_imp_mock, ship_imp_mock, char_imp_mock)
 
     film_imp_mock.return_value.run = AsyncMock()
     ship_imp_mock.return_value.run = AsyncMock(side_effect=RuntimeError("Boom"))
     char_imp_mock.return_value.run = AsyncMock()
 
-    await run_all_importers()
+    with pytest.raises(RuntimeError, match="Boom"):
+        await run_all_importers()
 
     film_imp_mock.return_value.run.assert_awaited_once()
     ship_imp_mock.return_value.run.assert_awaited_once()
@@ -37,14 +58,18 @@ async def test_run_all_importers_failure(
 @patch("core.crud.integrations.StarshipImporter")
 @patch("core.crud.integrations.CharacterImporter")
 @patch("core.crud.integrations.async_session")
+@patch("core.crud.integrations.create_client")
 async def test_run_all_importers_success(
-    async_session_mock, char_imp_mock, ship_imp_mock, film_imp_mock
+    create_client_mock, async_session_mock, char_imp_mock, ship_imp_mock, film_imp_mock
 ):
     """
-    All importers run successfully
+    All importers run successfully and share one HTTP client
     """
     mock_session = AsyncMock()
     async_session_mock.return_value.__aenter__.return_value = mock_session
+    wire_dependencies(film_imp_mock, ship_imp_mock, char_imp_mock)
+    mock_client = AsyncMock()
+    create_client_mock.return_value.__aenter__.return_value = mock_client
 
     film_imp_mock.return_value.run = AsyncMock()
     ship_imp_mock.return_value.run = AsyncMock()
@@ -52,9 +77,16 @@ async def test_run_all_importers_success(
 
     await run_all_importers()
 
-    film_imp_mock.assert_called_once_with(mock_session)
-    ship_imp_mock.assert_called_once_with(mock_session)
-    char_imp_mock.assert_called_once_with(mock_session)
+    create_client_mock.assert_called_once()
+    film_imp_mock.assert_called_once_with(
+        mock_session, client=mock_client, throttle=ANY
+    )
+    ship_imp_mock.assert_called_once_with(
+        mock_session, client=mock_client, throttle=ANY
+    )
+    char_imp_mock.assert_called_once_with(
+        mock_session, client=mock_client, throttle=ANY
+    )
 
     film_imp_mock.return_value.run.assert_awaited_once()
     ship_imp_mock.return_value.run.assert_awaited_once()
@@ -0,0 +1,193 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from core.models import ImportJob
+from core.services import worker as worker_module
+from core.services.jobs import ImportJobQueue
+from core.services.swapi.stats import ImporterStats
+from core.services.worker import ImportWorker
+
+
+@pytest.fixture
+def session_factory(session):
+    return async_sessionmaker(session.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+async def load_job(session_factory, job_id: int) -> ImportJob:
+    async with session_factory() as session:
+        return await session.get(ImportJob, job_id)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_single_flight(session):
+    queue = ImportJobQueue(session)
+
+    job, created = await queue.enqueue()
+    again, created_again = await queue.enqueue()
+
+    assert created and not created_again
+    assert again.id == job.id
+
+    claimed = await queue.claim("worker-1")
+    running, created = await queue.enqueue()
+    assert not created and running.id == job.id
+
+    assert await queue.finish(job.id, claimed.attempts)
+    new_job, created = await queue.enqueue()
+    assert created and new_job.id != job.id
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_locked_jobs(session, session_factory):
+    job, _ = await ImportJobQueue(session).enqueue()
+
+    async with session_factory() as other:
+        # Another worker is in the middle of claiming this job
+        await other.execute(
+            select(ImportJob).where(ImportJob.id == job.id).with_for_update()
+        )
+        async with session_factory() as worker_session:
+            assert await ImportJobQueue(worker_session).claim("worker-2") is None
+        await other.rollback()
+
+    claimed = await ImportJobQueue(session).claim("worker-1")
+    assert claimed.id == job.id
+    assert claimed.status == "running" and claimed.attempts == 1
+    assert await ImportJobQueue(session).claim("worker-2") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_jobs_are_requeued_then_failed(session, session_factory):
+    queue = ImportJobQueue(session)
+    job, _ = await queue.enqueue()
+
+    for attempt in range(1, 4):
+        claimed = await queue.claim("crashed-worker")
+        await queue._set(
+            job.id,
+            claimed.attempts,
+            heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        )
+        await queue.requeue_stale()
+        stale = await load_job(session_factory, job.id)
+        assert stale.attempts == attempt
+        assert stale.status == ("queued" if attempt < 3 else "failed")
+
+    assert stale.error == "Worker lost"
+
+
+@pytest.mark.asyncio
+async def test_requeued_jobs_ignore_their_previous_attempt(session):
+    queue = ImportJobQueue(session)
+    job, _ = await queue.enqueue()
+    first = (await queue.claim("worker-1")).attempts
+    assert await queue.release(job.id, first)
+
+    second = (await queue.claim("worker-2")).attempts
+
+    assert not await queue.heartbeat(job.id, first)
+    assert not await queue.finish(job.id, first, error="Boom")
+    assert await queue.finish(job.id, second)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_queued_job(session, session_factory):
+    job, _ = await ImportJobQueue(session).enqueue()
+    run_import = AsyncMock()
+    worker = ImportWorker(session_factory, run_import=run_import, name="test")
+
+    assert (await worker.run_once()).id == job.id
+    assert await worker.run_once() is None
+
+    run_import.assert_awaited_once()
+    done = await load_job(session_factory, job.id)
+    assert done.status == "succeeded"
+    assert done.worker == "test" and done.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_worker_records_failed_job(session, session_factory):
+    job, _ = await ImportJobQueue(session).enqueue()
+    worker = ImportWorker(
+        session_factory, run_import=AsyncMock(side_effect=RuntimeError("Boom"))
+    )
+
+    await worker.run_once()
+
+    failed = await load_job(session_factory, job.id)
+    assert failed.status == "failed"
+    assert failed.error == "RuntimeError: Boom"
+
+
+@pytest.mark.asyncio
+async def test_worker_releases_job_when_cancelled(session, session_factory):
+    job, _ = await ImportJobQueue(session).enqueue()
+    started = asyncio.Event()
+
+    async def run_import(stats):
+        started.set()
+        await asyncio.sleep(60)
+
+    worker = ImportWorker(session_factory, run_import=run_import)
+    task = asyncio.create_task(worker.run_once())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    released = await load_job(session_factory, job.id)
+    assert released.status == "queued"
+
+
+@pytest.mark.asyncio
+async def test_worker_stores_live_and_final_stats(
+    session, session_factory, monkeypatch
+):
+    monkeypatch.setattr(worker_module, "JOB_HEARTBEAT_INTERVAL", 0.01)
+    job, _ = await ImportJobQueue(session).enqueue()
+    live = {}
+
+    async def run_import(stats):
+        films = stats["films"] = ImporterStats("films")
+        films.start()
+        films.record_page(1024)
+        await asyncio.sleep(0.1)
+        # Read back what the API would return mid-run
+        live.update((await load_job(session_factory, job.id)).stats)
+        films.record_page(1024)
+        films.finish("succeeded")
+
+    await ImportWorker(session_factory, run_import=run_import).run_once()
+
+    assert live["films"]["status"] == "running"
+    assert live["films"]["pages_fetched"] == 1
+    done = await load_job(session_factory, job.id)
+    assert done.stats["films"]["status"] == "succeeded"
+    assert done.stats["films"]["bytes_fetched"] == 2048
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_cannot_finish_requeued_job(session, session_factory):
+    job, _ = await ImportJobQueue(session).enqueue()
+    second = ImportWorker(session_factory, run_import=AsyncMock(), name="second")
+
+    async def stalled_import(stats):
+        # Seen as dead: another worker requeues the job and runs it to the end
+        async with session_factory() as other:
+            await other.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job.id)
+                .values(heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1))
+            )
+            await other.commit()
+        await second.run_once()
+        raise RuntimeError("Boom")
+
+    await ImportWorker(session_factory, run_import=stalled_import).run_once()
+
+    done = await load_job(session_factory, job.id)
+    assert done.status == "succeeded" and done.error is None
+    assert done.worker == "second" and done.attempts == 2
@@ -7,23 +7,41 @@ app = FastAPI()
 app.include_router(router)
 
 
-@patch("core.routes.integrations.initialize")
-async def test_import_route_starts_background_task(
-    mock_initialize, client: AsyncClient
-):
+async def test_import_route_queues_a_job(client: AsyncClient):
     response = await client.post("/api/import/")
 
     assert response.status_code == 202
-    assert response.json() == {"detail": "Import started in the background"}
+    body = response.json()
+    assert body["detail"] == "Import queued"
+    assert body["job"]["status"] == "queued"
+
+    response = await client.get(f"/api/import/{body['job']['id']}/")
+
+    assert response.status_code == 200
+    assert response.json() == body["job"]
+
+
+async def test_import_route_is_single_flight(client: AsyncClient):
+    first = (await client.post("/api/import/")).json()
+    second = await client.post("/api/import/")
+
+    assert second.status_code == 202
+    assert second.json()["detail"] == "Import already queued or running"
+    assert second.json()["job"]["id"] == first["job"]["id"]
+
+
+async def test_import_status_not_found(client: AsyncClient):
+    response = await client.get("/api/import/999/")
 
-    mock_initialize.assert_called_once()
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Import job not found"}
 
 
-@patch("core.routes.integrations.initialize")
+@patch("core.routes.integrations.enqueue_import")
 async def test_import_route_raises_500_on_exception(
-    mock_initialize, client: AsyncClient
+    mock_enqueue_import, client: AsyncClient
 ):
-    mock_initialize.side_effect = RuntimeError("Something went wrong")
+    mock_enqueue_import.side_effect = RuntimeError("Something went wrong")
 
     response = await client.post("/api/import/")
 
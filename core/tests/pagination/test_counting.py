@@ -0,0 +1,139 @@
+from datetime import datetime, timezone
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.crud.utils import counting
+from core.crud.utils.counting import CountCache
+from core.crud.utils import pagination
+from core.crud.utils.pagination import Paginator
+from core.models import Character, ImportJob
+from core.schemas.character import CharacterRead
+
+
+class MockRequest:
+    def __init__(self, url: str):
+        self.url = url
+
+
+@pytest_asyncio.fixture
+async def characters(session: AsyncSession):
+    session.add_all(Character(name=f"Character {i}") for i in range(50))
+    await session.commit()
+
+
+@pytest.fixture
+def statements(session: AsyncSession):
+    """The SQL statements run on the session's engine."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+async def paginate(session: AsyncSession, count: str, page: int = 1, **kwargs):
+    return await Paginator(limit=20, count=count).paginate(
+        request=MockRequest("http://test/api/characters/"),
+        session=session,
+        model=Character,
+        schema=CharacterRead,
+        page=page,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "count, expected, queries",
+    [
+        ("exact", 50, 2),
+        ("window", 50, 1),
+        ("estimate", 50, 2),
+        ("none", None, 1),
+    ],
+)
+async def test_count_strategies(
+    session: AsyncSession, characters, statements, count, expected, queries
+):
+    await session.execute(text("ANALYZE character"))
+    statements.clear()
+
+    last = await paginate(session, count, page=3)
+
+    assert (last.count, len(last.results), last.next) == (expected, 10, None)
+    assert "page=2" in last.previous
+    assert len(statements) == queries
+
+    first = await paginate(session, count)
+    assert first.count == expected
+    assert "page=2" in first.next
+
+
+async def test_window_count_past_the_last_page(session: AsyncSession, characters):
+    page = await paginate(session, "window", page=9)
+
+    assert (page.count, page.results, page.next) == (50, [], None)
+
+
+async def test_estimate_needs_statistics_and_no_filter(
+    session: AsyncSession, characters
+):
+    # Never analyzed: counted exactly
+    assert (await paginate(session, "estimate")).count == 50
+
+    page = await paginate(
+        session, "estimate", filter="character 4", filter_field=Character.name
+    )
+    assert page.count == 11
+
+
+async def test_cached_count_is_dropped_after_an_import(
+    session: AsyncSession, characters, monkeypatch
+):
+    monkeypatch.setattr(counting, "COUNT_CACHE_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(pagination, "count_cache", CountCache())
+    filtered = {"filter": "character 4", "filter_field": Character.name}
+
+    assert (await paginate(session, "cached")).count == 50
+    assert (await paginate(session, "cached", **filtered)).count == 11
+    session.add(Character(name="Character 50"))
+    await session.commit()
+    assert (await paginate(session, "cached")).count == 50
+
+    session.add(ImportJob(status="succeeded", finished_at=datetime.now(timezone.utc)))
+    await session.commit()
+    assert (await paginate(session, "cached")).count == 51
+    assert (await paginate(session, "cached", **filtered)).count == 11
+
+
+async def test_cache_is_bounded_and_drops_expired_counts(session: AsyncSession):
+    cache = CountCache(ttl=60, max_size=2)
+    computed = []
+
+    async def get(key):
+        async def count():
+            computed.append(key)
+            return len(computed)
+
+        return await cache.get(session, key, count)
+
+    await get("a")
+    await get("b")
+    await get("a")  # "b" is now the least recently used
+    await get("c")
+    assert list(cache.counts) == ["a", "c"]
+    assert computed == ["a", "b", "c"]
+
+    cache.ttl = 0
+    await get("a")
+    assert computed == ["a", "b", "c", "a"]
+    assert len(cache.counts) == 2
+
+
+def test_unknown_count_strategy():
+    with pytest.raises(ValueError, match="Unsupported count strategy"):
+        Paginator(count="guess")
@@ -1,6 +1,8 @@
 import pytest
 import pytest_asyncio
 
+from fastapi import HTTPException
+from starlette.datastructures import URL, QueryParams
 from sqlmodel.ext.asyncio.session import AsyncSession
 from core.crud.utils.pagination import Paginator
 from core.schemas.character import CharacterRead
@@ -146,3 +148,73 @@ async def test_paginator_filtering_no_results(session: AsyncSession):
     assert page.results == []
     assert page.previous is None
     assert page.next is None
+
+
+async def test_paginator_keyset_walks_forward_and_back(
+    session: AsyncSession, many_characters
+):
+    paginator = Paginator(limit=20)
+
+    async def fetch(url: str):
+        cursor = QueryParams(URL(url).query).get("cursor", "")
+        return await paginator.paginate(
+            request=MockRequest(url),
+            session=session,
+            model=Character,
+            schema=CharacterRead,
+            cursor=cursor,
+            order_by=Character.name,
+        )
+
+    first = await fetch("http://test/api/characters/?cursor=&page=3")
+    second = await fetch(first.next)
+    third = await fetch(second.next)
+    names = [c.name for p in (first, second, third) for c in p.results]
+
+    assert names == sorted(f"Test Character {i}" for i in range(50))
+    assert first.previous is None
+    assert "page=" not in first.next
+    assert third.next is None
+    assert third.count == 50
+
+    back = await fetch(third.previous)
+    assert back.results == second.results
+    assert back.next == second.next
+    assert (await fetch(back.previous)).previous is None
+
+
+async def test_paginator_keyset_filtering(session: AsyncSession, many_characters):
+    session.add(Character(name="Luke Skywalker", gender="male", birth_year="19BBY"))
+    await session.commit()
+    paginator = Paginator(limit=5)
+
+    page = await paginator.paginate(
+        request=MockRequest("http://test/api/characters/?name=character 4&cursor="),
+        session=session,
+        model=Character,
+        schema=CharacterRead,
+        cursor="",
+        filter="character 4",
+        filter_field=Character.name,
+    )
+
+    assert [c.name for c in page.results] == [
+        f"Test Character {i}" for i in (4, 40, 41, 42, 43)
+    ]
+    assert "name=character" in page.next
+
+
+async def test_paginator_invalid_cursor(session: AsyncSession):
+    paginator = Paginator()
+    request = MockRequest("http://test/api/characters/")
+
+    for cursor in ("not a cursor", Paginator.encode_cursor(["Luke", 1])):
+        with pytest.raises(HTTPException) as error:
+            await paginator.paginate(
+                request=request,
+                session=session,
+                model=Character,
+                schema=CharacterRead,
+                cursor=cursor,
+            )
+        assert error.value.status_code == 400
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from httpx import HTTPStatusError, Request, Response
@@ -6,9 +7,7 @@ from core.services.swapi.base import SwapiImporterBase
 
 
 class DummyImporter(SwapiImporterBase):
-    @property
-    def resource(self):
-        return "dummy"
+    resource = "dummy"
 
     async def parse(self, raw_data: dict):
         return {"parsed": raw_data}
@@ -72,3 +71,134 @@ async def test_fetch_page_non_retryable_http_error(monkeypatch):
 
     with pytest.raises(HTTPStatusError):
         await importer.fetch_page(1)
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_returns_pages_in_order(monkeypatch):
+    importer = DummyImporter(session=MagicMock(spec=AsyncSession))
+
+    async def fake_fetch_page(page: int):
+        # Later pages answer first, order must still follow page numbers
+        await asyncio.sleep(0.01 * (5 - page))
+        return {"count": 8, "results": [{"page": page}, {"page": page}]}
+
+    importer.fetch_page = fake_fetch_page
+
+    results = await importer.fetch_all()
+    assert [r["page"] for r in results] == [1, 1, 2, 2, 3, 3, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_respects_concurrency_limit(monkeypatch):
+    monkeypatch.setattr("core.services.swapi.base.FETCH_CONCURRENCY", 2)
+    importer = DummyImporter(session=MagicMock(spec=AsyncSession))
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch_page(page: int):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"count": 10, "results": [{"page": page}]}
+
+    importer.fetch_page = fake_fetch_page
+
+    results = await importer.fetch_all()
+    assert len(results) == 10
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_reuses_shared_client(monkeypatch):
+    response = MagicMock()
+    response.raise_for_status = MagicMock()
+    response.json = MagicMock(return_value={"count": 3, "results": [{"name": "A"}]})
+
+    shared_client = AsyncMock()
+    shared_client.get.return_value = response
+
+    client_factory = MagicMock()
+    monkeypatch.setattr("httpx.AsyncClient", client_factory)
+
+    importer = DummyImporter(session=MagicMock(spec=AsyncSession), client=shared_client)
+    results = await importer.fetch_all()
+
+    assert len(results) == 3
+    assert shared_client.get.await_count == 3
+    client_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_opens_single_client_when_none_shared(monkeypatch):
+    response = MagicMock()
+    response.raise_for_status = MagicMock()
+    response.json = MagicMock(return_value={"count": 3, "results": [{"name": "A"}]})
+
+    client_mock = AsyncMock()
+    client_mock.__aenter__.return_value = client_mock
+    client_mock.get.return_value = response
+
+    client_factory = MagicMock(return_value=client_mock)
+    monkeypatch.setattr("httpx.AsyncClient", client_factory)
+
+    importer = DummyImporter(session=MagicMock(spec=AsyncSession))
+    await importer.fetch_all()
+
+    client_factory.assert_called_once()
+    assert client_mock.get.await_count == 3
+    assert importer.client is None
+
+
+@pytest.mark.asyncio
+async def test_run_streaming_writes_while_pages_download(monkeypatch):
+    monkeypatch.setattr("core.services.swapi.batching.CHUNK_SIZE", 2)
+    monkeypatch.setattr("core.services.swapi.base.FETCH_CONCURRENCY", 1)
+    importer = DummyImporter(
+        session=MagicMock(spec=AsyncSession),
+        stream=True,
+        incremental=False,
+        resume=False,
+    )
+    events = []
+
+    async def fake_fetch_page(page: int):
+        await asyncio.sleep(0.01)
+        events.append(("fetch", page))
+        return {"count": 8, "results": [{"page": page}, {"page": page}]}
+
+    async def fake_write(objects):
+        events.append(("write", objects[0]["parsed"]["page"]))
+
+    importer.fetch_page = fake_fetch_page
+    importer.write = fake_write
+
+    await importer.run()
+
+    writes = [page for kind, page in events if kind == "write"]
+    assert writes == [1, 2, 3, 4]
+    # The first page was written before the last page was downloaded
+    assert events.index(("write", 1)) < events.index(("fetch", 4))
+
+
+@pytest.mark.asyncio
+async def test_run_streaming_propagates_fetch_errors(monkeypatch):
+    importer = DummyImporter(
+        session=MagicMock(spec=AsyncSession),
+        stream=True,
+        incremental=False,
+        resume=False,
+    )
+    importer.write = AsyncMock()
+
+    async def fake_fetch_page(page: int):
+        if page == 3:
+            raise RuntimeError("upstream down")
+        return {"count": 4, "results": [{"page": page}]}
+
+    importer.fetch_page = fake_fetch_page
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await importer.run()
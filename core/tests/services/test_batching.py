@@ -0,0 +1,101 @@
+import pytest
+from sqlmodel import select
+from core.models import Film
+from core.services.swapi import batching
+from core.services.swapi.batching import BatchSizer
+from core.services.swapi.films import FilmImporter
+from core.tests.services.utils import single_page
+
+
+def test_adaptive_size_follows_target_commit_time():
+    sizer = BatchSizer("adaptive", initial=100, target=0.25, max_size=1000)
+
+    sizer.observe(100, 0.05)  # 5x too fast, grows by at most 2x
+    assert sizer.size == 200
+    sizer.observe(200, 0.26)  # Close enough to the target
+    assert sizer.size == 200
+    sizer.observe(200, 0.5)  # Twice too slow
+    assert sizer.size == 100
+    for _ in range(10):
+        sizer.observe(sizer.size, 0.01)
+    assert sizer.size == 1000
+
+    assert sizer.snapshot() == {
+        "mode": "adaptive",
+        "initial": 100,
+        "last": 1000,
+        "min": 100,
+        "max": 1000,
+        "changes": 6,
+    }
+
+
+def test_adaptive_size_scales_from_short_batches():
+    sizer = BatchSizer("adaptive", initial=100, target=0.25, min_size=10)
+
+    # A short last batch that was slow per record still shrinks the size
+    sizer.observe(20, 0.5)
+    assert sizer.size == 50
+    sizer.observe(10, 5.0)
+    assert sizer.size == 25
+
+
+def test_fixed_and_single_sizes_never_change():
+    for mode in ("fixed", "single"):
+        sizer = BatchSizer(mode, initial=100)
+        sizer.observe(100, 0.001)
+        sizer.observe(100, 10.0)
+        assert sizer.size == 100
+    assert BatchSizer("fixed").commits_batches
+    assert not BatchSizer("single").commits_batches
+
+
+def test_unknown_batch_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported batch mode"):
+        BatchSizer("huge")
+
+
+def films(count: int) -> list[dict]:
+    return [{"title": f"Film {i}", "episode_id": i} for i in range(1, count + 1)]
+
+
+async def crash_on_third_batch(importer: FilmImporter) -> None:
+    write = importer.write
+
+    async def crashing_write(objects):
+        if importer.stats.batches_written == 2:
+            raise RuntimeError("Crashed")
+        await write(objects)
+
+    importer.write = crashing_write
+    with pytest.raises(RuntimeError, match="Crashed"):
+        await importer.run()
+    await importer.session.rollback()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode, kept", [("fixed", 4), ("single", 0)])
+async def test_single_mode_commits_all_or_nothing(session, monkeypatch, mode, kept):
+    monkeypatch.setattr(batching, "CHUNK_SIZE", 2)
+    importer = FilmImporter(session, batch_mode=mode, resume=False)
+    importer.fetch_page = single_page(films(6))
+
+    await crash_on_third_batch(importer)
+
+    result = await session.execute(select(Film))
+    assert len(result.scalars().all()) == kept
+
+
+@pytest.mark.asyncio
+async def test_run_reports_chosen_batch_sizes(session, monkeypatch):
+    monkeypatch.setattr(batching, "CHUNK_SIZE", 10)
+    importer = FilmImporter(session, batch_mode="single")
+    importer.fetch_page = single_page(films(25))
+
+    await importer.run()
+
+    result = await session.execute(select(Film))
+    assert len(result.scalars().all()) == 25
+    assert importer.stats.batches_written == 3
+    assert importer.stats.snapshot()["batch_sizes"]["mode"] == "single"
+    assert "single batches of 10->10" in importer.stats.summary()
@@ -0,0 +1,85 @@
+import json
+import httpx
+import pytest
+from unittest.mock import MagicMock
+from core.services.swapi import base
+from core.services.swapi.cache import CacheMiss, ResponseCache
+from core.services.swapi.films import FilmImporter
+
+PAGES = {
+    1: {"count": 2, "next": "?page=2", "results": [{"title": "A New Hope"}]},
+    2: {"count": 2, "next": None, "results": [{"title": "Return of the Jedi"}]},
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(base, "SWAPI_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def upstream_client(requests: list) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = int(request.url.params["page"])
+        return httpx.Response(
+            200, content=json.dumps(PAGES[page]).encode(), headers={"ETag": f'"{page}"'}
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def importer(cache_mode: str, client: httpx.AsyncClient | None = None):
+    return FilmImporter(
+        MagicMock(), client=client, incremental=False, cache_mode=cache_mode
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_pages_without_network(cache_dir, monkeypatch):
+    requests = []
+    async with upstream_client(requests) as client:
+        recorded = await importer("record", client).fetch_all()
+    assert len(requests) == 2
+
+    # No client at all: any network access would have to open one
+    monkeypatch.setattr(base, "create_client", MagicMock(side_effect=AssertionError))
+    replayed = await importer("replay").fetch_all()
+
+    assert replayed == recorded
+    assert [r["title"] for r in replayed] == ["A New Hope", "Return of the Jedi"]
+
+
+@pytest.mark.asyncio
+async def test_replay_raises_on_missing_page(cache_dir):
+    with pytest.raises(CacheMiss):
+        await importer("replay").fetch_page(1)
+
+
+@pytest.mark.asyncio
+async def test_live_mode_does_not_touch_the_cache(cache_dir):
+    async with upstream_client([]) as client:
+        await importer("live", client).fetch_all()
+
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_cache_keeps_headers_and_dedupes_bodies(tmp_path):
+    cache = ResponseCache(tmp_path)
+    body = json.dumps(PAGES[1]).encode()
+    response = httpx.Response(200, content=body, headers={"ETag": '"abc"'})
+
+    cache.store("https://swapi.dev/api/films/?page=1", response)
+    cache.store("https://swapi.dev/api/films/?page=1&format=json", response)
+
+    loaded = cache.load("https://swapi.dev/api/films/?page=1")
+    assert loaded.content == body
+    assert loaded.headers["ETag"] == '"abc"'
+    assert len(list((tmp_path / "objects").rglob("*.json.gz"))) == 1
+    assert len(list((tmp_path / "index").iterdir())) == 2
+    assert cache.load("https://swapi.dev/api/films/?page=2") is None
+
+
+def test_unsupported_cache_mode_raises():
+    with pytest.raises(ValueError):
+        importer("offline")
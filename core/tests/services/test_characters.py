@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from sqlalchemy.orm import selectinload
 from core.models import Character, Film, Starship
 from core.services.swapi.characters import CharacterImporter
+from core.tests.services.utils import single_page
 
 
 @pytest.mark.asyncio
@@ -87,9 +88,9 @@ async def test_parse_invalid_data(session):
 async def test_run_inserts_to_db(session):
     importer = CharacterImporter(session)
 
-    # Patch methods: fetch_all and parse
-    importer.fetch_all = AsyncMock(
-        return_value=[
+    # Patch methods: fetch_page and parse
+    importer.fetch_page = single_page(
+        [
             {"name": "Luke Skywalker", "gender": "male", "birth_year": "19BBY"},
             {"name": "Leia Organa", "gender": "female", "birth_year": "19BBY"},
         ]
@@ -109,8 +110,8 @@ async def test_run_inserts_to_db(session):
 async def test_run_skips_invalid_records(session):
     importer = CharacterImporter(session)
 
-    importer.fetch_all = AsyncMock(
-        return_value=[
+    importer.fetch_page = single_page(
+        [
             {"name": "Valid One", "gender": "n/a", "birth_year": "0BBY"},
             {"bad_field": True},  # Will fail parse()
         ]
@@ -129,38 +130,44 @@ async def test_run_skips_invalid_records(session):
 async def test_parse_valid_data_with_relations(session):
     importer = CharacterImporter(session)
 
-    # Simulate preloaded film and starship maps
-    importer.film_map = {1: Film(id=1, title="A New Hope")}
-    importer.starship_map = {5: Starship(id=5, name="X-Wing", model="T-65B")}
+    # Simulate preloaded swapi_id -> pk maps
+    importer.film_ids = {1: 10}
+    importer.starship_ids = {5: 50}
 
     raw = {
         "name": "Luke Skywalker",
         "gender": "male",
         "birth_year": "19BBY",
         "films": ["https://swapi.dev/api/films/1/"],
-        "starships": ["https://swapi.dev/api/starships/5/"],
+        "starships": [
+            "https://swapi.dev/api/starships/5/",
+            "https://swapi.dev/api/starships/99/",  # Not imported, dropped
+        ],
+        "url": "https://swapi.dev/api/people/1/",
     }
 
     character = await importer.parse(raw)
 
     assert character.name == "Luke Skywalker"
-    assert character.films[0].title == "A New Hope"
-    assert character.starships[0].name == "X-Wing"
+    assert character.swapi_id == 1
+    assert importer.pending_links == {"Luke Skywalker": ([10], [50])}
 
 
 @pytest.mark.asyncio
-async def test_run_inserts_with_relations(session):
-    film = Film(id=1, title="A New Hope", release_date="1977-05-25")
-    starship = Starship(id=5, name="X-Wing", model="T-65B")
+@pytest.mark.parametrize("write_mode", ["copy", "insert", "orm"])
+async def test_run_inserts_with_relations(session, write_mode):
+    # Primary keys deliberately differ from the SWAPI ids
+    film = Film(id=7, swapi_id=1, title="A New Hope", release_date="1977-05-25")
+    starship = Starship(id=8, swapi_id=5, name="X-Wing", model="T-65B")
 
     session.add_all([film, starship])
     await session.commit()
 
-    importer = CharacterImporter(session)
+    importer = CharacterImporter(session, write_mode=write_mode)
     await importer.prefetch_existing()
 
-    importer.fetch_all = AsyncMock(
-        return_value=[
+    importer.fetch_page = single_page(
+        [
             {
                 "name": "Luke Skywalker",
                 "gender": "male",
@@ -187,3 +194,33 @@ async def test_run_inserts_with_relations(session):
     assert luke.films[0].title == "A New Hope"
     assert len(luke.starships) == 1
     assert luke.starships[0].name == "X-Wing"
+    assert importer.pending_links == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write_mode", ["copy", "insert"])
+async def test_rerun_does_not_duplicate_characters_or_links(session, write_mode):
+    session.add(Film(swapi_id=1, title="A New Hope", release_date="1977-05-25"))
+    await session.commit()
+
+    records = [
+        {
+            "name": "Luke Skywalker",
+            "gender": "male",
+            "birth_year": "19BBY",
+            "films": ["https://swapi.dev/api/films/1/"],
+        }
+    ]
+
+    for _ in range(2):
+        importer = CharacterImporter(session, write_mode=write_mode)
+        importer.fetch_page = single_page(records)
+        await importer.run()
+
+    result = await session.execute(
+        select(Character).options(selectinload(Character.films))
+    )
+    characters = result.scalars().all()
+
+    assert len(characters) == 1
+    assert [film.title for film in characters[0].films] == ["A New Hope"]
@@ -0,0 +1,137 @@
+import json
+import pytest
+import httpx
+from unittest.mock import AsyncMock
+from sqlmodel import select
+from core.models import Film, ImportCheckpoint
+from core.services.swapi import batching
+from core.services.swapi.films import FilmImporter
+
+
+def film(swapi_id: int) -> dict:
+    return {
+        "title": f"Film {swapi_id}",
+        "episode_id": swapi_id,
+        "url": f"https://swapi.dev/api/films/{swapi_id}/",
+    }
+
+
+# Three pages of two films
+PAGES = {page: [film(2 * page - 1), film(2 * page)] for page in (1, 2, 3)}
+
+
+class Upstream:
+    """SWAPI stand-in serving `PAGES`."""
+
+    def __init__(self):
+        self.requested: list[int] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        self.requested.append(page)
+        return httpx.Response(
+            200, content=json.dumps({"count": 6, "results": PAGES[page]})
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.fixture(autouse=True)
+def fast_batches(monkeypatch):
+    monkeypatch.setattr(batching, "CHUNK_SIZE", 2)
+    monkeypatch.setattr(batching, "BATCH_MODE", "fixed")
+
+
+def parsed_titles(importer: FilmImporter) -> list[str]:
+    """Titles of the records handed to the importer's parse stage."""
+    return [
+        record["title"]
+        for call in importer.parse_batch.await_args_list
+        for record in call.args[0]
+    ]
+
+
+async def import_films(
+    session, upstream: Upstream, fail_batch: int | None = None, **kwargs
+) -> FilmImporter:
+    async with upstream.client() as client:
+        importer = FilmImporter(
+            session, client=client, stream=True, incremental=False, **kwargs
+        )
+        importer.parse_batch = AsyncMock(wraps=importer.parse_batch)
+        write = importer.write
+
+        async def crashing_write(objects):
+            if importer.stats.batches_written + 1 == fail_batch:
+                raise RuntimeError("Crashed")
+            await write(objects)
+
+        importer.write = crashing_write
+        await importer.run()
+    return importer
+
+
+async def crashed_import(session) -> None:
+    """An import that dies after committing the batches of pages 1 and 2."""
+    with pytest.raises(RuntimeError, match="Crashed"):
+        await import_films(session, Upstream(), fail_batch=3)
+    await session.rollback()
+
+
+async def film_titles(session) -> list[str]:
+    result = await session.execute(select(Film.title).order_by(Film.swapi_id))
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_failed_run_keeps_checkpoint_of_last_batch(session):
+    await crashed_import(session)
+
+    checkpoint = await session.get(ImportCheckpoint, "films")
+    assert (checkpoint.page, checkpoint.record) == (2, 4)
+    assert await film_titles(session) == [f"Film {i}" for i in range(1, 5)]
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_after_checkpoint(session):
+    await crashed_import(session)
+
+    upstream = Upstream()
+    importer = await import_films(session, upstream)
+
+    # Page 1 is only fetched to plan the run, page 2 to find the checkpoint
+    assert upstream.requested == [1, 2, 3]
+    parsed = parsed_titles(importer)
+    assert parsed == ["Film 5", "Film 6"]
+    assert importer.stats.resumed_from == {"page": 2, "record": 4}
+    assert await film_titles(session) == [f"Film {i}" for i in range(1, 7)]
+
+    session.expire_all()
+    assert await session.get(ImportCheckpoint, "films") is None
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_written_records_within_page(session):
+    session.add(ImportCheckpoint(resource="films", page=2, record=3))
+    await session.commit()
+
+    importer = await import_films(session, Upstream())
+
+    parsed = parsed_titles(importer)
+    assert parsed == ["Film 4", "Film 5", "Film 6"]
+
+
+@pytest.mark.asyncio
+async def test_resume_disabled_starts_over(session):
+    session.add(ImportCheckpoint(resource="films", page=3, record=6))
+    await session.commit()
+
+    upstream = Upstream()
+    await import_films(session, upstream, resume=False)
+
+    assert upstream.requested == [1, 2, 3]
+    assert len(await film_titles(session)) == 6
+    # Left for a later resumable run to decide about
+    session.expire_all()
+    assert await session.get(ImportCheckpoint, "films") is not None
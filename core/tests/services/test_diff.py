@@ -0,0 +1,197 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from core.models import Character, Film
+from core.services.swapi.characters import CharacterImporter
+from core.services.swapi.diff import content_hash
+from core.tests.services.utils import single_page
+
+
+def character(swapi_id: int, name: str, films: list[int], **fields) -> dict:
+    return {
+        "name": name,
+        "gender": "male",
+        "birth_year": "19BBY",
+        "films": [f"https://swapi.dev/api/films/{id_}/" for id_ in films],
+        "url": f"https://swapi.dev/api/people/{swapi_id}/",
+        **fields,
+    }
+
+
+@pytest_asyncio.fixture
+async def films(session):
+    for swapi_id in (1, 2, 3):
+        session.add(Film(swapi_id=swapi_id, title=f"Film {swapi_id}"))
+    await session.commit()
+
+
+async def run(session, records: list[dict], **kwargs) -> CharacterImporter:
+    importer = CharacterImporter(session, **kwargs)
+    importer.fetch_page = single_page(records)
+    await importer.run()
+    return importer
+
+
+async def stored(session) -> dict[str, tuple[str, list[int]]]:
+    session.expire_all()
+    result = await session.execute(
+        select(Character).options(selectinload(Character.films))
+    )
+    return {
+        c.name: (c.birth_year, sorted(f.swapi_id for f in c.films))
+        for c in result.scalars().all()
+    }
+
+
+def test_content_hash_ignores_key_order_and_id():
+    row = {"name": "Luke", "birth_year": "19BBY", "swapi_id": 1}
+
+    assert content_hash(row) == content_hash({"id": 5, **dict(reversed(row.items()))})
+    assert content_hash(row) != content_hash({**row, "birth_year": "20BBY"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write_mode", ["copy", "insert"])
+async def test_reimport_writes_only_changes(session, films, write_mode):
+    await run(
+        session,
+        [
+            character(1, "Luke", [1, 2]),
+            character(2, "Leia", [1]),
+            character(3, "Han", []),
+        ],
+        write_mode=write_mode,
+    )
+
+    importer = await run(
+        session,
+        [
+            character(1, "Luke", [1, 3]),  # Film 2 replaced by film 3
+            character(2, "Leia", [1], birth_year="20BBY"),
+            character(3, "Han", []),
+            character(4, "Chewbacca", [2]),
+        ],
+        write_mode=write_mode,
+    )
+
+    assert await stored(session) == {
+        "Luke": ("19BBY", [1, 3]),
+        "Leia": ("20BBY", [1]),
+        "Han": ("19BBY", []),
+        "Chewbacca": ("19BBY", [2]),
+    }
+    assert importer.changes.examples == {
+        "inserts": ["Chewbacca"],
+        "updates": ["Luke", "Leia"],
+    }
+    assert importer.stats.changes == {
+        "dry_run": False,
+        "inserts": 1,
+        "updates": 2,
+        "unchanged": 1,
+        "links_added": 2,
+        "links_removed": 1,
+    }
+    assert importer.stats.rows_inserted == 3
+    assert importer.pending_links == {}
+
+
+@pytest.mark.asyncio
+async def test_link_to_a_later_imported_record_is_added(session, films):
+    records = [character(1, "Luke", [1, 4])]
+    await run(session, records)
+    assert await stored(session) == {"Luke": ("19BBY", [1])}
+
+    session.add(Film(swapi_id=4, title="Film 4"))
+    await session.commit()
+    importer = await run(session, records)
+
+    assert await stored(session) == {"Luke": ("19BBY", [1, 4])}
+    assert importer.stats.changes["updates"] == 1
+    assert importer.stats.changes["links_added"] == 1
+
+    importer = await run(session, records)
+    assert importer.stats.changes["unchanged"] == 1
+
+
+def test_rows_with_staged_links_have_no_hash():
+    importer = CharacterImporter(None, link_run="run")
+    raw = character(1, "Luke", [1])
+
+    assert importer.to_row(raw, importer.prepare(raw))["content_hash"] is None
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_changes_without_writing(session, films):
+    await run(session, [character(1, "Luke", [1, 2])])
+    before = await stored(session)
+
+    importer = await run(
+        session,
+        [character(1, "Luke", [1], birth_year="20BBY"), character(2, "Leia", [1, 3])],
+        dry_run=True,
+    )
+
+    assert await stored(session) == before
+    assert importer.stats.changes == {
+        "dry_run": True,
+        "inserts": 1,
+        "updates": 1,
+        "unchanged": 0,
+        "links_added": 2,
+        "links_removed": 1,
+        "keys": {
+            "inserts": ["Leia"],
+            "updates": ["Luke"],
+            "relinked": ["Leia", "Luke"],
+        },
+    }
+    assert importer.changes.summary() == (
+        "[people] would write 1 new ('Leia'), 1 changed ('Luke'), 0 unchanged, "
+        "links +2 -1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_dry_run_lists_every_key(session, films):
+    records = [character(i, f"Character {i}", [1]) for i in range(1, 9)]
+
+    importer = await run(session, records, dry_run=True)
+
+    assert len(importer.changes.examples["inserts"]) == 5
+    assert importer.stats.changes["keys"]["inserts"] == [
+        f"Character {i}" for i in range(1, 9)
+    ]
+    assert "+3 more" in importer.changes.summary()
+
+
+@pytest.mark.asyncio
+async def test_a_key_twice_in_a_batch_counts_once(session, films):
+    importer = await run(
+        session,
+        [
+            character(1, "Luke", [1]),
+            character(1, "Luke", [2], birth_year="20BBY"),
+        ],
+    )
+
+    assert await stored(session) == {"Luke": ("20BBY", [2])}
+    assert importer.stats.changes["inserts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_without_diff_existing_rows_are_kept(session, films):
+    await run(session, [character(1, "Luke", [1])])
+
+    importer = await run(
+        session, [character(1, "Luke", [1, 2], birth_year="20BBY")], diff=False
+    )
+
+    assert await stored(session) == {"Luke": ("19BBY", [1, 2])}
+    assert importer.changes is None
+
+
+def test_dry_run_needs_a_bulk_write_mode():
+    with pytest.raises(ValueError, match="Dry runs"):
+        CharacterImporter(None, write_mode="orm", dry_run=True)
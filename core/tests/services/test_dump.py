@@ -0,0 +1,90 @@
+import io
+import json
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from core.models import Character, CharacterFilmLink, Film, Starship
+from core.services.swapi import CharacterImporter, FilmImporter, StarshipImporter
+from core.services.swapi import dump
+from core.services.swapi.dump import DumpReader, iter_json_array, write_dump
+from core.services.swapi.fake import FakeSwapi
+from core.services.swapi.scheduler import ImportScheduler
+
+
+def test_json_array_is_decoded_across_reads(monkeypatch):
+    monkeypatch.setattr(dump, "READ_SIZE", 7)
+    records = [
+        {"name": "Luke", "films": [1, 2]},
+        {"name": "Tricky ] , [ name", "nested": {"a": [{"b": None}]}},
+        {},
+    ]
+    text = " [\n" + ",\n  ".join(json.dumps(r) for r in records) + "\n] "
+
+    assert list(iter_json_array(io.StringIO(text))) == records
+    assert list(iter_json_array(io.StringIO("[]"))) == []
+    with pytest.raises(ValueError, match="array"):
+        list(iter_json_array(io.StringIO('{"results": []}')))
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"name": "Lu')))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["films.ndjson.gz", "films.jsonl", "films.json"])
+async def test_reader_pages_through_dump(tmp_path, name):
+    records = [{"title": f"Film {i}", "episode_id": i} for i in range(1, 8)]
+    path = tmp_path / name
+    if name.endswith(".json"):
+        path.write_text(json.dumps(records, indent=2))
+    else:
+        write_dump(path, records)
+
+    reader = DumpReader(tmp_path, "films", page_size=3)
+
+    pages = [(page, batch) async for page, batch in reader.iter_pages()]
+    assert [page for page, _ in pages] == [1, 2, 3]
+    assert [r for _, batch in pages for r in batch] == records
+    shard = [page async for page, _ in reader.iter_pages(2, 2)]
+    assert shard == [2]
+    assert await reader.page(3) == {"count": 7, "results": records[6:]}
+
+
+def test_missing_dump_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No people dump"):
+        CharacterImporter(None, source="dump", dump_dir=tmp_path)
+    with pytest.raises(ValueError, match="Unsupported import source"):
+        CharacterImporter(None, source="ftp")
+
+
+@pytest.mark.asyncio
+async def test_seed_from_dump(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(dump, "DUMP_PAGE_SIZE", 20)
+    fake = FakeSwapi(people=75, films=6, starships=12, links=2)
+    for resource, count in fake.sizes.items():
+        write_dump(
+            tmp_path / f"{resource}.ndjson",
+            (
+                fake.record(resource, i, "https://swapi.dev/api")
+                for i in range(1, count + 1)
+            ),
+        )
+
+    stats = {}
+    await ImportScheduler(
+        [FilmImporter, StarshipImporter, CharacterImporter],
+        session_factory=async_sessionmaker(
+            session.bind, class_=AsyncSession, expire_on_commit=False
+        ),
+        stats=stats,
+        source="dump",
+        dump_dir=tmp_path,
+    ).run()
+
+    async def count(model) -> int:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+    assert await count(Film) == 6
+    assert await count(Starship) == 12
+    assert await count(Character) == 75
+    assert await count(CharacterFilmLink) == 75 * 2
+    assert stats["people"].pages_fetched == 4
+    assert stats["people"].records_written == 75
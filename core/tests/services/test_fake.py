@@ -0,0 +1,87 @@
+import pytest
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from core.models import Character, CharacterFilmLink, Film, Starship
+from core.services.swapi import CharacterImporter, FilmImporter, StarshipImporter
+from core.services.swapi import base, throttle
+from core.services.swapi.fake import FakeSwapi
+from core.services.swapi.scheduler import ImportScheduler
+from core.services.swapi.throttle import RateLimiter, Throttle
+
+
+def fake_client(fake: FakeSwapi) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake.app), base_url="https://swapi.dev"
+    )
+
+
+async def count(session, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_pages_have_swapi_shape():
+    fake = FakeSwapi(people=25)
+
+    async with fake_client(fake) as client:
+        first = (await client.get("/api/people/?page=1")).json()
+        last = (await client.get("/api/people/?page=3")).json()
+        missing = await client.get("/api/people/?page=4")
+
+    assert first["count"] == 25 and len(first["results"]) == 10
+    assert first["next"] == "https://swapi.dev/api/people/?page=2"
+    assert first["previous"] is None
+    assert [r["url"] for r in last["results"]][-1] == (
+        "https://swapi.dev/api/people/25/"
+    )
+    assert last["next"] is None
+    assert missing.status_code == 404
+    assert fake.requests == {200: 2, 404: 1}
+
+
+@pytest.mark.asyncio
+async def test_injects_throttling_and_errors():
+    fake = FakeSwapi(throttle_rate=0.5, error_rate=0.5, retry_after=2)
+
+    async with fake_client(fake) as client:
+        responses = [await client.get("/api/films/") for _ in range(20)]
+
+    throttled = [r for r in responses if r.status_code == 429]
+    assert throttled and all(r.headers["Retry-After"] == "2" for r in throttled)
+    assert {r.status_code for r in responses} == {429, 500}
+
+
+@pytest.mark.asyncio
+async def test_full_import_against_fake(session, monkeypatch):
+    monkeypatch.setattr(base, "MAX_RETRIES", 5)
+    monkeypatch.setattr(throttle, "BACKOFF_BASE", 0.001)
+    fake = FakeSwapi(
+        people=45,
+        films=6,
+        starships=12,
+        links=2,
+        throttle_rate=0.1,
+        error_rate=0.1,
+        retry_after=0.01,
+    )
+    shared = Throttle(RateLimiter(rate=200, max_rate=200, burst=20))
+
+    async with fake_client(fake) as client:
+        await ImportScheduler(
+            [FilmImporter, StarshipImporter, CharacterImporter],
+            session_factory=async_sessionmaker(
+                session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            client=client,
+            throttle=shared,
+            stream=True,
+        ).run()
+
+    assert await count(session, Film) == 6
+    assert await count(session, Starship) == 12
+    assert await count(session, Character) == 45
+    assert await count(session, CharacterFilmLink) == 45 * 2
+    # 5 + 1 + 2 pages, every injected fault was retried
+    assert fake.requests[200] == 8
+    assert fake.total_requests == 8 + shared.retries
@@ -1,9 +1,9 @@
 import pytest
-from unittest.mock import AsyncMock
 from sqlmodel import select
 
 from core.models import Film
 from core.services.swapi.films import FilmImporter
+from core.tests.services.utils import single_page
 
 
 @pytest.mark.asyncio
@@ -36,8 +36,8 @@ async def test_parse_invalid_film(session):
 async def test_run_inserts_films(session):
     importer = FilmImporter(session)
 
-    importer.fetch_all = AsyncMock(
-        return_value=[
+    importer.fetch_page = single_page(
+        [
             {
                 "title": "A New Hope",
                 "episode_id": 1,
@@ -67,7 +67,8 @@ async def test_run_inserts_films(session):
 
 
 @pytest.mark.asyncio
-async def test_run_skips_duplicates(session):
+@pytest.mark.parametrize("write_mode", ["copy", "insert", "orm"])
+async def test_run_skips_duplicates(session, write_mode):
     # Pre-insert a film
     session.add(
         Film(
@@ -80,9 +81,9 @@ async def test_run_skips_duplicates(session):
     )
     await session.commit()
 
-    importer = FilmImporter(session)
-    importer.fetch_all = AsyncMock(
-        return_value=[
+    importer = FilmImporter(session, write_mode=write_mode)
+    importer.fetch_page = single_page(
+        [
             {
                 "title": "A New Hope",
                 "episode_id": 1,
@@ -99,3 +100,49 @@ async def test_run_skips_duplicates(session):
 
     # Still 1 film in DB
     assert len(films) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_streaming_inserts_films(session):
+    importer = FilmImporter(session, stream=True)
+
+    pages = {
+        1: [{"title": "A New Hope", "episode_id": 4}],
+        2: [{"title": "The Empire Strikes Back", "episode_id": 5}],
+    }
+
+    async def fake_fetch_page(page: int):
+        return {"count": 2, "results": pages[page]}
+
+    importer.fetch_page = fake_fetch_page
+
+    await importer.run()
+
+    result = await session.execute(select(Film))
+    titles = {f.title for f in result.scalars().all()}
+    assert titles == {"A New Hope", "The Empire Strikes Back"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write_mode", ["copy", "insert"])
+async def test_rerun_backfills_swapi_id(session, write_mode):
+    # Imported before films kept their SWAPI id
+    session.add(Film(title="A New Hope", episode_id=4))
+    await session.commit()
+
+    importer = FilmImporter(session, write_mode=write_mode)
+    importer.fetch_page = single_page(
+        [
+            {
+                "title": "A New Hope",
+                "episode_id": 4,
+                "url": "https://swapi.dev/api/films/1/",
+            }
+        ]
+    )
+    await importer.run()
+
+    session.expire_all()
+    result = await session.execute(select(Film))
+    films = result.scalars().all()
+    assert [(f.title, f.swapi_id) for f in films] == [("A New Hope", 1)]
@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import pytest
+from unittest.mock import MagicMock
+from core.services.swapi.scheduler import ImportScheduler
+from core.services.swapi.stats import ImporterStats
+
+events: list[tuple[str, str]] = []
+instances: list["FakeImporter"] = []
+
+
+class FakeImporter:
+    depends_on = ()
+    resource = "fake"
+    delay = 0.0
+    error: Exception | None = None
+
+    def __init__(self, session, client=None, throttle=None, **kwargs):
+        self.session = session
+        self.throttle = throttle
+        self.stats = ImporterStats(self.resource)
+        instances.append(self)
+
+    async def run(self):
+        events.append(("start", self.resource))
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        events.append(("end", self.resource))
+
+
+class Films(FakeImporter):
+    resource = "films"
+    delay = 0.03
+
+
+class Starships(FakeImporter):
+    resource = "starships"
+    delay = 0.01
+
+
+class Characters(FakeImporter):
+    resource = "people"
+    depends_on = (Films, Starships)
+
+
+@pytest.fixture(autouse=True)
+def clear_events():
+    events.clear()
+    instances.clear()
+
+
+def session_factory():
+    sessions = []
+
+    @contextlib.asynccontextmanager
+    async def factory():
+        session = MagicMock()
+        sessions.append(session)
+        yield session
+
+    return factory, sessions
+
+
+@pytest.mark.asyncio
+async def test_independent_importers_run_concurrently():
+    factory, sessions = session_factory()
+
+    stats = {}
+    timings = await ImportScheduler(
+        [Films, Starships, Characters], factory, stats=stats
+    ).run()
+
+    # Starships start before films finished, characters only after both
+    assert events.index(("start", "starships")) < events.index(("end", "films"))
+    assert events.index(("start", "people")) > events.index(("end", "films"))
+    assert events.index(("start", "people")) > events.index(("end", "starships"))
+    assert set(timings) == {"films", "starships", "people"}
+    assert {resource: s.resource for resource, s in stats.items()} == {
+        "films": "films",
+        "starships": "starships",
+        "people": "people",
+    }
+    # Every importer gets its own session
+    assert len({id(session) for session in sessions}) == 3
+    # ...but all of them share the upstream throttle
+    assert len({id(importer.throttle) for importer in instances}) == 1
+    assert instances[0].throttle is not None
+
+
+@pytest.mark.asyncio
+async def test_dependents_are_skipped_when_a_dependency_fails():
+    class BrokenStarships(Starships):
+        error = RuntimeError("Boom")
+
+    class DependentCharacters(Characters):
+        depends_on = (Films, BrokenStarships)
+
+    factory, _ = session_factory()
+    scheduler = ImportScheduler([Films, BrokenStarships, DependentCharacters], factory)
+
+    with pytest.raises(RuntimeError, match="Boom"):
+        await scheduler.run()
+
+    # Films still finished, characters never started
+    assert ("end", "films") in events
+    assert ("start", "people") not in events
+
+
+def test_unscheduled_dependency_raises():
+    factory, _ = session_factory()
+    with pytest.raises(ValueError, match="not scheduled"):
+        ImportScheduler([Characters], factory)
+
+
+def test_dependency_cycle_raises():
+    class A(FakeImporter):
+        pass
+
+    class B(FakeImporter):
+        depends_on = (A,)
+
+    A.depends_on = (B,)
+
+    factory, _ = session_factory()
+    with pytest.raises(ValueError, match="cycle"):
+        ImportScheduler([A, B], factory)
@@ -0,0 +1,225 @@
+import asyncio
+import multiprocessing
+import pytest
+import httpx
+import uvicorn
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from core.models import (
+    Character,
+    CharacterFilmLink,
+    CharacterStarshipLink,
+    Film,
+    ImportShard,
+    StagedLink,
+    Starship,
+)
+from core.services.swapi import CharacterImporter, FilmImporter, StarshipImporter
+from core.services.swapi.fake import FakeSwapi
+from core.services.swapi.sharding import ShardQueue, ShardedImport
+from core.services.swapi.throttle import RateLimiter, Throttle
+from core.tests.services.utils import single_page
+
+IMPORTERS = [FilmImporter, StarshipImporter, CharacterImporter]
+
+
+def session_factory(session) -> async_sessionmaker:
+    return async_sessionmaker(session.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+def fake_client(fake: FakeSwapi) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake.app), base_url="https://swapi.dev"
+    )
+
+
+async def count(session, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_claims_never_overlap(session):
+    factory = session_factory(session)
+    async with factory() as planner:
+        assert await ShardQueue(planner, "run").plan("people", 9, 4) == 3
+
+    async with factory() as first, factory() as second:
+        # The first claim holds its row lock until the transaction ends
+        await first.begin()
+        locked = await first.execute(
+            select(ImportShard).order_by(ImportShard.id).limit(1).with_for_update()
+        )
+        locked_id = locked.scalar_one().id
+        shard = await ShardQueue(second, "run").claim("worker")
+
+    assert shard.id != locked_id
+    assert (shard.first_page, shard.last_page) == (5, 8)
+    assert shard.status == "running" and shard.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_importer_fetches_only_its_pages(session):
+    importer = FilmImporter(session, pages=(3, 4), resume=True, incremental=True)
+    importer.fetch_page = single_page([{"title": "A New Hope", "episode_id": 4}])
+
+    pages = [page async for page, _ in importer.iter_numbered_pages(3, 4)]
+
+    assert pages == [3, 4]
+    assert [call.args[0] for call in importer.fetch_page.await_args_list] == [3, 4]
+    # Shards keep no sync state or checkpoints
+    assert not importer.incremental and not importer.resume
+
+
+@pytest.mark.asyncio
+async def test_sharded_import_merges_links(session):
+    fake = FakeSwapi(people=45, films=6, starships=12, links=2)
+
+    async with fake_client(fake) as client:
+        summary = await ShardedImport(
+            IMPORTERS,
+            session_factory=session_factory(session),
+            workers=3,
+            shard_pages=2,
+            processes=False,
+            client=client,
+            throttle=Throttle(RateLimiter(rate=500, max_rate=500, burst=50)),
+        ).run()
+
+    assert await count(session, Film) == 6
+    assert await count(session, Starship) == 12
+    assert await count(session, Character) == 45
+    assert await count(session, CharacterFilmLink) == 45 * 2
+    assert await count(session, CharacterStarshipLink) == 45 * 2
+    assert summary["link_rows"] == 45 * 4
+    # 1 + 2 + 3 shards of up to 2 pages
+    assert {r: totals["shards"] for r, totals in summary["resources"].items()} == {
+        "films": 1,
+        "starships": 1,
+        "people": 3,
+    }
+    assert summary["resources"]["people"]["rows_inserted"] == 45
+    assert summary["workers"] > 1
+    # The run's shards and staged links are gone once it finished
+    assert await count(session, ImportShard) == 0
+    assert await count(session, StagedLink) == 0
+
+
+@pytest.mark.asyncio
+async def test_merge_replaces_the_links_of_imported_characters(session):
+    fake = FakeSwapi(people=10, films=6, starships=0, links=1)
+    async with fake_client(fake) as client:
+        sharded_import = ShardedImport(
+            [FilmImporter, CharacterImporter],
+            session_factory=session_factory(session),
+            processes=False,
+            client=client,
+        )
+        await sharded_import.run()
+        # Links the upstream no longer has
+        character = await session.scalar(
+            select(Character.id).where(Character.swapi_id == 1)
+        )
+        films = (await session.execute(select(Film.id))).scalars().all()
+        await session.execute(
+            insert(CharacterFilmLink).on_conflict_do_nothing(),
+            [{"character_id": character, "film_id": film} for film in films],
+        )
+        await session.commit()
+        assert await count(session, CharacterFilmLink) == 10 + 5
+
+        summary = await sharded_import.run()
+
+    assert await count(session, CharacterFilmLink) == 10
+    assert summary["link_rows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_shards_are_retried(session, monkeypatch):
+    fake = FakeSwapi(people=30, films=6, starships=0, links=1)
+    run = FilmImporter.run
+    calls = []
+
+    async def flaky_run(self):
+        calls.append(self.pages)
+        if len(calls) == 1:
+            raise RuntimeError("Upstream went away")
+        await run(self)
+
+    monkeypatch.setattr(FilmImporter, "run", flaky_run)
+
+    async with fake_client(fake) as client:
+        summary = await ShardedImport(
+            [FilmImporter, CharacterImporter],
+            session_factory=session_factory(session),
+            workers=2,
+            processes=False,
+            client=client,
+        ).run()
+
+    assert calls == [(1, 1), (1, 1)]
+    assert await count(session, CharacterFilmLink) == 30
+    assert summary["resources"]["films"]["attempts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shards_failing_every_attempt_fail_the_run(session, monkeypatch):
+    fake = FakeSwapi(people=10, films=6, starships=0, links=1)
+
+    async def failing_run(self):
+        raise RuntimeError("Upstream went away")
+
+    monkeypatch.setattr(FilmImporter, "run", failing_run)
+
+    async with fake_client(fake) as client:
+        with pytest.raises(RuntimeError, match="1 of 2 shards"):
+            await ShardedImport(
+                [FilmImporter, CharacterImporter],
+                session_factory=session_factory(session),
+                processes=False,
+                client=client,
+            ).run()
+
+    # Characters were imported, their links had nothing to resolve to
+    assert await count(session, Character) == 10
+    assert await count(session, CharacterFilmLink) == 0
+    assert await count(session, ImportShard) == 0
+    assert await count(session, StagedLink) == 0
+
+
+def serve(port: int) -> None:
+    fake = FakeSwapi(people=60, films=6, starships=12, links=2, latency=0.1)
+    uvicorn.run(fake.app, port=port, log_level="warning")
+
+
+@pytest.mark.asyncio
+async def test_sharded_import_in_worker_processes(session, unused_tcp_port):
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(unused_tcp_port,), daemon=True
+    )
+    server.start()
+    base_url = f"http://127.0.0.1:{unused_tcp_port}/api"
+    try:
+        async with httpx.AsyncClient() as client:
+            for _ in range(100):
+                try:
+                    await client.get(f"{base_url}/films/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+
+        summary = await ShardedImport(
+            IMPORTERS,
+            session_factory=session_factory(session),
+            workers=2,
+            shard_pages=1,
+            throttle=Throttle(RateLimiter(rate=500, max_rate=500, burst=50)),
+            base_url=base_url,
+        ).run()
+    finally:
+        server.terminate()
+        server.join()
+
+    assert await count(session, Character) == 60
+    assert await count(session, CharacterFilmLink) == 60 * 2
+    assert summary["workers"] == 2
@@ -1,9 +1,9 @@
 import pytest
-from unittest.mock import AsyncMock
 from sqlmodel import select
 
 from core.models import Starship
 from core.services.swapi.starships import StarshipImporter
+from core.tests.services.utils import single_page
 
 
 @pytest.mark.asyncio
@@ -36,8 +36,8 @@ async def test_parse_invalid_starship(session):
 async def test_run_inserts_starships(session):
     importer = StarshipImporter(session)
 
-    importer.fetch_all = AsyncMock(
-        return_value=[
+    importer.fetch_page = single_page(
+        [
             {
                 "name": "Millennium Falcon",
                 "model": "YT-1300 light freighter",
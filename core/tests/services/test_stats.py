@@ -0,0 +1,71 @@
+import json
+import httpx
+import pytest
+from sqlalchemy import select
+from core.models import Film
+from core.services.swapi.films import FilmImporter
+from core.services.swapi.stats import ImporterStats, LatencyHistogram
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    for ms in (5, 5, 20, 40, 3000):
+        histogram.observe(ms / 1000)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["buckets"] == {"<=10ms": 2, "<=25ms": 1, "<=50ms": 1, "<=5000ms": 1}
+    assert snapshot["p50_ms"] == 25.0
+    assert snapshot["p95_ms"] == 5000.0
+    assert snapshot["max_ms"] == 3000.0
+    assert LatencyHistogram().snapshot()["p50_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_run_records_stats(session):
+    body = json.dumps(
+        {
+            "count": 3,
+            "results": [
+                {"title": "A New Hope", "episode_id": 4},
+                {"title": "The Empire Strikes Back", "episode_id": 5},
+                {"episode_id": 6},  # No title, rejected
+            ],
+        }
+    ).encode()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        importer = FilmImporter(session, client=client, incremental=False)
+        await importer.run()
+
+    stats = importer.stats.snapshot()
+    assert stats["status"] == "succeeded"
+    assert stats["pages_fetched"] == 1
+    assert stats["bytes_fetched"] == len(body)
+    assert stats["fetch_latency"]["count"] == 1
+    assert stats["records_parsed"] == 2
+    assert stats["records_rejected"] == 1
+    assert stats["rows_inserted"] == 2
+    assert stats["batches_written"] == 1
+    assert stats["batch_commit_latency"]["count"] == 1
+    assert set(stats["timings_s"]) == {"fetch", "parse", "write"}
+    assert stats["peak_rss_bytes"] > 0
+    assert "[films] succeeded" in importer.stats.summary()
+
+    # Existing rows aren't counted again on a rerun
+    async with httpx.AsyncClient(transport=transport) as client:
+        rerun = FilmImporter(session, client=client, incremental=False)
+        await rerun.run()
+    assert rerun.stats.rows_inserted == 0
+    assert len((await session.execute(select(Film))).all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_reported():
+    stats = ImporterStats("people")
+    stats.start()
+    stats.finish("failed")
+
+    assert stats.snapshot()["status"] == "failed"
+    assert stats.summary().startswith("[people] failed in")
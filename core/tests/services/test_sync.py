@@ -0,0 +1,242 @@
+import json
+import pytest
+from sqlalchemy import event
+import httpx
+from unittest.mock import AsyncMock
+from sqlmodel import select
+from sqlalchemy.orm import selectinload
+from core.models import Character, Film, SyncState
+from core.services.swapi.characters import CharacterImporter
+from core.services.swapi.films import FilmImporter
+
+
+def film(title: str, edited: str) -> dict:
+    return {"title": title, "episode_id": 1, "edited": edited}
+
+
+class Upstream:
+    """SWAPI stand-in serving `films` pages, optionally with ETags."""
+
+    def __init__(self, pages: dict[int, list[dict]], etags: bool = True):
+        self.pages = pages
+        self.etags = etags
+        self.requests: list[httpx.Request] = []
+
+    def body(self, page: int) -> bytes:
+        count = sum(len(results) for results in self.pages.values())
+        return json.dumps({"count": count, "results": self.pages[page]}).encode()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        page = int(request.url.params["page"])
+        body = self.body(page)
+        etag = f'"{hash(body)}"'
+        if self.etags and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        headers = {"ETag": etag} if self.etags else {}
+        return httpx.Response(200, content=body, headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def parsed_titles(importer: FilmImporter) -> list[str]:
+    """Titles of the records handed to the importer's parse stage."""
+    return [
+        record["title"]
+        for call in importer.parse_batch.await_args_list
+        for record in call.args[0]
+    ]
+
+
+async def import_films(session, upstream: Upstream) -> FilmImporter:
+    async with upstream.client() as client:
+        importer = FilmImporter(session, client=client, incremental=True)
+        importer.parse_batch = AsyncMock(wraps=importer.parse_batch)
+        await importer.run()
+    return importer
+
+
+@pytest.mark.asyncio
+async def test_first_run_saves_sync_state(session):
+    upstream = Upstream(
+        {
+            1: [film("A New Hope", "2014-12-20T19:49:45.256000Z")],
+            2: [film("Return of the Jedi", "2014-12-20T19:49:45.256000Z")],
+        }
+    )
+
+    await import_films(session, upstream)
+
+    result = await session.execute(select(SyncState).order_by(SyncState.page))
+    states = result.scalars().all()
+    assert [(s.resource, s.page) for s in states] == [("films", 1), ("films", 2)]
+    assert all(s.etag and s.content_hash for s in states)
+    assert states[0].count == 2 and states[0].record_count == 1
+
+
+@pytest.mark.asyncio
+async def test_not_modified_pages_are_skipped(session):
+    upstream = Upstream(
+        {
+            1: [film("A New Hope", "2014-12-20T19:49:45.256000Z")],
+            2: [film("Return of the Jedi", "2014-12-20T19:49:45.256000Z")],
+        }
+    )
+    await import_films(session, upstream)
+    upstream.requests.clear()
+
+    importer = await import_films(session, upstream)
+
+    assert all("If-None-Match" in r.headers for r in upstream.requests)
+    assert len(upstream.requests) == 2
+    assert parsed_titles(importer) == []
+
+
+@pytest.mark.asyncio
+async def test_pages_with_unchanged_content_are_skipped(session):
+    upstream = Upstream(
+        {1: [film("A New Hope", "2014-12-20T19:49:45.256000Z")]}, etags=False
+    )
+    await import_films(session, upstream)
+
+    importer = await import_films(session, upstream)
+
+    assert parsed_titles(importer) == []
+
+
+@pytest.mark.asyncio
+async def test_only_records_edited_since_last_run_are_parsed(session):
+    upstream = Upstream(
+        {
+            1: [
+                film("A New Hope", "2014-12-20T19:49:45.256000Z"),
+                film("Return of the Jedi", "2014-12-20T19:49:45.256000Z"),
+            ]
+        }
+    )
+    await import_films(session, upstream)
+
+    upstream.pages[1][1] = film("Return of the Jedi", "2015-01-01T10:00:00.000000Z")
+    upstream.pages[1].append(film("The Phantom Menace", "2015-01-01T10:00:00.000000Z"))
+    importer = await import_films(session, upstream)
+
+    parsed = parsed_titles(importer)
+    assert parsed == ["Return of the Jedi", "The Phantom Menace"]
+
+    result = await session.execute(select(Film.title))
+    assert len(result.scalars().all()) == 3
+
+
+@pytest.mark.asyncio
+async def test_records_never_stored_are_parsed_despite_old_edits(session):
+    old = "2014-12-20T19:49:45.256000Z"
+    upstream = Upstream(
+        {
+            1: [film("A New Hope", "2015-01-01T10:00:00.000000Z")],
+            2: [{**film("Attack of the Clones", old), "episode_id": "two"}],
+        }
+    )
+    await import_films(session, upstream)
+
+    # Gains a record edited before anything seen on it so far
+    upstream.pages[1].append(film("The Phantom Menace", old))
+    # Rejected last time, the page changes for another record
+    upstream.pages[2] = [
+        film("Attack of the Clones", old),
+        film("Revenge of the Sith", old),
+    ]
+    importer = await import_films(session, upstream)
+
+    assert parsed_titles(importer) == [
+        "The Phantom Menace",
+        "Attack of the Clones",
+        "Revenge of the Sith",
+    ]
+    result = await session.execute(select(Film.title))
+    assert len(result.scalars().all()) == 4
+
+
+@pytest.mark.asyncio
+async def test_only_the_page_keys_are_looked_up(session):
+    old = "2014-12-20T19:49:45.256000Z"
+    session.add_all(Film(title=f"Stored {i}") for i in range(20))
+    await session.commit()
+    upstream = Upstream({1: [film("A New Hope", old)]})
+    await import_films(session, upstream)
+
+    lookups = []
+
+    def record(conn, cursor, statement, parameters, *args):
+        if statement.startswith("SELECT film.title"):
+            lookups.append((statement, parameters))
+
+    upstream.pages[1].append(film("Return of the Jedi", old))
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        importer = await import_films(session, upstream)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert parsed_titles(importer) == ["Return of the Jedi"]
+    page_keys = {"A New Hope", "Return of the Jedi"}
+    assert lookups
+    for statement, keys in lookups:
+        assert "WHERE" in statement and set(keys) <= page_keys
+
+
+@pytest.mark.asyncio
+async def test_links_to_records_imported_later_are_added(session):
+    session.add(Film(title="A New Hope", swapi_id=1))
+    await session.commit()
+    upstream = Upstream(
+        {
+            1: [
+                {
+                    "name": "Luke",
+                    "films": [f"https://swapi.dev/api/films/{id_}/" for id_ in (1, 2)],
+                    "edited": "2014-12-20T19:49:45.256000Z",
+                    "url": "https://swapi.dev/api/people/1/",
+                }
+            ]
+        }
+    )
+
+    async def import_people() -> None:
+        async with upstream.client() as client:
+            await CharacterImporter(session, client=client, incremental=True).run()
+
+    async def films() -> list[str]:
+        session.expire_all()
+        luke = await session.scalar(
+            select(Character).options(selectinload(Character.films))
+        )
+        return sorted(film.title for film in luke.films)
+
+    await import_people()
+    assert await films() == ["A New Hope"]
+    # Not remembered while a link is unresolved
+    assert (await session.execute(select(SyncState))).scalars().all() == []
+
+    session.add(Film(title="The Empire Strikes Back", swapi_id=2))
+    await session.commit()
+    await import_people()
+
+    assert await films() == ["A New Hope", "The Empire Strikes Back"]
+    assert len((await session.execute(select(SyncState))).scalars().all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_run_does_not_save_sync_state(session):
+    upstream = Upstream({1: [film("A New Hope", "2014-12-20T19:49:45.256000Z")]})
+
+    async with upstream.client() as client:
+        importer = FilmImporter(session, client=client, incremental=True)
+        importer.write = AsyncMock(side_effect=RuntimeError("db down"))
+        with pytest.raises(RuntimeError):
+            await importer.run()
+
+    await session.rollback()
+    result = await session.execute(select(SyncState))
+    assert result.scalars().all() == []
@@ -0,0 +1,165 @@
+import time
+import httpx
+import pytest
+from unittest.mock import MagicMock
+from core.services.swapi.films import FilmImporter
+from core.services.swapi.throttle import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    Throttle,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+def importer(handler, throttle: Throttle | None = None) -> FilmImporter:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return FilmImporter(
+        MagicMock(), client=client, incremental=False, throttle=throttle
+    )
+
+
+def ok() -> httpx.Response:
+    return httpx.Response(200, json={"count": 1, "results": [{"title": "A"}]})
+
+
+def test_limiter_backs_off_multiplicatively_and_recovers_additively():
+    limiter = RateLimiter(rate=10, min_rate=1, max_rate=20, increase=1, decrease=0.5)
+
+    limiter.on_throttle()
+    assert limiter.rate == 5
+    # A burst of concurrent 429s counts as a single decrease
+    limiter.on_throttle()
+    assert limiter.rate == 5
+    assert limiter.throttle_events == 2
+
+    for _ in range(25):
+        limiter.on_success()
+    assert 8 < limiter.rate < 9
+
+    limiter.rate = 19.99
+    limiter.on_success()
+    assert limiter.rate == 20
+
+
+@pytest.mark.asyncio
+async def test_limiter_paces_requests_and_honours_pauses():
+    limiter = RateLimiter(rate=100, burst=1)
+
+    start = time.monotonic()
+    for _ in range(6):
+        await limiter.acquire()
+    assert time.monotonic() - start >= 0.045
+
+    limiter.on_throttle(retry_after=0.1)
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+    assert limiter.acquired == 7
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.check()
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    time.sleep(0.06)
+    breaker.check()  # Half-open trial
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()  # Only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.opens == 1
+
+
+def test_breaker_frees_a_trial_that_ended_without_a_result():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    first = breaker.check()
+    breaker.end_trial(first)  # e.g. cancelled
+    second = breaker.check()
+    breaker.end_trial(first)  # A stale trial doesn't free the new one
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.end_trial(second)
+    breaker.check()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_delay_is_jittered_and_honours_retry_after():
+    delays = {backoff_delay(3) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(0 <= delay <= 8 for delay in delays)
+    assert backoff_delay(0, retry_after=2.5) >= 2.5
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_honours_retry_after_and_lowers_rate():
+    responses = [httpx.Response(429, headers={"Retry-After": "0.2"}), ok()]
+    throttle = Throttle()
+    rate = throttle.limiter.rate
+
+    start = time.monotonic()
+    data = await importer(lambda request: responses.pop(0), throttle).fetch_page(1)
+
+    assert data["results"] == [{"title": "A"}]
+    assert time.monotonic() - start >= 0.2
+    stats = throttle.stats()
+    assert stats["throttle_events"] == 1 and stats["retries"] == 1
+    assert stats["requests"] == 2
+    assert throttle.limiter.rate < rate
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_fails_fast_while_upstream_is_down():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(500)
+
+    throttle = Throttle(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+
+    with pytest.raises(CircuitOpenError):
+        await importer(handler, throttle).fetch_page(1)
+    with pytest.raises(CircuitOpenError):
+        await importer(handler, throttle).fetch_page(2)
+
+    assert len(requests) == 1
+    assert throttle.stats()["circuit_state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_unexpected_error_in_half_open_trial_frees_the_circuit():
+    responses = [ValueError("boom"), ok()]
+
+    def handler(request):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    throttle = Throttle(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+    throttle.breaker.record_failure()
+
+    with pytest.raises(ValueError):
+        await importer(handler, throttle).fetch_page(1)
+    data = await importer(handler, throttle).fetch_page(1)
+
+    assert data["results"] == [{"title": "A"}]
+    assert throttle.stats()["circuit_state"] == "closed"
@@ -0,0 +1,92 @@
+import pytest
+from sqlmodel import select
+from core.models import Film
+from core.schemas.film import FilmCreate
+from core.services.swapi.characters import CharacterImporter
+from core.services.swapi.films import FilmImporter
+from core.services.swapi.validation import validate_batch
+from core.tests.services.utils import single_page
+
+
+def film(swapi_id: int, **fields) -> dict:
+    return {
+        "title": f"Film {swapi_id}",
+        "episode_id": swapi_id,
+        "director": "George Lucas",
+        "url": f"https://swapi.dev/api/films/{swapi_id}/",
+        **fields,
+    }
+
+
+def test_validate_batch_reports_row_errors():
+    records = [
+        {"title": "A New Hope", "episode_id": 4},
+        {"title": "Bad", "episode_id": "four"},
+        "not a record",
+        {"title": "Return of the Jedi", "episode_id": 6},
+    ]
+    inputs = [
+        {**r, "director": None, "release_date": None, "producer": None}
+        if isinstance(r, dict)
+        else r
+        for r in records
+    ]
+
+    rows, errors = validate_batch(FilmCreate, inputs)
+
+    assert [row and row["title"] for row in rows] == [
+        "A New Hope",
+        None,
+        None,
+        "Return of the Jedi",
+    ]
+    assert set(errors) == {1, 2}
+    assert errors[1].startswith("episode_id:")
+    assert all(isinstance(row, dict) for row in (rows[0], rows[3]))
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_matches_parse(session):
+    importer = FilmImporter(session)
+    records = [film(1), film(2, producer="Gary Kurtz")]
+
+    rows = await importer.parse_batch(records)
+
+    expected = [(await importer.parse(r)).model_dump(exclude={"id"}) for r in records]
+    assert rows == expected
+    assert rows[1]["swapi_id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_skips_invalid_rows_only(session):
+    importer = CharacterImporter(session)
+    importer.film_ids = {1: 10}
+    records = [
+        {"name": "Luke", "gender": "male", "films": ["https://swapi.dev/api/films/1/"]},
+        {"name": "Broken", "gender": 42},
+        {"gender": "n/a"},  # No name, skipped
+        {"name": "Leia", "gender": "female"},
+    ]
+
+    rows = await importer.parse_batch(records)
+
+    assert [row["name"] for row in rows] == ["Luke", "Leia"]
+    assert importer.pending_links["Luke"] == ([10], [])
+    assert "Broken" not in importer.pending_links
+    assert importer.stats.records_parsed == 2
+    assert importer.stats.records_rejected == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write_mode", ["copy", "orm"])
+async def test_run_validates_in_process_pool(session, write_mode):
+    records = [film(i) for i in range(1, 26)] + [film(26, episode_id="x")]
+    importer = FilmImporter(session, write_mode=write_mode, parse_workers=2)
+    importer.fetch_page = single_page(records)
+
+    await importer.run()
+
+    assert importer.pool is None
+    result = await session.execute(select(Film.swapi_id).order_by(Film.swapi_id))
+    assert result.scalars().all() == list(range(1, 26))
+    assert importer.stats.records_rejected == 1
@@ -0,0 +1,6 @@
+from unittest.mock import AsyncMock
+
+
+def single_page(records: list[dict]) -> AsyncMock:
+    """A `fetch_page` stand-in serving `records` as the only upstream page."""
+    return AsyncMock(return_value={"count": len(records), "results": records})
@@ -0,0 +1,133 @@
+"""
+Benchmark: importer write throughput per write mode (orm / insert / copy).
+
+Generates synthetic SWAPI-shaped films, starships and characters (each
+character linked to a few films and starships), parses them through the real
+importers and times only the write phase, in batches sized by the importer's
+`BatchSizer` (`--batch-mode`).
+
+Everything runs inside an outer transaction that is rolled back at the end,
+so the target database is left untouched.
+
+Usage:
+    python scripts/bench_bulk_write.py --characters 20000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.database.settings import db_settings
+from core.services.swapi.batching import BATCH_MODES
+from core.services.swapi.characters import CharacterImporter
+from core.services.swapi.films import FilmImporter
+from core.services.swapi.starships import StarshipImporter
+
+
+def synthetic_data(characters: int, films: int, starships: int, links: int):
+    film_records = [
+        {
+            "title": f"Film {i}",
+            "episode_id": i,
+            "director": "George Lucas",
+            "url": f"https://swapi.dev/api/films/{i}/",
+        }
+        for i in range(1, films + 1)
+    ]
+    starship_records = [
+        {
+            "name": f"Starship {i}",
+            "model": "T-65B",
+            "manufacturer": "Incom",
+            "url": f"https://swapi.dev/api/starships/{i}/",
+        }
+        for i in range(1, starships + 1)
+    ]
+    character_records = [
+        {
+            "name": f"Character {i}",
+            "gender": "n/a",
+            "birth_year": "19BBY",
+            "films": [
+                f"https://swapi.dev/api/films/{id_}/"
+                for id_ in random.sample(range(1, films + 1), links)
+            ],
+            "starships": [
+                f"https://swapi.dev/api/starships/{id_}/"
+                for id_ in random.sample(range(1, starships + 1), links)
+            ],
+        }
+        for i in range(characters)
+    ]
+    return film_records, starship_records, character_records
+
+
+async def write_all(importer, records) -> tuple[int, float]:
+    """Parse records, then time writing them in the importer's batch sizes."""
+    await importer.prefetch_existing()
+    objects = await importer.parse_batch(records)
+
+    start = time.perf_counter()
+    i = 0
+    while i < len(objects):
+        size = importer.batcher.size
+        await importer.write(objects[i : i + size])
+        i += size
+    return len(objects), time.perf_counter() - start
+
+
+async def bench(engine, mode: str, batch_mode: str | None, data) -> None:
+    film_records, starship_records, character_records = data
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            options = {"write_mode": mode, "batch_mode": batch_mode}
+            await write_all(FilmImporter(session, **options), film_records)
+            await write_all(StarshipImporter(session, **options), starship_records)
+
+            importer = CharacterImporter(session, **options)
+            count, elapsed = await write_all(importer, character_records)
+            links = sum(
+                len(character["films"]) + len(character["starships"])
+                for character in character_records
+            )
+            rows = count + links
+            print(
+                f"{mode:<7} characters={count:<7} link_rows={links:<8} "
+                f"time={elapsed:7.3f}s  rows/sec={rows / elapsed:>10,.0f}  "
+                f"batch_sizes={importer.batcher.snapshot()}"
+            )
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+async def main(args):
+    random.seed(42)
+    data = synthetic_data(args.characters, args.films, args.starships, args.links)
+    engine = create_async_engine(db_settings.async_database_url, echo=False)
+    try:
+        for mode in args.modes:
+            await bench(engine, mode, args.batch_mode, data)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--characters", type=int, default=20000)
+    parser.add_argument("--films", type=int, default=50)
+    parser.add_argument("--starships", type=int, default=100)
+    parser.add_argument("--links", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=["orm", "insert", "copy"])
+    parser.add_argument("--batch-mode", choices=BATCH_MODES)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+"""
+Benchmark: per-request HTTP clients vs. one pooled client.
+
+Serves `FakeSwapi` films pages from a local uvicorn server, counting client
+connections (one connection == one handshake), then fetches the same pages
+through `FilmImporter.fetch_all()` twice:
+
+- per-request: a fresh `httpx.AsyncClient` per page (the previous behaviour)
+- pooled: one client from `create_client()` shared for the whole run
+
+`--handshake-delay` adds latency to the first response on every new
+connection, to approximate the TCP/TLS handshake round trips to a remote host.
+
+Usage:
+    python scripts/bench_http_client.py --pages 50 --handshake-delay 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import uvicorn
+from core.services.swapi.client import create_client
+from core.services.swapi.films import FilmImporter
+from core.services.swapi.fake import FakeSwapi
+
+
+class ConnectionCounter:
+    """ASGI wrapper counting client connections, by client address."""
+
+    def __init__(self, app, handshake_delay: float):
+        self.app = app
+        self.handshake_delay = handshake_delay
+        self.clients: set[tuple[str, int]] = set()
+
+    @property
+    def connections(self) -> int:
+        return len(self.clients)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["client"] not in self.clients:
+            self.clients.add(scope["client"])
+            if self.handshake_delay:
+                await asyncio.sleep(self.handshake_delay)
+        await self.app(scope, receive, send)
+
+
+async def bench(
+    label: str, fake: FakeSwapi, counter: ConnectionCounter, base_url: str, pooled: bool
+):
+    fake.requests.clear()
+    counter.clients.clear()
+
+    start = time.perf_counter()
+    if pooled:
+        async with create_client() as client:
+            records = await FilmImporter(
+                None, client=client, base_url=base_url
+            ).fetch_all()
+    else:
+        # Previous behaviour: a new client (and connection) per page
+        class PerRequestImporter(FilmImporter):
+            async def fetch_page(self, page: int) -> dict:
+                async with create_client() as client:
+                    self.client = client
+                    try:
+                        return await super().fetch_page(page)
+                    finally:
+                        self.client = None
+
+        records = await PerRequestImporter(None, base_url=base_url).fetch_all()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<12} records={len(records):<6} requests={fake.total_requests:<5} "
+        f"handshakes={counter.connections:<5} time={elapsed:.3f}s"
+    )
+
+
+async def main(args):
+    fake = FakeSwapi(films=args.pages * args.page_size, page_size=args.page_size)
+    counter = ConnectionCounter(fake.app, args.handshake_delay)
+    server = uvicorn.Server(
+        uvicorn.Config(
+            counter, host="127.0.0.1", port=0, lifespan="off", log_level="warning"
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/api"
+
+    try:
+        # Warm up the event loop / imports so both runs are comparable
+        async with httpx.AsyncClient() as client:
+            await client.get(f"{base_url}/films/?page=1")
+
+        await bench("per-request", fake, counter, base_url, pooled=False)
+        await bench("pooled", fake, counter, base_url, pooled=True)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--handshake-delay", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
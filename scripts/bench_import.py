@@ -0,0 +1,254 @@
+"""
+Benchmark: end-to-end SWAPI import against a local stand-in server.
+
+Serves a generated dataset from `FakeSwapi` (uvicorn, in a child process so
+it doesn't compete with the importers for this process' event loop) and runs
+the full import (`ImportScheduler` with films, starships and characters, the
+way `scripts/import_swapi.py` does) against it over real HTTP.
+
+The import writes to a scratch database (POSTGRES_DB + "_bench") created
+from the current models and dropped afterwards, so the configured database
+is left untouched.
+
+With `--workers N` the import runs sharded (`ShardedImport`) in N worker
+processes instead, to compare throughput across core counts.
+
+Reports wall time, requests/sec (including retries), rows/sec (rows and link
+rows inserted) and the peak RSS of the importing process. `--json` also
+writes the results to a file, to compare runs before and after a change.
+
+Usage:
+    python scripts/bench_import.py --people 5000 --latency 0.05
+    python scripts/bench_import.py --error-rate 0.02 --throttle-rate 0.05
+    python scripts/bench_import.py --people 20000 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+
+import httpx
+import uvicorn
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import RATE_LIMIT_INITIAL, RATE_LIMIT_MAX
+from core.database.settings import db_settings
+from core.services.swapi import CharacterImporter, FilmImporter, StarshipImporter
+from core.services.swapi.batching import BATCH_MODES
+from core.services.swapi.client import create_client
+from core.services.swapi.fake import FakeSwapi
+from core.services.swapi.scheduler import ImportScheduler
+from core.services.swapi.sharding import ShardedImport
+from core.services.swapi.stats import ImporterStats, peak_rss_bytes
+from core.services.swapi.throttle import RateLimiter, Throttle
+
+
+def serve(port: int, options: dict) -> None:
+    uvicorn.run(FakeSwapi(**options).app, port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(base_url: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(f"{base_url}/films/?page=1")
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+async def create_database(name: str):
+    url = make_url(db_settings.async_database_url)
+    admin = create_async_engine(
+        url.set(database="postgres"), isolation_level="AUTOCOMMIT"
+    )
+    async with admin.connect() as connection:
+        await connection.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+        await connection.execute(text(f'CREATE DATABASE "{name}"'))
+    await admin.dispose()
+
+    engine = create_async_engine(url.set(database=name))
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    return engine
+
+
+async def drop_database(name: str) -> None:
+    url = make_url(db_settings.async_database_url)
+    admin = create_async_engine(
+        url.set(database="postgres"), isolation_level="AUTOCOMMIT"
+    )
+    async with admin.connect() as connection:
+        await connection.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+    await admin.dispose()
+
+
+async def run_import(base_url: str, engine, args) -> dict:
+    stats: dict[str, ImporterStats] = {}
+    throttle = Throttle(
+        RateLimiter(rate=args.rate_limit, max_rate=max(args.rate_limit, RATE_LIMIT_MAX))
+    )
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    common = {
+        "session_factory": session_factory,
+        "throttle": throttle,
+        "stream": args.stream,
+        "write_mode": args.write_mode,
+        "batch_mode": args.batch_mode,
+        "cache_mode": "live",
+        "base_url": base_url,
+    }
+
+    start = time.perf_counter()
+    if args.workers:
+        return await run_sharded(engine, args, common, start)
+
+    async with create_client() as client:
+        await ImportScheduler(
+            [FilmImporter, StarshipImporter, CharacterImporter],
+            client=client,
+            stats=stats,
+            incremental=False,
+            resume=False,
+            **common,
+        ).run()
+    elapsed = time.perf_counter() - start
+
+    requests = throttle.stats()["requests"]
+    rows = sum(s.rows_inserted + s.link_rows for s in stats.values())
+    return {
+        "wall_time_s": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_s": round(requests / elapsed, 1),
+        "retries": throttle.retries,
+        "rows": rows,
+        "rows_per_s": round(rows / elapsed, 1),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "importers": {resource: s.snapshot() for resource, s in stats.items()},
+        "summaries": [s.summary() for s in stats.values()],
+    }
+
+
+async def run_sharded(engine, args, common: dict, start: float) -> dict:
+    # Workers are separate processes: their requests are counted from the
+    # stats each shard stored, the peak RSS is the coordinator's only
+    summary = await ShardedImport(
+        [FilmImporter, StarshipImporter, CharacterImporter],
+        workers=args.workers,
+        shard_pages=args.shard_pages,
+        database_url=engine.url.render_as_string(hide_password=False),
+        **common,
+    ).run()
+    elapsed = time.perf_counter() - start
+
+    # The coordinator fetched page 1 of every resource to plan the shards
+    requests = common["throttle"].stats()["requests"]
+    pages = 0
+    for totals in summary["resources"].values():
+        requests += totals["requests"]
+        pages += totals["pages_fetched"]
+    rows = summary["link_rows"] + sum(
+        totals["rows_inserted"] for totals in summary["resources"].values()
+    )
+    return {
+        "wall_time_s": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_s": round(requests / elapsed, 1),
+        "retries": requests - pages - len(summary["resources"]),
+        "rows": rows,
+        "rows_per_s": round(rows / elapsed, 1),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "sharding": summary,
+        "summaries": [],
+    }
+
+
+async def main(args):
+    options = {
+        "people": args.people,
+        "films": args.films,
+        "starships": args.starships,
+        "links": args.links,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "retry_after": args.retry_after,
+    }
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port, options), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port}/api"
+    database = f"{db_settings.POSTGRES_DB}_bench"
+
+    try:
+        await wait_until_up(base_url)
+        engine = await create_database(database)
+        try:
+            results = await run_import(base_url, engine, args)
+        finally:
+            await engine.dispose()
+            await drop_database(database)
+    finally:
+        server.terminate()
+        server.join()
+
+    for summary in results.pop("summaries"):
+        print(summary)
+    rss = results["peak_rss_bytes"]
+    print(
+        f"wall={results['wall_time_s']:.3f}s requests={results['requests']} "
+        f"(retries={results['retries']}) req/s={results['requests_per_s']:,.1f} "
+        f"rows={results['rows']} rows/s={results['rows_per_s']:,.0f} "
+        f"peak_rss={f'{rss / 2**20:.0f}MiB' if rss else 'n/a'}"
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": options, **results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--people", type=int, default=2000)
+    parser.add_argument("--films", type=int, default=50)
+    parser.add_argument("--starships", type=int, default=200)
+    parser.add_argument("--links", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=RATE_LIMIT_INITIAL,
+        help="Initial requests/sec of the importers' rate limiter",
+    )
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--write-mode", choices=["orm", "insert", "copy"])
+    parser.add_argument("--batch-mode", choices=BATCH_MODES)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Run the import sharded, in this many worker processes",
+    )
+    parser.add_argument("--shard-pages", type=int, help="Pages per shard")
+    parser.add_argument("--json", help="Also write the results to this file")
+    asyncio.run(main(parser.parse_args()))
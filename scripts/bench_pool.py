@@ -0,0 +1,109 @@
+"""
+Benchmark: connection pool saturation at different pool settings.
+
+`--concurrency` simulated requests run at once, each checking a connection
+out of the pool, running a query that holds it for `--query-ms` and
+returning it, until `--requests` requests are done. For every pool setting
+(`pool_size:max_overflow`) this reports throughput, how long requests waited
+for a connection (p50/p95/max) and how many gave up after `--pool-timeout`.
+
+While concurrency stays under pool_size + max_overflow nothing waits; past
+it, requests queue for a connection and waits grow until they time out.
+
+Usage:
+    python scripts/bench_pool.py --concurrency 50 --pools 5:0 10:10 20:20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from core.database.settings import db_settings
+
+
+async def bench(pool: str, args) -> dict:
+    pool_size, max_overflow = (int(n) for n in pool.split(":"))
+    engine = db_settings.create_engine(
+        application_name="swapi-bench-pool",
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=args.pool_timeout,
+    )
+    # Open the pool's connections before timing
+    connections = [await engine.connect() for _ in range(pool_size)]
+    for connection in connections:
+        await connection.close()
+    waits, timeouts = [], 0
+    remaining = args.requests
+
+    async def request() -> None:
+        nonlocal timeouts
+        start = time.perf_counter()
+        try:
+            async with engine.connect() as connection:
+                waits.append(time.perf_counter() - start)
+                await connection.execute(
+                    text("SELECT pg_sleep(:seconds)"), {"seconds": args.query_ms / 1000}
+                )
+        except PoolTimeoutError:
+            timeouts += 1
+
+    async def client() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await request()
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    finally:
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+    waits.sort()
+    return {
+        "pool": pool,
+        "rps": (args.requests - timeouts) / elapsed,
+        "wait_p50_ms": statistics.median(waits) * 1000 if waits else 0.0,
+        "wait_p95_ms": waits[int(len(waits) * 0.95) - 1] * 1000 if waits else 0.0,
+        "wait_max_ms": waits[-1] * 1000 if waits else 0.0,
+        "timeouts": timeouts,
+    }
+
+
+async def main(args) -> None:
+    print(
+        f"{args.concurrency} concurrent clients, {args.requests} requests, "
+        f"{args.query_ms}ms queries, pool_timeout {args.pool_timeout}s"
+    )
+    print(
+        f"{'pool':>8} {'req/s':>8} {'wait p50':>9} {'wait p95':>9} "
+        f"{'wait max':>9} {'timeouts':>9}"
+    )
+    for pool in args.pools:
+        r = await bench(pool, args)
+        print(
+            f"{r['pool']:>8} {r['rps']:>8.1f} {r['wait_p50_ms']:>7.1f}ms "
+            f"{r['wait_p95_ms']:>7.1f}ms {r['wait_max_ms']:>7.1f}ms {r['timeouts']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--query-ms", type=float, default=20.0)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    parser.add_argument(
+        "--pools",
+        nargs="+",
+        default=["5:0", "5:10", "20:10", "50:0"],
+        metavar="SIZE:OVERFLOW",
+        help="Pool settings to compare, pool_size:max_overflow",
+    )
+    asyncio.run(main(parser.parse_args()))
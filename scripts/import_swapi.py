@@ -1,16 +1,160 @@
+import argparse
 import asyncio
+import logging
 from core.database.session import async_session
+from core.services.swapi.batching import BATCH_MODES
+from core.services.swapi.cache import CACHE_MODES
+from core.services.swapi.client import create_client
+from core.services.swapi.dump import IMPORT_SOURCES
+from core.services.swapi.scheduler import ImportScheduler
+from core.services.swapi.sharding import ShardedImport
+from core.services.swapi.stats import ImporterStats
 from core.services.swapi.characters import CharacterImporter
 from core.services.swapi.films import FilmImporter
 from core.services.swapi.starships import StarshipImporter
 
 
-async def main():
-    async with async_session() as session:
-        await FilmImporter(session).run()
-        await StarshipImporter(session).run()
-        await CharacterImporter(session).run()
+async def main(
+    stream: bool | None = None,
+    cache_mode: str | None = None,
+    resume: bool | None = None,
+    batch_mode: str | None = None,
+    workers: int | None = None,
+    diff: bool | None = None,
+    dry_run: bool = False,
+    source: str | None = None,
+    dump_dir: str | None = None,
+):
+    importers = [FilmImporter, StarshipImporter, CharacterImporter]
+    if workers:
+        await ShardedImport(
+            importers,
+            session_factory=async_session,
+            workers=workers,
+            stream=stream,
+            cache_mode=cache_mode,
+            batch_mode=batch_mode,
+            diff=diff,
+            source=source,
+            dump_dir=dump_dir,
+        ).run()
+        return
+
+    stats: dict[str, ImporterStats] = {}
+    async with create_client() as client:
+        await ImportScheduler(
+            importers,
+            session_factory=async_session,
+            client=client,
+            stats=stats,
+            stream=stream,
+            cache_mode=cache_mode,
+            resume=resume,
+            batch_mode=batch_mode,
+            diff=diff,
+            dry_run=dry_run,
+            source=source,
+            dump_dir=dump_dir,
+        ).run()
+
+    if dry_run:
+        print("Dry run, nothing was written. Changeset:")
+        for resource, importer_stats in stats.items():
+            changes = importer_stats.changes
+            print(
+                f"  {resource}: {changes['inserts']} new, {changes['updates']} "
+                f"changed, {changes['unchanged']} unchanged, links "
+                f"+{changes['links_added']} -{changes['links_removed']}"
+            )
+            for kind, label in (
+                ("inserts", "new"),
+                ("updates", "changed"),
+                ("relinked", "relinked"),
+            ):
+                for key in changes["keys"][kind]:
+                    print(f"    {label}: {key}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Import SWAPI data")
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Parse and insert pages while later pages are downloading "
+        "(defaults to STREAM_IMPORT)",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=CACHE_MODES,
+        default=None,
+        help="Response cache mode: live, record (fetch and store pages) or "
+        "replay (serve pages from the cache, no network); defaults to "
+        "SWAPI_CACHE_MODE",
+    )
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Continue an interrupted import from its checkpoint "
+        "(defaults to RESUME_IMPORT)",
+    )
+    parser.add_argument(
+        "--batch-mode",
+        choices=BATCH_MODES,
+        default=None,
+        help="Write batch sizing: adaptive (aim for BATCH_TARGET_SECONDS per "
+        "commit), fixed (CHUNK_SIZE) or single (one transaction); defaults to "
+        "BATCH_MODE",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Sharded import: split every resource into shards of SHARD_PAGES "
+        "pages, imported by this many worker processes (no incremental sync "
+        "or resume)",
+    )
+    parser.add_argument(
+        "--diff",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Only write new and changed rows, compared by content hash "
+        "(defaults to DIFF_IMPORT)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print what a diff import would insert, update and relink "
+        "without writing anything",
+    )
+    parser.add_argument(
+        "--source",
+        choices=IMPORT_SOURCES,
+        default=None,
+        help="Read records from the SWAPI (swapi) or from local dump files "
+        "(dump, see scripts/seed_dump.py); defaults to IMPORT_SOURCE",
+    )
+    parser.add_argument(
+        "--dump-dir",
+        default=None,
+        help="Directory of the dump files (defaults to SWAPI_DUMP_DIR)",
+    )
+    args = parser.parse_args()
+    if args.dry_run and args.workers:
+        parser.error("--dry-run is not supported for sharded imports")
+    # Progress and the per-importer stats summaries are logged at INFO
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(
+        main(
+            stream=args.stream,
+            cache_mode=args.cache,
+            resume=args.resume,
+            batch_mode=args.batch_mode,
+            workers=args.workers,
+            diff=args.diff,
+            dry_run=args.dry_run,
+            source=args.source,
+            dump_dir=args.dump_dir,
+        )
+    )
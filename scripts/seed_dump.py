@@ -0,0 +1,95 @@
+"""
+Seed the database from a local dump of SWAPI-shaped records, without HTTP.
+
+The dump directory holds one file per resource: `films`, `starships` and
+`people`, each `.ndjson`/`.jsonl` (one record per line) or `.json` (an array
+of records), optionally gzip-compressed (`.gz`). Records are read one at a
+time and go through the importers' usual validation and bulk write stages.
+
+`--generate N` first writes a synthetic dump with N characters (the
+`FakeSwapi` dataset), to provision staging or load-test databases.
+
+Usage:
+    python scripts/seed_dump.py path/to/dump
+    python scripts/seed_dump.py /tmp/dump --generate 1000000 --films 100
+    python scripts/seed_dump.py path/to/dump --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from core.config import SWAPI_DUMP_DIR
+from core.database.session import async_session
+from core.services.swapi import CharacterImporter, FilmImporter, StarshipImporter
+from core.services.swapi.batching import BATCH_MODES
+from core.services.swapi.dump import write_dump
+from core.services.swapi.fake import FakeSwapi
+from core.services.swapi.scheduler import ImportScheduler
+from core.services.swapi.sharding import ShardedImport
+
+
+def generate(directory: Path, people: int, films: int, starships: int) -> None:
+    fake = FakeSwapi(people=people, films=films, starships=starships)
+    for resource, count in fake.sizes.items():
+        written = write_dump(
+            directory / f"{resource}.ndjson.gz",
+            (
+                fake.record(resource, swapi_id, "https://swapi.dev/api")
+                for swapi_id in range(1, count + 1)
+            ),
+        )
+        print(f"Wrote {written} {resource} records to {directory}")
+
+
+async def main(args) -> None:
+    importers = [FilmImporter, StarshipImporter, CharacterImporter]
+    options = {
+        "source": "dump",
+        "dump_dir": args.dump_dir,
+        "write_mode": args.write_mode,
+        "batch_mode": args.batch_mode,
+    }
+    start = time.perf_counter()
+    if args.workers:
+        await ShardedImport(
+            importers,
+            session_factory=async_session,
+            workers=args.workers,
+            **options,
+        ).run()
+    else:
+        await ImportScheduler(importers, session_factory=async_session, **options).run()
+    print(f"Seeded from {args.dump_dir} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "dump_dir",
+        nargs="?",
+        default=SWAPI_DUMP_DIR,
+        help="Directory holding the dump files (defaults to SWAPI_DUMP_DIR)",
+    )
+    parser.add_argument(
+        "--generate",
+        type=int,
+        metavar="PEOPLE",
+        help="Write a synthetic dump with this many characters first",
+    )
+    parser.add_argument("--films", type=int, default=50)
+    parser.add_argument("--starships", type=int, default=200)
+    parser.add_argument("--write-mode", choices=["orm", "insert", "copy"])
+    parser.add_argument("--batch-mode", choices=BATCH_MODES)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Seed sharded, in this many worker processes",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.generate:
+        generate(Path(args.dump_dir), args.generate, args.films, args.starships)
+    asyncio.run(main(args))
@@ -0,0 +1,47 @@
+"""
+Export the imported data to a binary snapshot file, or restore it from one.
+
+The snapshot holds every entity and link table (and the sync state) as
+gzip-compressed binary COPY data behind a header with the schema revision.
+Restoring replaces the tables' contents in a single transaction and needs a
+database migrated to the same revision, e.g. right after `alembic upgrade`.
+Checkpoints and shards of unfinished imports are dropped by a restore.
+
+Usage:
+    python scripts/snapshot.py export
+    python scripts/snapshot.py restore path/to/swapi.snapshot.gz
+"""
+
+import argparse
+import asyncio
+import time
+from core.config import SNAPSHOT_PATH
+from core.database.session import async_session
+from core.database.snapshot import export_snapshot, restore_snapshot
+
+
+async def main(args) -> None:
+    start = time.perf_counter()
+    async with async_session() as session:
+        if args.command == "export":
+            header = await export_snapshot(session, args.path)
+        else:
+            header = await restore_snapshot(session, args.path)
+    rows = ", ".join(f"{t['name']}: {t['rows']}" for t in header["tables"])
+    verb = "Exported" if args.command == "export" else "Restored"
+    print(
+        f"{verb} {args.path} (revision {header['revision']}) "
+        f"in {time.perf_counter() - start:.2f}s; {rows}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["export", "restore"])
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=SNAPSHOT_PATH,
+        help="Snapshot file (defaults to SNAPSHOT_PATH)",
+    )
+    asyncio.run(main(parser.parse_args()))